@@ -0,0 +1,90 @@
+# /// script
+# requires-python = ">=3.13"
+# dependencies = [
+#     "auto-featurs",
+#     "numpy",
+#     "polars==1.37.0",
+# ]
+#
+# [tool.uv.sources]
+# auto-featurs = { path = "../", editable = true }
+# ///
+
+import time
+from typing import Optional
+
+import numpy as np
+import polars as pl
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import CategoricalEncoding
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.pipeline import Pipeline
+from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregations
+
+NUM_ROWS = 2_000_000
+NUM_MERCHANTS = 50_000
+NUM_DEVICES = 5_000
+REPEATS = 3
+
+
+def make_frame(num_rows: int, num_merchants: int, num_devices: int) -> pl.DataFrame:
+    rng = np.random.default_rng(42)
+    return pl.DataFrame({
+        'MERCHANT': [f'merchant_{i:06d}' for i in rng.integers(0, num_merchants, num_rows)],
+        'DEVICE': [f'device_{i:05d}' for i in rng.integers(0, num_devices, num_rows)],
+        'AMOUNT': rng.lognormal(3.0, 1.0, num_rows),
+    })
+
+
+def make_schema() -> Schema:
+    return Schema([
+        ColumnSpecification.nominal(name='MERCHANT'),
+        ColumnSpecification.nominal(name='DEVICE'),
+        ColumnSpecification.numeric(name='AMOUNT'),
+    ])
+
+
+def encode(frame: pl.DataFrame, encoding: Optional[CategoricalEncoding]) -> tuple[pl.DataFrame, float]:
+    dataset = Dataset(frame, make_schema())
+    start = time.perf_counter()
+    if encoding is not None:
+        dataset = dataset.with_categorical_encoding(encoding)
+    encoded_frame = dataset.collect()
+    return encoded_frame, time.perf_counter() - start
+
+
+def best_of(frame: pl.DataFrame) -> float:
+    over_columns_combinations = [['MERCHANT'], ['DEVICE'], ['MERCHANT', 'DEVICE']]
+    pipeline = (
+        Pipeline(dataset=Dataset(frame, make_schema()))
+        .with_count(over_columns_combinations=over_columns_combinations)
+        .with_arithmetic_aggregation('AMOUNT', [ArithmeticAggregations.MEAN, ArithmeticAggregations.SUM], over_columns_combinations=over_columns_combinations)
+    )
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        pipeline.collect()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    frame = make_frame(NUM_ROWS, NUM_MERCHANTS, NUM_DEVICES)
+
+    results = []
+    for encoding in (None, CategoricalEncoding.CATEGORICAL, CategoricalEncoding.ENUM):
+        encoded_frame, encoding_time = encode(frame, encoding)
+        results.append({
+            'encoding': 'string' if encoding is None else encoding.value,
+            'encoding_s': encoding_time,
+            'pipeline_s': best_of(encoded_frame),
+        })
+
+    with pl.Config(tbl_rows=-1):
+        print(pl.DataFrame(results).with_columns(speedup=pl.col('pipeline_s').first() / pl.col('pipeline_s')))
+
+
+if __name__ == '__main__':
+    main()
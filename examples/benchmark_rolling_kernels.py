@@ -0,0 +1,105 @@
+# /// script
+# requires-python = ">=3.13"
+# dependencies = [
+#     "auto-featurs",
+#     "numpy",
+#     "polars==1.37.0",
+# ]
+#
+# [tool.uv.sources]
+# auto-featurs = { path = "../", editable = true }
+# ///
+
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+import time
+
+import numpy as np
+import polars as pl
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import MaxTransformer
+from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import MinTransformer
+from auto_featurs.transformers.aggregating_transformers import StdTransformer
+from auto_featurs.transformers.aggregating_transformers import SumTransformer
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+
+NUM_ROWS = 20_000
+NUM_ENTITIES = 20
+TIME_WINDOWS = ['1h', '6h', '1d', '3d', '7d']
+REPEATS = 3
+
+
+def make_frame(num_rows: int, num_entities: int) -> pl.DataFrame:
+    rng = np.random.default_rng(42)
+    start = datetime(year=2_024, month=1, day=1, tzinfo=UTC)
+    offsets = np.sort(rng.integers(0, 90 * 24 * 60 * 60, num_rows))
+    return pl.DataFrame({
+        'TIMESTAMP': [start + timedelta(seconds=int(offset)) for offset in offsets],
+        'ENTITY': rng.integers(0, num_entities, num_rows),
+        'AMOUNT': rng.lognormal(3.0, 1.0, num_rows),
+        'IS_ONLINE': rng.random(num_rows) < 0.3,
+    })
+
+
+def inner_transformers() -> list[AggregatingTransformer]:
+    filtering_condition = pl.col('IS_ONLINE')
+    return [
+        CountTransformer(),
+        CountTransformer(filtering_condition=filtering_condition),
+        SumTransformer(column='AMOUNT'),
+        MeanTransformer(column='AMOUNT', filtering_condition=filtering_condition),
+        StdTransformer(column='AMOUNT'),
+        MinTransformer(column='AMOUNT'),
+        MaxTransformer(column='AMOUNT', filtering_condition=filtering_condition),
+    ]
+
+
+def best_of(frame: pl.DataFrame, exprs: list[pl.Expr]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        frame.lazy().select(exprs).collect()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    frame = make_frame(NUM_ROWS, NUM_ENTITIES)
+    index_column = ColumnSpecification.datetime(name='TIMESTAMP')
+
+    results = []
+    for time_window in TIME_WINDOWS:
+        for over_columns in ([], ['ENTITY']):
+            native_exprs = []
+            rolling_context_exprs = []
+            for inner_transformer in inner_transformers():
+                rolling_transformer = RollingWrapper(inner_transformer=inner_transformer, index_column=index_column, time_window=time_window)
+                native_expr = rolling_transformer.transform()
+                rolling_context_expr = inner_transformer.transform().last().rolling(index_column=index_column.name, period=time_window).alias(native_expr.meta.output_name())
+                if over_columns:
+                    native_expr = native_expr.over(over_columns)
+                    rolling_context_expr = rolling_context_expr.over(over_columns)
+                native_exprs.append(native_expr)
+                rolling_context_exprs.append(rolling_context_expr)
+
+            native_time = best_of(frame, native_exprs)
+            rolling_context_time = best_of(frame, rolling_context_exprs)
+            results.append({
+                'time_window': time_window,
+                'over': ', '.join(over_columns) or '-',
+                'rolling_context_s': rolling_context_time,
+                'native_kernel_s': native_time,
+                'speedup': rolling_context_time / native_time,
+            })
+
+    with pl.Config(tbl_rows=-1):
+        print(pl.DataFrame(results))
+
+
+if __name__ == '__main__':
+    main()
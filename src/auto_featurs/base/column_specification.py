@@ -4,10 +4,15 @@ import re
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
 from enum import Enum
 from enum import auto
+from typing import Optional
 from typing import overload
 
+import polars as pl
+
 type ColumnNameOrSpec = str | ColumnSpecification
 
 
@@ -112,6 +117,10 @@ class ColumnSpecification:
     name: str
     column_type: ColumnType
     column_role: ColumnRole = ColumnRole.FEATURE
+    dtype: Optional[pl.DataType] = field(default=None, compare=False)
+
+    def with_dtype(self, dtype: pl.DataType) -> ColumnSpecification:
+        return replace(self, dtype=dtype)
 
     @classmethod
     def numeric(cls, name: str, role: ColumnRole = ColumnRole.FEATURE) -> ColumnSpecification:
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import base64
+import io
+from collections import Counter
 from collections.abc import Iterable
+from collections.abc import Mapping
+from itertools import chain
 from typing import Optional
 
+import polars as pl
 from more_itertools import flatten
 
 from auto_featurs.base.column_specification import ColumnNameOrSpec
@@ -21,20 +27,52 @@ type ColumnSelection = (
 )
 type ColumnSet = list[ColumnSpecification]
 
+MAX_SCHEMA_SEGMENTS = 64
+DTYPE_COLUMN = 'dtype'
+
+
+class _SchemaSegment:
+    __slots__ = ('by_name', 'by_role', 'by_type', 'columns', 'counts')
+
+    def __init__(self, columns: tuple[ColumnSpecification, ...]) -> None:
+        self.columns = columns
+        self.counts = Counter(columns)
+        self.by_name: dict[str, ColumnSpecification] = {}
+        self.by_type: dict[ColumnType, list[ColumnSpecification]] = {}
+        self.by_role: dict[ColumnRole, list[ColumnSpecification]] = {}
+        for column in columns:
+            self.by_name.setdefault(column.name, column)
+            self.by_type.setdefault(column.column_type, []).append(column)
+            self.by_role.setdefault(column.column_role, []).append(column)
+
 
 class Schema:
-    def __init__(self, columns: list[ColumnSpecification]) -> None:
-        self._columns = columns
+    __slots__ = ('_segments',)
+
+    def __init__(self, columns: Iterable[ColumnSpecification]) -> None:
+        columns = tuple(columns)
+        self._segments: tuple[_SchemaSegment, ...] = (_SchemaSegment(columns),) if columns else ()
+
+    @classmethod
+    def _from_segments(cls, segments: tuple[_SchemaSegment, ...]) -> Schema:
+        if len(segments) > MAX_SCHEMA_SEGMENTS:
+            return cls(chain.from_iterable(segment.columns for segment in segments))
+        schema = cls.__new__(cls)
+        schema._segments = segments
+        return schema
 
     def __add__(self, other: object) -> Schema:
         if not isinstance(other, Schema):
             raise TypeError(f'Cannot add {type(other)} to Schema')
-        return Schema(self._columns + other.columns)
+        return self._from_segments(self._segments + other._segments)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Schema):
             raise TypeError(f'Cannot compare {type(other)} to Schema')
-        return self._columns == other.columns
+        return self._segments == other._segments or self.columns == other.columns
+
+    def __contains__(self, column: object) -> bool:
+        return any(column in segment.counts for segment in self._segments)
 
     @classmethod
     def from_dict(cls, spec: dict[ColumnType, list[str]], *, label_col: Optional[str] = None) -> Schema:
@@ -50,54 +88,105 @@ class Schema:
 
         return cls(columns)
 
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, str]]) -> Schema:
+        return cls(
+            ColumnSpecification(
+                name=record['name'],
+                column_type=ColumnType(record['column_type']),
+                column_role=ColumnRole[record['column_role']],
+                dtype=_deserialize_dtype(record['dtype']) if 'dtype' in record else None,
+            )
+            for record in records
+        )
+
+    def to_records(self) -> list[dict[str, str]]:
+        records: list[dict[str, str]] = []
+        for column in self.columns:
+            record = {'name': column.name, 'column_type': column.column_type.value, 'column_role': column.column_role.name}
+            if column.dtype is not None:
+                record['dtype'] = _serialize_dtype(column.dtype)
+            records.append(record)
+        return records
+
     @property
     def columns(self) -> list[ColumnSpecification]:
-        return self._columns
+        return list(chain.from_iterable(segment.columns for segment in self._segments))
 
     @property
     def column_names(self) -> list[str]:
-        return get_names_from_column_specs(self._columns)
+        return get_names_from_column_specs(self.columns)
 
     @property
     def num_columns(self) -> int:
-        return len(self._columns)
+        return sum(len(segment.columns) for segment in self._segments)
 
     @property
     def label_column(self) -> ColumnSpecification:
-        for col_spec in self._columns:
-            if col_spec.column_role == ColumnRole.LABEL:
-                return col_spec
+        for segment in self._segments:
+            if ColumnRole.LABEL in segment.by_role:
+                return segment.by_role[ColumnRole.LABEL][0]
         raise ValueError('No label column found in schema.')
 
     def drop(self, columns: Iterable[ColumnSpecification]) -> Schema:
-        new_columns = self._columns.copy()
-        for col in columns:
-            new_columns.remove(col)
-        return Schema(new_columns)
+        remaining_to_drop = Counter(columns)
+        if not remaining_to_drop:
+            return self
+
+        segments: list[_SchemaSegment] = []
+        for segment in self._segments:
+            if remaining_to_drop.keys().isdisjoint(segment.counts.keys()):
+                segments.append(segment)
+                continue
+            kept_columns: list[ColumnSpecification] = []
+            for column in segment.columns:
+                if column in remaining_to_drop:
+                    remaining_to_drop[column] -= 1
+                    if not remaining_to_drop[column]:
+                        del remaining_to_drop[column]
+                else:
+                    kept_columns.append(column)
+            if kept_columns:
+                segments.append(_SchemaSegment(tuple(kept_columns)))
+
+        not_present = sorted(column.name for column in remaining_to_drop)
+        if not_present:
+            raise ValueError(f'The following columns to drop not found in schema: {not_present}')
+        return self._from_segments(tuple(segments))
+
+    def with_dtypes(self, dtypes: Mapping[str, pl.DataType]) -> Schema:
+        if not dtypes:
+            return self
+
+        segments: list[_SchemaSegment] = []
+        for segment in self._segments:
+            if dtypes.keys().isdisjoint(segment.by_name.keys()):
+                segments.append(segment)
+                continue
+            segments.append(_SchemaSegment(tuple(column.with_dtype(dtypes[column.name]) if column.name in dtypes else column for column in segment.columns)))
+        return self._from_segments(tuple(segments))
 
     def get_column_by_name(self, column_name: str) -> ColumnSpecification:
-        for col_spec in self._columns:
-            if col_spec.name == column_name:
-                return col_spec
+        for segment in self._segments:
+            if column_name in segment.by_name:
+                return segment.by_name[column_name]
         raise KeyError(f'Column "{column_name}" not found in schema.')
 
     def get_columns_of_type(self, column_type: ColumnType, subset: Optional[ColumnSet] = None) -> ColumnSet:
         if subset is None:
-            subset = self._columns
-        else:
-            self._check_subset_in_schema(subset)
+            return list(chain.from_iterable(segment.by_type.get(column_type, ()) for segment in self._segments))
+        self._check_subset_in_schema(subset)
         return [col_spec for col_spec in subset if col_spec.column_type == column_type]
 
     def get_columns_of_role(self, column_role: ColumnRole, subset: Optional[ColumnSet] = None) -> ColumnSet:
         if subset is None:
-            subset = self._columns
-        else:
-            self._check_subset_in_schema(subset)
+            return list(chain.from_iterable(segment.by_role.get(column_role, ()) for segment in self._segments))
+        self._check_subset_in_schema(subset)
         return [col_spec for col_spec in subset if col_spec.column_role == column_role]
 
     def get_columns_matching_selector(self, column_selector: ColumnSelector, subset: Optional[ColumnSet] = None) -> ColumnSet:
         if subset is None:
-            subset = self._columns
+            subset = self.columns
         else:
             self._check_subset_in_schema(subset)
         return [col_spec for col_spec in subset if column_selector.matches(col_spec)]
@@ -124,7 +213,17 @@ class Schema:
                 raise ValueError(f'Unexpected subset type: {type(subset)}')
 
     def _check_subset_in_schema(self, subset: ColumnSet) -> None:
-        not_present = [col for col in subset if col not in self._columns]
+        not_present = [col for col in subset if col not in self]
         if not_present:
             not_present_names = sorted(get_names_from_column_specs(subset))
             raise ValueError(f'The following columns in subset not found in schema: {not_present_names}')
+
+
+def _serialize_dtype(dtype: pl.DataType) -> str:
+    buffer = io.BytesIO()
+    pl.DataFrame(schema={DTYPE_COLUMN: dtype}).write_ipc(buffer)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _deserialize_dtype(dtype: str) -> pl.DataType:
+    return pl.read_ipc_schema(io.BytesIO(base64.b64decode(dtype)))[DTYPE_COLUMN]
@@ -1,5 +1,6 @@
 import re
 
+import polars as pl
 import pytest
 
 import auto_featurs.column_selectors as cs
@@ -78,6 +79,47 @@ class TestSchema:
         assert self._schema.columns == [a, b, c]
         assert without_c.columns == [a]
 
+    def test_drop_across_added_schemas(self) -> None:
+        d = ColumnSpecification(name='d', column_type=ColumnType.NUMERIC)
+        e = ColumnSpecification(name='e', column_type=ColumnType.BOOLEAN)
+        layered = self._schema + Schema([d]) + Schema([e])
+
+        dropped = layered.drop([d, ColumnSpecification(name='a', column_type=ColumnType.NUMERIC)])
+
+        assert dropped.column_names == ['b', 'c', 'e']
+        assert dropped.get_columns_of_type(ColumnType.NUMERIC) == []
+        assert layered.column_names == ['a', 'b', 'c', 'd', 'e']
+        with pytest.raises(ValueError, match=re.escape("The following columns to drop not found in schema: ['d']")):
+            dropped.drop([d])
+
+    def test_lookups_across_many_added_schemas(self) -> None:
+        schema = self._schema
+        for i in range(200):
+            schema = schema + Schema([ColumnSpecification(name=f'feature_{i}', column_type=ColumnType.NUMERIC)])
+
+        assert schema.num_columns == 203
+        assert schema.column_names[-2:] == ['feature_198', 'feature_199']
+        assert schema.get_column_by_name('feature_150') == ColumnSpecification(name='feature_150', column_type=ColumnType.NUMERIC)
+        assert ColumnSpecification(name='feature_0', column_type=ColumnType.NUMERIC) in schema
+        assert len(schema.get_columns_of_type(ColumnType.NUMERIC)) == 201
+        assert schema.label_column.name == 'b'
+
+    def test_with_dtypes(self) -> None:
+        layered = self._schema + Schema([ColumnSpecification(name='d', column_type=ColumnType.NUMERIC)])
+
+        with_dtypes = layered.with_dtypes({'a': pl.Float32(), 'd': pl.UInt8()})
+
+        assert with_dtypes == layered
+        assert [column.dtype for column in with_dtypes.columns] == [pl.Float32(), None, None, pl.UInt8()]
+        assert [column.dtype for column in Schema.from_records(with_dtypes.to_records()).columns] == [pl.Float32(), None, None, pl.UInt8()]
+        assert self._schema.columns[0].dtype is None
+
+    def test_records_preserve_parametrized_dtypes(self) -> None:
+        dtypes: list[pl.DataType] = [pl.Datetime('ms', 'UTC'), pl.Enum(['a', 'b']), pl.List(pl.Int64()), pl.Decimal(10, 2)]
+        schema = Schema([ColumnSpecification(name=f'c{i}', column_type=ColumnType.NUMERIC, dtype=dtype) for i, dtype in enumerate(dtypes)])
+
+        assert [column.dtype for column in Schema.from_records(schema.to_records()).columns] == dtypes
+
     def test_get_column_by_name(self) -> None:
         assert self._schema.get_column_by_name('a') == ColumnSpecification(name='a', column_type=ColumnType.NUMERIC)
 
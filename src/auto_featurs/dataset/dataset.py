@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from enum import Enum
 from pathlib import Path
+from typing import Optional
 
 import polars as pl
+from polars._typing import EngineType
 
+from auto_featurs.base.column_specification import ColumnNameOrSpec
+from auto_featurs.base.column_specification import ColumnRole
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.schema import ColumnSelection
 from auto_featurs.base.schema import ColumnSet
 from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.manifest import Manifest
+from auto_featurs.dataset.profile import DatasetProfile
+from auto_featurs.utils.utils import get_names_from_column_specs
+from auto_featurs.utils.utils import parse_column_name
+from auto_featurs.utils.utils import resolve_engine
 
 logger = logging.getLogger(__name__)
 
 
+class CategoricalEncoding(Enum):
+    CATEGORICAL = 'categorical'
+    ENUM = 'enum'
+
+
+class UnknownCategories(Enum):
+    ERROR = 'error'
+    NULL = 'null'
+
+
 class Dataset:
-    def __init__(self, data: pl.LazyFrame | pl.DataFrame, schema: Schema, drop_columns_outside_schema: bool = False) -> None:
+    def __init__(
+            self,
+            data: pl.LazyFrame | pl.DataFrame,
+            schema: Schema,
+            drop_columns_outside_schema: bool = False,
+            source_paths: Sequence[Path] = (),
+            sort_columns: Sequence[str] = (),
+    ) -> None:
         self._data = data.lazy()
         self._schema: Schema = schema
+        self._source_paths = tuple(source_paths)
+        self._sort_columns = tuple(sort_columns)
+        self._profile: Optional[DatasetProfile] = None
         if drop_columns_outside_schema:
             self._select_columns_in_schema()
 
@@ -33,7 +66,15 @@ class Dataset:
 
     @classmethod
     def from_parquet(cls, path: str | Path, schema: Schema, drop_columns_outside_schema: bool = False) -> Dataset:
-        return cls(pl.scan_parquet(path), schema, drop_columns_outside_schema)
+        source_path = Path(path)
+        source_paths = sorted(source_path.parent.glob(source_path.name)) or [source_path]
+        return cls(pl.scan_parquet(path), schema, drop_columns_outside_schema, source_paths=source_paths)
+
+    @classmethod
+    def from_manifest(cls, directory: str | Path) -> Dataset:
+        manifest = Manifest.load(directory)
+        data = manifest.scan().with_columns(pl.col(manifest.sort_columns[0]).set_sorted()) if manifest.sort_columns else manifest.scan()
+        return cls(data, manifest.schema, source_paths=[manifest.directory / part.path for part in manifest.parts], sort_columns=manifest.sort_columns)
 
     @property
     def data(self) -> pl.LazyFrame:
@@ -43,10 +84,52 @@ class Dataset:
     def schema(self) -> Schema:
         return self._schema
 
+    @property
+    def source_paths(self) -> tuple[Path, ...]:
+        return self._source_paths
+
+    @property
+    def sort_columns(self) -> tuple[str, ...]:
+        return self._sort_columns
+
     @property
     def num_columns(self) -> int:
         return self._schema.num_columns
 
+    @property
+    def cached_profile(self) -> Optional[DatasetProfile]:
+        return self._profile
+
+    def fingerprint(self) -> str:
+        fingerprint = hashlib.sha256(pl.__version__.encode())
+        fingerprint.update(self._data.serialize())
+        for path in self._source_paths:
+            for file_path in sorted(file for file in path.rglob('*') if file.is_file()) if path.is_dir() else [path]:
+                stat = file_path.stat() if file_path.exists() else None
+                fingerprint.update(f'{file_path}:{stat.st_size}:{stat.st_mtime_ns}'.encode() if stat else str(file_path).encode())
+        return fingerprint.hexdigest()
+
+    def profile(self, approximate: bool = False, persist: bool = False) -> DatasetProfile:
+        if self._profile is not None and (approximate or not self._profile.approximate):
+            return self._profile
+
+        fingerprint = self.fingerprint()
+        profile_path = self._profile_path(approximate) if persist else None
+        profile = DatasetProfile.load(profile_path) if profile_path is not None and profile_path.exists() else None
+        if profile is None or profile.fingerprint != fingerprint:
+            profile = DatasetProfile.compute(self._data, fingerprint, approximate)
+            if profile_path is not None:
+                profile.save(profile_path)
+
+        self._profile = profile
+        return profile
+
+    def _profile_path(self, approximate: bool) -> Path:
+        if not self._source_paths:
+            raise ValueError('Persisting a profile requires a dataset scanned from files, use Dataset.from_parquet or Dataset.from_manifest.')
+        source_path = self._source_paths[0]
+        return source_path.parent / f'.{source_path.name}.{'approximate' if approximate else 'exact'}.profile.arrow'
+
     def get_combinations_from_selections(self, *subsets: ColumnSelection) -> list[ColumnSet]:
         return [self.get_columns_from_selection(subset) for subset in subsets]
 
@@ -63,19 +146,79 @@ class Dataset:
         return self._schema.label_column
 
     def drop(self, columns: Iterable[ColumnSpecification]) -> Dataset:
-        return Dataset(self._data.drop(column.name for column in columns), self._schema.drop(columns))
+        columns = list(columns)
+        schema = self._schema.drop(columns)
+        return Dataset(self._data.drop(column.name for column in columns), schema, source_paths=self._source_paths, sort_columns=self._kept_sort_columns(schema))
+
+    def select(self, columns: Iterable[ColumnNameOrSpec]) -> Dataset:
+        schema = Schema(self._schema.get_column_by_name(parse_column_name(column)) for column in columns)
+        return Dataset(self._data.select(schema.column_names), schema, source_paths=self._source_paths, sort_columns=self._kept_sort_columns(schema))
 
     def with_columns(self, new_columns: list[pl.Expr]) -> Dataset:
-        return Dataset(self._data.with_columns(*new_columns), self._schema)
+        return Dataset(self._data.with_columns(*new_columns), self._schema, source_paths=self._source_paths, sort_columns=self._sort_columns)
 
     def with_schema(self, new_schema: Schema) -> Dataset:
-        return Dataset(self._data, self._schema + new_schema)
+        return Dataset(self._data, self._schema + new_schema, source_paths=self._source_paths, sort_columns=self._sort_columns)
 
     def with_cached_computation(self) -> Dataset:
-        return Dataset(self._data.cache(), self._schema)
-
-    def collect(self) -> pl.DataFrame:
-        return self._data.collect()
-
-    def sink_parquet(self, path: str | Path) -> None:
-        self._data.sink_parquet(path, mkdir=True)
+        return Dataset(self._data.cache(), self._schema, source_paths=self._source_paths, sort_columns=self._sort_columns)
+
+    def with_materialized_computation(self, engine: EngineType = 'auto') -> Dataset:
+        return Dataset(self._data.collect(engine=engine), self._schema, source_paths=self._source_paths, sort_columns=self._sort_columns)
+
+    def sort_by_time(self, time_column: Optional[ColumnNameOrSpec] = None, entity_columns: Iterable[ColumnNameOrSpec] = (), assume_sorted: bool = False) -> Dataset:
+        entity_names = [self._schema.get_column_by_name(name).name for name in get_names_from_column_specs(entity_columns)]
+        sort_columns = [*entity_names, self._get_time_column(time_column).name]
+        is_sorted = assume_sorted or self._sort_columns[:len(sort_columns)] == tuple(sort_columns)
+        data = self._data if is_sorted else self._data.sort(sort_columns, maintain_order=True)
+        return Dataset(data.with_columns(pl.col(sort_columns[0]).set_sorted()), self._schema, source_paths=self._source_paths, sort_columns=sort_columns)
+
+    def with_categorical_encoding(
+            self,
+            encoding: CategoricalEncoding = CategoricalEncoding.CATEGORICAL,
+            dtypes: Optional[Mapping[str, pl.DataType]] = None,
+            unknown: UnknownCategories = UnknownCategories.ERROR,
+    ) -> Dataset:
+        dtypes = self._derive_categorical_dtypes(encoding) if dtypes is None else dtypes
+        strict = unknown == UnknownCategories.ERROR
+        data = self._data.with_columns(pl.col(self._schema.get_column_by_name(name).name).cast(dtype, strict=strict) for name, dtype in dtypes.items())
+        return Dataset(data, self._schema, source_paths=self._source_paths, sort_columns=self._sort_columns)
+
+    def categorical_dtypes(self) -> dict[str, pl.DataType]:
+        data_schema = self._data.collect_schema()
+        return {
+            column.name: data_schema[column.name] for column in self.get_columns_from_selection([ColumnType.NOMINAL, ColumnType.ORDINAL])
+            if isinstance(data_schema.get(column.name), (pl.Categorical, pl.Enum))
+        }
+
+    def _derive_categorical_dtypes(self, encoding: CategoricalEncoding) -> dict[str, pl.DataType]:
+        data_schema = self._data.collect_schema()
+        names = [column.name for column in self.get_columns_from_selection([ColumnType.NOMINAL, ColumnType.ORDINAL]) if data_schema.get(column.name) == pl.String]
+        if encoding == CategoricalEncoding.CATEGORICAL or not names:
+            return dict.fromkeys(names, pl.Categorical())
+        categories = self._data.select(pl.col(name).unique().drop_nulls().sort().implode() for name in names).collect(engine='streaming')
+        return {name: pl.Enum(categories[name].item()) for name in names}
+
+    def _get_time_column(self, time_column: Optional[ColumnNameOrSpec]) -> ColumnSpecification:
+        if time_column is not None:
+            column = self._schema.get_column_by_name(parse_column_name(time_column))
+            if column.column_role != ColumnRole.TIME_INFO:
+                raise ValueError(f'Column {column.name} has to have the {ColumnRole.TIME_INFO} role to define the row order.')
+            return column
+        time_columns = self._schema.get_columns_of_role(ColumnRole.TIME_INFO)
+        if len(time_columns) != 1:
+            raise ValueError(f'Expected exactly one {ColumnRole.TIME_INFO} column to define the row order, found {len(time_columns)}, pass time_column explicitly.')
+        return time_columns[0]
+
+    def _kept_sort_columns(self, schema: Schema) -> tuple[str, ...]:
+        kept_names = set(schema.column_names)
+        for i, name in enumerate(self._sort_columns):
+            if name not in kept_names:
+                return self._sort_columns[:i]
+        return self._sort_columns
+
+    def collect(self, engine: EngineType = 'auto', streaming: bool = False) -> pl.DataFrame:
+        return self._data.collect(engine=resolve_engine(engine, streaming))
+
+    def sink_parquet(self, path: str | Path, engine: EngineType = 'auto', streaming: bool = False) -> None:
+        self._data.sink_parquet(path, mkdir=True, engine=resolve_engine(engine, streaming))
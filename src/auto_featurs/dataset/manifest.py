@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+import polars as pl
+
+from auto_featurs.base.schema import Schema
+
+MANIFEST_FILE_NAME = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestPart:
+    path: str
+    columns: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class Manifest:
+    directory: Path
+    parts: list[ManifestPart]
+    schema: Schema
+    sort_columns: list[str] = field(default_factory=list)
+
+    def save(self) -> None:
+        content = {
+            'format_version': MANIFEST_FORMAT_VERSION,
+            'parts': [{'path': part.path, 'columns': part.columns} for part in self.parts],
+            'schema': self.schema.to_records(),
+            'sort_columns': self.sort_columns,
+        }
+        (self.directory / MANIFEST_FILE_NAME).write_text(json.dumps(content))
+
+    @classmethod
+    def load(cls, directory: str | Path) -> Manifest:
+        directory = Path(directory)
+        content = json.loads((directory / MANIFEST_FILE_NAME).read_text())
+        if content['format_version'] != MANIFEST_FORMAT_VERSION:
+            raise ValueError(f'Unsupported manifest format version {content['format_version']}, expected {MANIFEST_FORMAT_VERSION}.')
+
+        return cls(
+            directory=directory,
+            parts=[ManifestPart(path=part['path'], columns=part['columns']) for part in content['parts']],
+            schema=Schema.from_records(content['schema']),
+            sort_columns=content.get('sort_columns', []),
+        )
+
+    def scan(self) -> pl.LazyFrame:
+        return pl.concat([pl.scan_parquet(self.directory / part.path).select(part.columns) for part in self.parts], how='horizontal')
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import polars as pl
+
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+
+NUM_ROWS_COLUMN = f'{HIDDEN_COLUMN_PREFIX}num_rows'
+APPROXIMATE_COLUMN = f'{HIDDEN_COLUMN_PREFIX}approximate'
+FINGERPRINT_COLUMN = f'{HIDDEN_COLUMN_PREFIX}fingerprint'
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnProfile:
+    name: str
+    num_unique: int
+    null_fraction: float
+    min: Any
+    max: Any
+    is_sorted: Optional[bool]
+
+    @property
+    def is_constant(self) -> bool:
+        return self.num_unique <= 1
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetProfile:
+    stats: pl.DataFrame
+    num_rows: int
+    approximate: bool
+    fingerprint: str
+
+    @classmethod
+    def compute(cls, data: pl.LazyFrame, fingerprint: str, approximate: bool = False) -> DatasetProfile:
+        column_stats = [cls._column_stats(name, dtype, approximate) for name, dtype in data.collect_schema().items()]
+        stats = data.select(*column_stats, pl.len().alias(NUM_ROWS_COLUMN)).collect(engine='streaming')
+        return cls(stats=stats.drop(NUM_ROWS_COLUMN), num_rows=stats[NUM_ROWS_COLUMN].item(), approximate=approximate, fingerprint=fingerprint)
+
+    @classmethod
+    def load(cls, path: str | Path) -> DatasetProfile:
+        stats = pl.read_ipc(path, memory_map=False)
+        return cls(
+            stats=stats.drop(NUM_ROWS_COLUMN, APPROXIMATE_COLUMN, FINGERPRINT_COLUMN),
+            num_rows=stats[NUM_ROWS_COLUMN].item(),
+            approximate=stats[APPROXIMATE_COLUMN].item(),
+            fingerprint=stats[FINGERPRINT_COLUMN].item(),
+        )
+
+    def save(self, path: str | Path) -> None:
+        self.stats.with_columns(
+            pl.lit(self.num_rows).alias(NUM_ROWS_COLUMN),
+            pl.lit(self.approximate).alias(APPROXIMATE_COLUMN),
+            pl.lit(self.fingerprint).alias(FINGERPRINT_COLUMN),
+        ).write_ipc(path)
+
+    @property
+    def column_names(self) -> list[str]:
+        return self.stats.columns
+
+    def __contains__(self, column_name: object) -> bool:
+        return column_name in self.stats.columns
+
+    def __getitem__(self, column_name: str) -> ColumnProfile:
+        if column_name not in self:
+            raise KeyError(f'Column {column_name} is not profiled.')
+        return ColumnProfile(name=column_name, **self.stats[column_name].item())
+
+    def to_frame(self) -> pl.DataFrame:
+        return pl.concat([
+            self.stats.select(pl.lit(name).alias('name'), pl.col(name).struct.unnest()).with_columns(pl.col('min', 'max').cast(pl.String))
+            for name in self.column_names
+        ])
+
+    @staticmethod
+    def _column_stats(name: str, dtype: pl.DataType, approximate: bool) -> pl.Expr:
+        column = pl.col(name)
+        is_orderable = dtype.is_numeric() or dtype.is_temporal() or dtype in (pl.String, pl.Boolean)
+        return pl.struct(
+            (column.approx_n_unique() if approximate else column.n_unique()).cast(pl.UInt64).alias('num_unique'),
+            (column.null_count() / pl.len()).alias('null_fraction'),
+            (column.min() if is_orderable else pl.lit(None)).alias('min'),
+            (column.max() if is_orderable else pl.lit(None)).alias('max'),
+            ((column.null_count() == 0) & (column >= column.shift(1)).all() if is_orderable else pl.lit(None, dtype=pl.Boolean)).alias('is_sorted'),
+        ).alias(name)
@@ -7,7 +7,12 @@ from auto_featurs.base.column_specification import ColumnRole
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import CategoricalEncoding
 from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.dataset.dataset import UnknownCategories
+from auto_featurs.dataset.manifest import Manifest
+from auto_featurs.dataset.manifest import ManifestPart
+from auto_featurs.dataset.profile import ColumnProfile
 from auto_featurs.utils.utils import get_names_from_column_specs
 
 
@@ -28,6 +33,128 @@ class TestDataset:
 
         assert isinstance(ds, Dataset)
         assert ds.schema.column_names == ['a', 'b', 'c']
+        assert ds.source_paths == (tmp_path / 'test.parquet',)
+
+    def test_from_parquet_glob_tracks_matched_files(self, tmp_path: Path) -> None:
+        for name in ['second.parquet', 'first.parquet']:
+            pl.DataFrame({'a': [1], 'b': ['x'], 'c': [2]}).write_parquet(tmp_path / name)
+
+        ds = Dataset.from_parquet(tmp_path / '*.parquet', self._schema)
+
+        assert ds.source_paths == (tmp_path / 'first.parquet', tmp_path / 'second.parquet')
+        assert ds.select(['a']).source_paths == ds.source_paths
+
+    def test_from_manifest(self, tmp_path: Path) -> None:
+        pl.DataFrame({'a': [1, 3], 'hidden': [0, 0]}).write_parquet(tmp_path / 'first.parquet')
+        pl.DataFrame({'b': ['x', 'y'], 'c': [2, 4]}).write_parquet(tmp_path / 'second.parquet')
+        Manifest(directory=tmp_path, parts=[ManifestPart('first.parquet', ['a']), ManifestPart('second.parquet', ['b', 'c'])], schema=self._schema).save()
+
+        ds = Dataset.from_manifest(tmp_path)
+
+        assert ds.schema == self._schema
+        assert ds.collect().equals(pl.DataFrame({'a': [1, 3], 'b': ['x', 'y'], 'c': [2, 4]}))
+        assert ds.source_paths == (tmp_path / 'first.parquet', tmp_path / 'second.parquet')
+
+    def test_fingerprint_tracks_plan_and_source_files(self, tmp_path: Path) -> None:
+        self._df.write_parquet(tmp_path / 'test.parquet')
+        ds = Dataset.from_parquet(tmp_path / 'test.parquet', self._schema)
+        fingerprint = ds.fingerprint()
+
+        assert Dataset.from_parquet(tmp_path / 'test.parquet', self._schema).fingerprint() == fingerprint
+        assert ds.with_columns([pl.col('a') + 1]).fingerprint() != fingerprint
+        pl.concat([self._df, self._df]).write_parquet(tmp_path / 'test.parquet')
+        assert ds.fingerprint() != fingerprint
+
+    def test_sort_by_time_sorts_once_and_flags_data(self) -> None:
+        schema = Schema([ColumnSpecification.nominal(name='entity'), ColumnSpecification.datetime(name='time', role=ColumnRole.TIME_INFO)])
+        ds = Dataset(pl.LazyFrame({'entity': ['b', 'a', 'b', 'a'], 'time': [2, 3, 1, 1]}), schema)
+
+        sorted_ds = ds.sort_by_time(entity_columns=['entity'])
+        resorted_ds = sorted_ds.sort_by_time(entity_columns=['entity'])
+
+        assert sorted_ds.sort_columns == ('entity', 'time')
+        assert sorted_ds.collect().equals(pl.DataFrame({'entity': ['a', 'a', 'b', 'b'], 'time': [1, 3, 1, 2]}))
+        assert sorted_ds.collect()['entity'].flags['SORTED_ASC']
+        assert resorted_ds.data.explain().count('SORT BY') == 1
+        assert sorted_ds.select(['time']).sort_columns == ()
+
+    def test_sort_by_time_trusts_asserted_order(self) -> None:
+        schema = Schema([ColumnSpecification.datetime(name='time', role=ColumnRole.TIME_INFO)])
+        ds = Dataset(pl.LazyFrame({'time': [1, 1, 2, 5]}), schema)
+
+        assert 'SORT BY' in ds.sort_by_time().data.explain()
+        assert 'SORT BY' not in ds.sort_by_time(assume_sorted=True).data.explain()
+        assert ds.sort_by_time(assume_sorted=True).collect()['time'].flags['SORTED_ASC']
+
+    def test_sort_by_time_requires_time_info_column(self) -> None:
+        with pytest.raises(ValueError, match='Expected exactly one'):
+            self._ds.sort_by_time()
+        with pytest.raises(ValueError, match='role to define the row order'):
+            self._ds.sort_by_time('a')
+
+    def test_categorical_encoding_casts_string_categorical_columns(self) -> None:
+        schema = Schema([ColumnSpecification.nominal(name='nominal'), ColumnSpecification.numeric(name='numeric'), ColumnSpecification.nominal(name='encoded')])
+        ds = Dataset(pl.LazyFrame({'nominal': ['y', 'x'], 'numeric': [1, 2], 'encoded': [0, 1]}), schema)
+
+        encoded_ds = ds.with_categorical_encoding()
+
+        assert encoded_ds.categorical_dtypes() == {'nominal': pl.Categorical()}
+        assert encoded_ds.collect().schema == pl.Schema({'nominal': pl.Categorical(), 'numeric': pl.Int64(), 'encoded': pl.Int64()})
+
+    def test_enum_encoding_is_reused_across_datasets(self) -> None:
+        schema = Schema([ColumnSpecification.nominal(name='merchant'), ColumnSpecification.ordinal(name='tier')])
+        train_ds = Dataset(pl.LazyFrame({'merchant': ['b', 'a', None], 'tier': ['low', 'high', 'low']}), schema).with_categorical_encoding(CategoricalEncoding.ENUM)
+        test_ds = Dataset(pl.LazyFrame({'merchant': ['b', 'a'], 'tier': ['high', 'low']}), schema).with_categorical_encoding(dtypes=train_ds.categorical_dtypes())
+
+        dtypes = {'merchant': pl.Enum(['a', 'b']), 'tier': pl.Enum(['high', 'low'])}
+        assert train_ds.categorical_dtypes() == dtypes
+        assert test_ds.collect().equals(pl.DataFrame({'merchant': ['b', 'a'], 'tier': ['high', 'low']}, schema=dtypes))
+        assert test_ds.collect()['merchant'].to_physical().to_list() == [1, 0]
+
+    def test_enum_encoding_of_unknown_categories(self) -> None:
+        schema = Schema([ColumnSpecification.nominal(name='merchant')])
+        dtypes = Dataset(pl.LazyFrame({'merchant': ['b', 'a']}), schema).with_categorical_encoding(CategoricalEncoding.ENUM).categorical_dtypes()
+        test_ds = Dataset(pl.LazyFrame({'merchant': ['c', 'a']}), schema)
+
+        with pytest.raises(pl.exceptions.InvalidOperationError, match="column 'merchant'.*\\[\"c\"\\]"):
+            test_ds.with_categorical_encoding(dtypes=dtypes).collect()
+        assert test_ds.with_categorical_encoding(dtypes=dtypes, unknown=UnknownCategories.NULL).collect()['merchant'].to_list() == [None, 'a']
+
+    def test_profile_is_computed_once_and_cached(self) -> None:
+        ds = Dataset(pl.LazyFrame({'a': [1, 2, None, 4], 'b': ['x', 'x', 'x', 'x'], 'c': [3, 1, 2, 2]}), self._schema)
+
+        profile = ds.profile()
+
+        assert ds.cached_profile is profile
+        assert ds.profile(approximate=True) is profile
+        assert profile.num_rows == 4
+        assert profile['a'] == ColumnProfile(name='a', num_unique=4, null_fraction=0.25, min=1, max=4, is_sorted=False)
+        assert profile['b'].is_constant
+        assert profile['c'].is_sorted is False
+        assert profile.to_frame()['name'].to_list() == ['a', 'b', 'c']
+        with pytest.raises(KeyError):
+            profile['missing']
+
+    def test_profile_is_sorted_requires_no_nulls(self) -> None:
+        ds = Dataset(pl.LazyFrame({'a': [1, 2, 2, 4], 'b': [1, None, 3, 4], 'c': [None, 1, 2, 3], 'd': [1.0, 2.0, 3.0, None]}), self._schema)
+
+        profile = ds.profile()
+
+        assert [profile[name].is_sorted for name in ['a', 'b', 'c', 'd']] == [True, False, False, False]
+
+    def test_profile_is_persisted_alongside_parquet(self, tmp_path: Path) -> None:
+        self._df.write_parquet(tmp_path / 'test.parquet')
+
+        profile = Dataset.from_parquet(tmp_path / 'test.parquet', self._schema).profile(persist=True)
+        reloaded_profile = Dataset.from_parquet(tmp_path / 'test.parquet', self._schema).profile(persist=True)
+
+        assert (tmp_path / '.test.parquet.exact.profile.arrow').exists()
+        assert reloaded_profile.stats.equals(profile.stats)
+        assert reloaded_profile.fingerprint == profile.fingerprint
+        pl.concat([self._df, self._df]).write_parquet(tmp_path / 'test.parquet')
+        assert Dataset.from_parquet(tmp_path / 'test.parquet', self._schema).profile(persist=True).num_rows == 2
+        with pytest.raises(ValueError, match='scanned from files'):
+            self._ds.profile(persist=True)
 
     def test_data_is_lazy(self) -> None:
         assert isinstance(self._ds.data, pl.LazyFrame)
@@ -107,3 +234,22 @@ class TestDataset:
         df = pl.read_parquet(tmp_path / 'test.parquet')
 
         assert df.columns == ['a', 'b', 'c', 'a_1']
+
+    def test_collect_streaming(self) -> None:
+        out = self._ds.collect(streaming=True)
+        assert out.equals(self._df)
+
+    def test_sink_parquet_streaming(self, tmp_path: Path) -> None:
+        new = self._ds.with_columns([pl.col('a').add(1).alias('a_1')])
+        new.sink_parquet(tmp_path / 'test.parquet', engine='streaming')
+
+        df = pl.read_parquet(tmp_path / 'test.parquet')
+
+        assert df.columns == ['a', 'b', 'c', 'a_1']
+
+    def test_with_materialized_computation(self) -> None:
+        new = self._ds.with_columns([pl.col('a').add(1).alias('a_1')]).with_materialized_computation(engine='streaming')
+
+        assert isinstance(new.data, pl.LazyFrame)
+        assert new.data.explain(optimized=False).startswith('DF [')
+        assert new.collect().columns == ['a', 'b', 'c', 'a_1']
@@ -60,10 +60,13 @@ class FeatureSelector:
         order = pl.DataFrame({'stat': report.stat_values, 'name': report.feature_names}).with_row_index(name='idx').sort(['stat', 'name'], descending=[True, False])['idx']
         return report.feature_names[order].head(num_to_select).to_list()
 
-    def get_report(self, dataset: Dataset, feature_subset: ColumnSelection, method: SelectionMethod) -> SelectionReport:
+    def get_report(self, dataset: Dataset, feature_subset: ColumnSelection, method: SelectionMethod, skip_constant_features: bool = False) -> SelectionReport:
         label_col = dataset.get_label_column()
         feature_cols = dataset.get_columns_from_selection(feature_subset)
         self._check_valid_types(feature_cols, label_col, method)
+        if skip_constant_features:
+            profile = dataset.profile()
+            feature_cols = [col for col in feature_cols if not profile[col.name].is_constant]
 
         label_col_name = label_col.name
         feature_col_names = get_names_from_column_specs(feature_cols)
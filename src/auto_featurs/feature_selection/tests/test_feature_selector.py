@@ -90,6 +90,12 @@ class TestFeatureSelector:
         assert dict_res['x4'] == 0.4472135954999579
         assert len(dict_res) == 4
 
+    def test_correlation_report_skips_constant_features(self) -> None:
+        out = self._selector.get_report(self._ds, (ColumnType.NUMERIC | ColumnType.BOOLEAN) & ~ColumnRole.LABEL, method=SelectionMethod.CORRELATION, skip_constant_features=True)
+
+        assert out.feature_names.to_list() == ['x2', 'x3', 'x4']
+        assert self._ds.cached_profile is not None
+
     @pytest.mark.parametrize('feature', ['z1', 'z2'])
     def test_select_by_ttest_invalid_feature_type(self, feature: str) -> None:
         with pytest.raises(ValueError, match=f'T-Test can only be computed for numeric, boolean, ordinal columns, but {feature} is of type ColumnType..'):
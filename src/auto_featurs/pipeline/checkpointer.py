@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import polars as pl
+from polars._typing import EngineType
+
+from auto_featurs.dataset.dataset import Dataset
+
+
+class CheckpointMode(Enum):
+    NONE = 'none'
+    MEMORY = 'memory'
+    DISK = 'disk'
+
+
+class Checkpointer:
+    def __init__(self, modes: Sequence[CheckpointMode], directory: Optional[str | Path] = None, engine: EngineType = 'auto') -> None:
+        if CheckpointMode.DISK in modes and directory is None:
+            raise ValueError('Disk checkpoints require a checkpoint_directory.')
+        self._modes = list(modes)
+        self._directory = Path(directory or '.')
+        self._engine: EngineType = engine
+
+    def checkpoint(self, dataset: Dataset, layer_index: int) -> Dataset:
+        match self._modes[layer_index]:
+            case CheckpointMode.NONE:
+                return dataset
+            case CheckpointMode.MEMORY:
+                return dataset.with_materialized_computation(engine=self._engine)
+            case CheckpointMode.DISK:
+                return self._checkpoint_to_disk(dataset, layer_index)
+
+    def _checkpoint_to_disk(self, dataset: Dataset, layer_index: int) -> Dataset:
+        path = self._directory / f'layer-{layer_index + 1:03d}-{dataset.fingerprint()}.arrow'
+        if not path.exists():
+            partial_path = path.with_suffix('.partial')
+            dataset.data.sink_ipc(partial_path, mkdir=True, engine=self._engine)
+            partial_path.rename(path)
+        data = pl.scan_ipc(path, memory_map=True)
+        if dataset.sort_columns:
+            data = data.with_columns(pl.col(dataset.sort_columns[0]).set_sorted())
+        return Dataset(data, dataset.schema, source_paths=[path], sort_columns=dataset.sort_columns)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+from polars._typing import EngineType
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.execution_plan import DropStage
+from auto_featurs.pipeline.execution_plan import GroupByJoinStage
+from auto_featurs.pipeline.execution_plan import GroupIdStage
+from auto_featurs.pipeline.execution_plan import LayerPlan
+from auto_featurs.pipeline.execution_plan import LookupJoinStage
+from auto_featurs.pipeline.execution_plan import ReorderStage
+from auto_featurs.pipeline.execution_plan import RollingJoinStage
+from auto_featurs.pipeline.execution_plan import SelectStage
+from auto_featurs.pipeline.execution_plan import Stage
+from auto_featurs.pipeline.execution_plan import WithColumnsStage
+from auto_featurs.utils.utils import resolve_engine
+
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPipeline:
+    layer_plans: list[LayerPlan]
+    schema: Schema
+    auxiliary_columns: list[ColumnSpecification]
+
+    def transform(self, data: Dataset | pl.LazyFrame | pl.DataFrame) -> Dataset:
+        lazy_data = data.data if isinstance(data, Dataset) else data.lazy()
+        for layer_plan in self.layer_plans:
+            lazy_data = layer_plan.apply(lazy_data)
+        return Dataset(lazy_data.drop(column.name for column in self.auxiliary_columns), self.schema)
+
+    def collect(self, data: Dataset | pl.LazyFrame | pl.DataFrame, engine: EngineType = 'auto', streaming: bool = False) -> pl.DataFrame:
+        return self.transform(data).collect(engine=resolve_engine(engine, streaming))
+
+    def save(self, path: str | Path) -> None:
+        content = {
+            'format_version': FORMAT_VERSION,
+            'polars_version': pl.__version__,
+            'schema': self.schema.to_records(),
+            'auxiliary_columns': Schema(self.auxiliary_columns).to_records(),
+            'layers': [
+                {'stages': [_serialize_stage(stage) for stage in layer_plan.stages], 'hidden_columns': layer_plan.hidden_columns}
+                for layer_plan in self.layer_plans
+            ],
+        }
+        Path(path).write_text(json.dumps(content))
+
+    @classmethod
+    def load(cls, path: str | Path) -> CompiledPipeline:
+        content = json.loads(Path(path).read_text())
+        if content['format_version'] != FORMAT_VERSION:
+            raise ValueError(f'Unsupported compiled pipeline format version {content['format_version']}, expected {FORMAT_VERSION}.')
+        if content['polars_version'] != pl.__version__:
+            raise ValueError(f'Compiled pipeline was saved with polars {content['polars_version']} and cannot be loaded with polars {pl.__version__}.')
+
+        return cls(
+            layer_plans=[
+                LayerPlan(stages=[_deserialize_stage(stage) for stage in layer['stages']], hidden_columns=layer['hidden_columns'])
+                for layer in content['layers']
+            ],
+            schema=Schema.from_records(content['schema']),
+            auxiliary_columns=Schema.from_records(content['auxiliary_columns']).columns,
+        )
+
+
+def _serialize_stage(stage: Stage) -> dict[str, Any]:
+    match stage:
+        case WithColumnsStage(exprs=exprs):
+            return {'type': 'with_columns', 'exprs': _serialize_exprs(exprs)}
+        case SelectStage(exprs=exprs, dropped_columns=dropped_columns):
+            return {'type': 'select', 'exprs': _serialize_exprs(exprs), 'dropped_columns': dropped_columns}
+        case DropStage(columns=columns):
+            return {'type': 'drop', 'columns': columns}
+        case GroupByJoinStage(keys=keys, exprs=exprs):
+            return {'type': 'group_by_join', 'keys': keys, 'exprs': _serialize_exprs(exprs)}
+        case RollingJoinStage(index_column=index_column, period=period, keys=keys, exprs=exprs):
+            return {'type': 'rolling_join', 'index_column': index_column, 'period': _serialize_period(period), 'keys': keys, 'exprs': _serialize_exprs(exprs)}
+        case ReorderStage(columns=columns):
+            return {'type': 'reorder', 'columns': columns}
+        case GroupIdStage(keys=keys, columns=columns):
+            return {'type': 'group_id', 'keys': keys, 'columns': columns}
+        case LookupJoinStage(keys=keys, table=table):
+            return {'type': 'lookup_join', 'keys': keys, 'table': _encode(table.serialize())}
+        case _:
+            raise ValueError(f'Cannot serialize stage of type {type(stage).__name__}.')
+
+
+def _deserialize_stage(stage: dict[str, Any]) -> Stage:
+    match stage['type']:
+        case 'with_columns':
+            return WithColumnsStage(_deserialize_exprs(stage['exprs']))
+        case 'select':
+            return SelectStage(exprs=_deserialize_exprs(stage['exprs']), dropped_columns=stage['dropped_columns'])
+        case 'drop':
+            return DropStage(stage['columns'])
+        case 'group_by_join':
+            return GroupByJoinStage(keys=stage['keys'], exprs=_deserialize_exprs(stage['exprs']))
+        case 'rolling_join':
+            return RollingJoinStage(index_column=stage['index_column'], period=_deserialize_period(stage['period']), keys=stage['keys'], exprs=_deserialize_exprs(stage['exprs']))
+        case 'reorder':
+            return ReorderStage(stage['columns'])
+        case 'group_id':
+            return GroupIdStage(keys=stage['keys'], columns=stage['columns'])
+        case 'lookup_join':
+            return LookupJoinStage(keys=stage['keys'], table=pl.DataFrame.deserialize(io.BytesIO(_decode(stage['table']))))
+        case stage_type:
+            raise ValueError(f'Unknown stage type {stage_type!r}.')
+
+
+def _serialize_exprs(exprs: list[pl.Expr]) -> list[str]:
+    return [_encode(expr.meta.serialize()) for expr in exprs]
+
+
+def _deserialize_exprs(exprs: list[str]) -> list[pl.Expr]:
+    return [pl.Expr.deserialize(io.BytesIO(_decode(expr))) for expr in exprs]
+
+
+def _serialize_period(period: str | timedelta) -> dict[str, str | int]:
+    if isinstance(period, timedelta):
+        return {'microseconds': period // timedelta(microseconds=1)}
+    return {'duration': period}
+
+
+def _deserialize_period(period: dict[str, Any]) -> str | timedelta:
+    if 'microseconds' in period:
+        return timedelta(microseconds=period['microseconds'])
+    return str(period['duration'])
+
+
+def _encode(payload: bytes) -> str:
+    return base64.b64encode(payload).decode('ascii')
+
+
+def _decode(payload: str) -> bytes:
+    return base64.b64decode(payload)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import polars as pl
+from polars._typing import PolarsDataType
+from polars.datatypes import parse_into_dtype
+
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.datetime_transformers import SeasonalTransformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+
+COUNT_TRANSFORMERS = (CountTransformer, NumUniqueTransformer)
+
+
+@dataclass(frozen=True, slots=True)
+class DtypePolicy:
+    float_dtype: Optional[PolarsDataType] = None
+    downcast_integers: bool = False
+
+    def __post_init__(self) -> None:
+        if self.float_dtype is not None and not parse_into_dtype(self.float_dtype).is_float():
+            raise ValueError(f'float_dtype has to be a floating point dtype, got {self.float_dtype}.')
+
+    def is_active(self) -> bool:
+        return self.float_dtype is not None or self.downcast_integers
+
+    def target_dtype(self, transformer: Transformer, dtype: pl.DataType) -> Optional[pl.DataType]:
+        if dtype.is_float():
+            return self._resolved_float_dtype()
+        if not self.downcast_integers or not dtype.is_integer():
+            return None
+
+        while isinstance(transformer, (OverWrapper, RollingWrapper)):
+            transformer = transformer.inner_transformer
+        if isinstance(transformer, SeasonalTransformer):
+            return pl.UInt8()
+        if isinstance(transformer, COUNT_TRANSFORMERS):
+            return pl.UInt32()
+        return None
+
+    def _resolved_float_dtype(self) -> Optional[pl.DataType]:
+        if self.float_dtype is None:
+            return None
+        float_dtype = parse_into_dtype(self.float_dtype)
+        return float_dtype if isinstance(float_dtype, pl.DataType) else float_dtype()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Optional
+
+import polars as pl
+from polars.datatypes import DataTypeClass
+
+from auto_featurs.transformers.base import ExecutionKind
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+
+BYTES_PER_VALUE: dict[DataTypeClass, float] = {
+    pl.Boolean: 1 / 8,
+    pl.Int8: 1,
+    pl.UInt8: 1,
+    pl.Int16: 2,
+    pl.UInt16: 2,
+    pl.Int32: 4,
+    pl.UInt32: 4,
+    pl.Float32: 4,
+    pl.Date: 4,
+    pl.Categorical: 4,
+    pl.Enum: 4,
+    pl.Int64: 8,
+    pl.UInt64: 8,
+    pl.Float64: 8,
+    pl.Datetime: 8,
+    pl.Duration: 8,
+    pl.Time: 8,
+    pl.Int128: 16,
+    pl.Decimal: 16,
+    pl.Null: 0,
+}
+VARIABLE_WIDTH_BYTES_PER_VALUE = 16
+ROW_INDEX_BYTES = 4
+
+ESTIMATE_SCHEMA = {
+    'layer': pl.UInt32,
+    'execution_kind': pl.String,
+    'num_new_columns': pl.UInt32,
+    'num_columns': pl.UInt32,
+    'bytes_per_row': pl.Float64,
+    'output_bytes': pl.Int64,
+    'frame_bytes': pl.Int64,
+    'peak_bytes': pl.Int64,
+}
+
+
+class Estimator:
+    def __init__(self, max_output_columns: Optional[int] = None, memory_budget: Optional[int] = None) -> None:
+        if max_output_columns is not None and max_output_columns < 1:
+            raise ValueError(f'max_output_columns has to be a positive integer, got {max_output_columns}.')
+        if memory_budget is not None and memory_budget < 1:
+            raise ValueError(f'memory_budget has to be a positive number of bytes, got {memory_budget}.')
+        self._max_output_columns = max_output_columns
+        self._memory_budget = memory_budget
+
+    @property
+    def max_output_columns(self) -> Optional[int]:
+        return self._max_output_columns
+
+    @property
+    def memory_budget(self) -> Optional[int]:
+        return self._memory_budget
+
+    def has_budget(self) -> bool:
+        return self._max_output_columns is not None or self._memory_budget is not None
+
+    def estimate(self, layers: Sequence[Sequence[Transformer]], layer_schemas: Sequence[pl.Schema], num_rows: int) -> pl.DataFrame:
+        rows: list[dict[str, object]] = []
+        for i, (layer, schema) in enumerate(zip(layers, layer_schemas[1:], strict=True)):
+            new_column_names = [transformer.output_column_specification.name for transformer in layer]
+            output_bytes = round(num_rows * sum(self._bytes_per_value(schema[name]) for name in new_column_names))
+            bytes_per_row = sum(self._bytes_per_value(dtype) for dtype in schema.dtypes())
+            frame_bytes = round(num_rows * bytes_per_row)
+            execution_kind = ExecutionKind.WINDOW if any(transformer.execution_kind() == ExecutionKind.WINDOW for transformer in layer) else ExecutionKind.ROW_LOCAL
+            rows.append({
+                'layer': i + 1,
+                'execution_kind': execution_kind.value,
+                'num_new_columns': len(new_column_names),
+                'num_columns': len(schema),
+                'bytes_per_row': bytes_per_row,
+                'output_bytes': output_bytes,
+                'frame_bytes': frame_bytes,
+                'peak_bytes': frame_bytes + num_rows * ROW_INDEX_BYTES * self._count_window_contexts(layer),
+            })
+
+        return pl.DataFrame(rows, schema=ESTIMATE_SCHEMA)
+
+    def check_output_columns(self, num_input_columns: int, layers: Sequence[Sequence[Transformer]]) -> None:
+        if self._max_output_columns is None:
+            return
+        num_columns = num_input_columns
+        for i, layer in enumerate(layers):
+            num_columns += len(layer)
+            if num_columns > self._max_output_columns:
+                raise ValueError(f'Pipeline would hold {num_columns} columns after layer {i + 1}, more than max_output_columns={self._max_output_columns}.')
+
+    def check_memory(self, estimate: pl.DataFrame) -> None:
+        if self._memory_budget is None or estimate.is_empty():
+            return
+        peak_layer, peak_bytes = estimate.select(pl.col('layer', 'peak_bytes').top_k_by('peak_bytes', k=1)).row(0)
+        if peak_bytes > self._memory_budget:
+            raise ValueError(f'Pipeline is estimated to need {peak_bytes} bytes in layer {peak_layer}, more than memory_budget={self._memory_budget}.')
+
+    @staticmethod
+    def _bytes_per_value(dtype: pl.DataType) -> float:
+        return BYTES_PER_VALUE.get(dtype.base_type(), VARIABLE_WIDTH_BYTES_PER_VALUE)
+
+    @staticmethod
+    def _count_window_contexts(layer: Sequence[Transformer]) -> int:
+        contexts: set[tuple[str, ...]] = set()
+        for transformer in layer:
+            if transformer.execution_kind() != ExecutionKind.WINDOW:
+                continue
+            context: list[str] = []
+            while isinstance(transformer, (OverWrapper, RollingWrapper)):
+                context.extend(transformer.over_columns if isinstance(transformer, OverWrapper) else [transformer.index_column.name, str(transformer.time_window)])
+                transformer = transformer.inner_transformer
+            contexts.add(tuple(context))
+        return len(contexts)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import timedelta
+
+import polars as pl
+
+
+class Stage(ABC):
+    @abstractmethod
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def output_columns(self) -> list[str]:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True, slots=True)
+class WithColumnsStage(Stage):
+    exprs: list[pl.Expr]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        if not self.exprs:
+            return data
+        return data.with_columns(*self.exprs)
+
+    @property
+    def output_columns(self) -> list[str]:
+        return [expr.meta.output_name() for expr in self.exprs]
+
+
+@dataclass(frozen=True, slots=True)
+class SelectStage(Stage):
+    exprs: list[pl.Expr]
+    dropped_columns: list[str]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.select(pl.exclude(*self.dropped_columns, *self.output_columns), *self.exprs)
+
+    @property
+    def output_columns(self) -> list[str]:
+        return [expr.meta.output_name() for expr in self.exprs]
+
+
+@dataclass(frozen=True, slots=True)
+class DropStage(Stage):
+    columns: list[str]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        if not self.columns:
+            return data
+        return data.drop(self.columns)
+
+    @property
+    def output_columns(self) -> list[str]:
+        return []
+
+
+@dataclass(frozen=True, slots=True)
+class GroupByJoinStage(Stage):
+    keys: list[str]
+    exprs: list[pl.Expr]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        if not self.exprs:
+            return data
+        aggregated = data.group_by(self.keys).agg(*self.exprs)
+        return data.join(aggregated, on=self.keys, how='left', nulls_equal=True, maintain_order='left')
+
+    @property
+    def output_columns(self) -> list[str]:
+        return [expr.meta.output_name() for expr in self.exprs]
+
+
+@dataclass(frozen=True, slots=True)
+class RollingJoinStage(Stage):
+    index_column: str
+    period: str | timedelta
+    keys: list[str]
+    exprs: list[pl.Expr]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        if not self.exprs:
+            return data
+        join_columns = [*self.keys, self.index_column]
+        aggregated = (
+            data
+            .rolling(index_column=self.index_column, period=self.period, group_by=self.keys or None)
+            .agg(*self.exprs)
+            .unique(subset=join_columns, keep='any')
+        )
+        return data.join(aggregated, on=join_columns, how='left', nulls_equal=True, maintain_order='left')
+
+    @property
+    def output_columns(self) -> list[str]:
+        return [expr.meta.output_name() for expr in self.exprs]
+
+
+@dataclass(frozen=True, slots=True)
+class LookupJoinStage(Stage):
+    keys: list[str]
+    table: pl.DataFrame
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.join(self.table.lazy(), on=self.keys, how='left', nulls_equal=True, maintain_order='left')
+
+    @property
+    def output_columns(self) -> list[str]:
+        return [column for column in self.table.columns if column not in self.keys]
+
+
+@dataclass(frozen=True, slots=True)
+class GroupIdStage(Stage):
+    keys: list[list[str]]
+    columns: list[str]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(pl.struct(keys).rank('dense').alias(name) for keys, name in zip(self.keys, self.columns, strict=True))
+
+    @property
+    def output_columns(self) -> list[str]:
+        return list(self.columns)
+
+
+@dataclass(frozen=True, slots=True)
+class ReorderStage(Stage):
+    columns: list[str]
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.select(pl.exclude(self.columns), pl.col(self.columns))
+
+    @property
+    def output_columns(self) -> list[str]:
+        return []
+
+
+@dataclass(frozen=True, slots=True)
+class LayerPlan:
+    stages: list[Stage] = field(default_factory=list)
+    hidden_columns: list[str] = field(default_factory=list)
+    output_dtypes: dict[str, pl.DataType] = field(default_factory=dict)
+
+    def apply(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        for stage in self.stages:
+            data = stage.apply(data)
+        return data
+
+    @property
+    def num_stages(self) -> int:
+        return len(self.stages)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Mapping
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import polars as pl
+from polars._typing import EngineType
+
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.transformers.base import Transformer
+
+CACHE_FILE_SUFFIX = '.arrow'
+STAGING_FILE_SUFFIX = '.staging'
+
+
+class FeatureCache:
+    def __init__(self, directory: str | Path, max_bytes: Optional[int] = None) -> None:
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f'max_bytes has to be a positive number of bytes, got {max_bytes}.')
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self._max_bytes
+
+    @property
+    def num_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self._entries())
+
+    def feature_keys(self, layers: Sequence[Sequence[Transformer]], dataset: Dataset, salt: str = '') -> dict[str, str]:
+        dataset_hash = hashlib.sha256(f'{dataset.fingerprint()}:{salt}'.encode())
+        feature_keys: dict[str, str] = {}
+        for layer in layers:
+            for transformer in layer:
+                expr = transformer.transform()
+                feature_hash = dataset_hash.copy()
+                feature_hash.update(expr.meta.serialize())
+                for input_name in sorted(transformer.input_column_names()):
+                    feature_hash.update(f'{input_name}={feature_keys.get(input_name, '')}'.encode())
+                feature_keys[transformer.output_column_specification.name] = feature_hash.hexdigest()
+        return feature_keys
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._path(key).exists()
+
+    def scan(self, key: str) -> pl.LazyFrame:
+        path = self._path(key)
+        if not path.exists():
+            raise KeyError(f'Feature {key} is not cached.')
+        os.utime(path)
+        return pl.scan_ipc(path, memory_map=False)
+
+    def sink(self, data: pl.LazyFrame, keys: Mapping[str, str], engine: EngineType = 'auto') -> None:
+        staging_path = self._directory / f'{uuid4().hex}{STAGING_FILE_SUFFIX}'
+        data.select(list(keys)).sink_ipc(staging_path, engine=engine)
+        try:
+            for name, key in keys.items():
+                partial_path = self._path(key).with_suffix(STAGING_FILE_SUFFIX)
+                pl.scan_ipc(staging_path, memory_map=False).select(name).sink_ipc(partial_path, engine=engine)
+                partial_path.replace(self._path(key))
+        finally:
+            staging_path.unlink()
+
+    def clear(self) -> None:
+        for path in self._entries():
+            path.unlink()
+
+    def evict(self) -> None:
+        if self._max_bytes is None:
+            return
+        entries = sorted(self._entries(), key=lambda path: path.stat().st_mtime_ns)
+        num_bytes = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if num_bytes <= self._max_bytes:
+                break
+            num_bytes -= path.stat().st_size
+            path.unlink()
+
+    def _entries(self) -> list[Path]:
+        return list(self._directory.glob(f'*{CACHE_FILE_SUFFIX}'))
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f'{key}{CACHE_FILE_SUFFIX}'
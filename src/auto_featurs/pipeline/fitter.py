@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+import polars as pl
+
+from auto_featurs.pipeline.execution_plan import LookupJoinStage
+from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.aggregating_transformers import Moment
+from auto_featurs.transformers.aggregating_transformers import MomentAggregationTransformer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.numeric_transformers import ScalingTransformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+
+type OverKeys = tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FittedLayer:
+    exprs: dict[str, pl.Expr] = field(default_factory=dict)
+    lookup_stages: list[LookupJoinStage] = field(default_factory=list)
+
+    @property
+    def hidden_columns(self) -> list[str]:
+        return [column for stage in self.lookup_stages for column in stage.output_columns]
+
+
+@dataclass(frozen=True, slots=True)
+class _FittableTransform:
+    over_keys: OverKeys
+    statistics: dict[str, pl.Expr]
+    build: Callable[[Mapping[str, pl.Expr]], pl.Expr]
+    order_by: tuple[str, ...] = ()
+
+
+class Fitter:
+    def fit_layer(self, layer: Sequence[Transformer], data: pl.LazyFrame) -> FittedLayer:
+        fittable: dict[str, _FittableTransform] = {}
+        for transformer in layer:
+            fittable_transform = self._get_fittable_transform(transformer)
+            if fittable_transform is not None:
+                fittable[transformer.output_column_specification.name] = fittable_transform
+
+        if not fittable:
+            return FittedLayer()
+
+        statistics_per_keys: dict[tuple[OverKeys, tuple[str, ...]], dict[str, pl.Expr]] = {}
+        for fittable_transform in fittable.values():
+            statistics_per_keys.setdefault((fittable_transform.over_keys, fittable_transform.order_by), {}).update(fittable_transform.statistics)
+
+        queries = []
+        for (keys, order_by), statistics in statistics_per_keys.items():
+            ordered_data = data.sort(order_by, maintain_order=True) if order_by else data
+            queries.append(ordered_data.group_by(keys).agg(**statistics) if keys else ordered_data.select(**statistics))
+
+        resolved: dict[str, pl.Expr] = {}
+        lookup_stages: list[LookupJoinStage] = []
+        for (keys, _), table in zip(statistics_per_keys, pl.collect_all(queries), strict=True):
+            if keys:
+                lookup_stages.append(LookupJoinStage(keys=list(keys), table=table))
+                resolved.update({name: pl.col(name) for name in table.columns if name not in keys})
+            else:
+                resolved.update({name: pl.lit(table.get_column(name).item(), dtype=dtype) for name, dtype in table.schema.items()})
+
+        exprs = {name: fittable_transform.build(resolved).alias(name) for name, fittable_transform in fittable.items()}
+        return FittedLayer(exprs=exprs, lookup_stages=lookup_stages)
+
+    def _get_fittable_transform(self, transformer: Transformer) -> Optional[_FittableTransform]:
+        if isinstance(transformer, ScalingTransformer):
+            return self._get_scaling_fittable_transform(transformer)
+
+        over_keys: OverKeys = ()
+        order_by: tuple[str, ...] = ()
+        aggregation: Transformer = transformer
+        if isinstance(transformer, OverWrapper):
+            over_keys = tuple(transformer.over_columns)
+            order_by = tuple(transformer.order_by)
+            aggregation = transformer.inner_transformer
+
+        if not isinstance(aggregation, AggregatingTransformer):
+            return None
+
+        if aggregation.is_scalar_aggregation():
+            statistic_name = self._hidden_name(transformer.output_column_specification.name)
+            return _FittableTransform(over_keys, {statistic_name: aggregation.transform()}, lambda resolved: resolved[statistic_name], order_by)
+
+        if isinstance(aggregation, MomentAggregationTransformer) and aggregation.cumulative == CumulativeOptions.NONE:
+            return self._get_moments_fittable_transform(transformer, aggregation, over_keys)
+
+        return None
+
+    def _get_scaling_fittable_transform(self, transformer: ScalingTransformer) -> _FittableTransform:
+        statistic_names = {statistic: self._hidden_name(f'{transformer.output_column_specification.name}_{statistic}') for statistic in transformer.statistics()}
+        return _FittableTransform(
+            over_keys=(),
+            statistics={statistic_names[statistic]: expr for statistic, expr in transformer.statistics().items()},
+            build=lambda resolved: transformer.transform_from_statistics({statistic: resolved[name] for statistic, name in statistic_names.items()}),
+        )
+
+    def _get_moments_fittable_transform(self, transformer: Transformer, aggregation: MomentAggregationTransformer, over_keys: OverKeys) -> _FittableTransform:
+        moment_names: dict[Moment, str] = {}
+        statistics: dict[str, pl.Expr] = {}
+        for moment, moment_transformer in aggregation.moments().items():
+            named_transformer = transformer.with_inner_transformer(moment_transformer) if isinstance(transformer, OverWrapper) else moment_transformer
+            moment_names[moment] = self._hidden_name(named_transformer.output_column_specification.name)
+            statistics[moment_names[moment]] = moment_transformer.transform()
+
+        return _FittableTransform(
+            over_keys=over_keys,
+            statistics=statistics,
+            build=lambda resolved: aggregation.transform_from_moments({moment: resolved[name] for moment, name in moment_names.items()}),
+        )
+
+    @staticmethod
+    def _hidden_name(column_name: str) -> str:
+        return f'{HIDDEN_COLUMN_PREFIX}{column_name}'
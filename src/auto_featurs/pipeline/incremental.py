@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Callable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Optional
+
+import numpy as np
+import polars as pl
+
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.aggregating_transformers import MaxTransformer
+from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import MinTransformer
+from auto_featurs.transformers.aggregating_transformers import ModeTransformer
+from auto_featurs.transformers.aggregating_transformers import Moment
+from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
+from auto_featurs.transformers.aggregating_transformers import StdTransformer
+from auto_featurs.transformers.aggregating_transformers import SumTransformer
+from auto_featurs.transformers.aggregating_transformers import ZscoreTransformer
+from auto_featurs.transformers.base import ExecutionKind
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+from auto_featurs.utils.utils import order_preserving_unique
+
+type StateTables = dict[str, pl.DataFrame]
+
+ENTITY_COLUMN = f'{HIDDEN_COLUMN_PREFIX}entity'
+PRIOR_PREFIX = f'{HIDDEN_COLUMN_PREFIX}prior_'
+CURRENT_PREFIX = f'{HIDDEN_COLUMN_PREFIX}current_'
+
+SEEN_VALUES_SUFFIX = '/seen_values'
+VALUE_COUNTS_SUFFIX = '/value_counts'
+
+EXTREMUM_COMBINATIONS: dict[type[Transformer], Callable[[pl.Expr, pl.Expr], pl.Expr]] = {MinTransformer: pl.min_horizontal, MaxTransformer: pl.max_horizontal}
+
+
+@dataclass(frozen=True, slots=True)
+class IncrementalState:
+    tables: Mapping[str, pl.DataFrame] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not self.tables
+
+
+class _IncrementalFeature(ABC):
+    def __init__(self, name: str, keys: Sequence[str], dtype: pl.DataType, dependencies: Sequence[_IncrementalFeature] = ()) -> None:
+        self._name = name
+        self._keys = list(keys)
+        self._dtype = dtype
+        self._dependencies = list(dependencies)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def dependencies(self) -> list[_IncrementalFeature]:
+        return self._dependencies
+
+    def state_names(self) -> list[str]:
+        return [self._name]
+
+    def update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        output, updated_state = self._update(batch, state)
+        return output.cast(self._dtype).alias(self._name), updated_state
+
+    @abstractmethod
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        raise NotImplementedError
+
+    def _is_first_row(self) -> pl.Expr:
+        return pl.int_range(pl.len()).over(self._keys) == 0
+
+
+class _RunningTotalFeature(_IncrementalFeature):
+    def __init__(
+            self,
+            name: str,
+            keys: Sequence[str],
+            dtype: pl.DataType,
+            cumulative: CumulativeOptions,
+            inclusive_expr: pl.Expr,
+            finalize: Callable[[pl.Expr], pl.Expr] = lambda expr: expr,
+            dependencies: Sequence[_IncrementalFeature] = (),
+    ) -> None:
+        super().__init__(name, keys, dtype, dependencies)
+        self._cumulative = cumulative
+        self._inclusive_expr = inclusive_expr
+        self._finalize = finalize
+
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        data = _join_prior(batch, state.get(self._name), self._keys, ['total', 'last'])
+        prior_total = _prior('total')
+        total = prior_total.fill_null(0)
+
+        data = data.with_columns((self._inclusive_expr.over(self._keys) + total).alias(_current_name('running')))
+        running = _current('running')
+
+        if self._cumulative == CumulativeOptions.INCLUSIVE:
+            output = running
+        else:
+            has_history = prior_total.is_not_null()
+            shifted = self._inclusive_expr.shift(1, fill_value=0).over(self._keys) + total
+            output = pl.when(self._is_first_row() & has_history).then(_prior('last')).otherwise(shifted)
+
+        updated = data.group_by(self._keys, maintain_order=True).agg(
+            running.drop_nulls().last().fill_null(total.first()).alias('total'),
+            running.last().alias('last'),
+        )
+        return data.select(self._finalize(output)).to_series(), {self._name: _merge_state(state.get(self._name), updated, self._keys)}
+
+
+class _RunningExtremumFeature(_IncrementalFeature):
+    def __init__(
+            self,
+            name: str,
+            keys: Sequence[str],
+            dtype: pl.DataType,
+            cumulative: CumulativeOptions,
+            inclusive_expr: pl.Expr,
+            combine: Callable[[pl.Expr, pl.Expr], pl.Expr],
+    ) -> None:
+        super().__init__(name, keys, dtype)
+        self._cumulative = cumulative
+        self._inclusive_expr = inclusive_expr
+        self._combine = combine
+
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        data = _join_prior(batch, state.get(self._name), self._keys, ['extremum'])
+        prior_extremum = _prior('extremum')
+
+        data = data.with_columns(self._combine(prior_extremum, self._inclusive_expr.over(self._keys)).alias(_current_name('running')))
+        running = _current('running')
+
+        if self._cumulative == CumulativeOptions.INCLUSIVE:
+            output = running
+        else:
+            previous_running = self._combine(prior_extremum, self._inclusive_expr.shift(1).over(self._keys))
+            output = previous_running.fill_null(np.nan)
+
+        updated = data.group_by(self._keys, maintain_order=True).agg(running.last().alias('extremum'))
+        return data.select(output).to_series(), {self._name: _merge_state(state.get(self._name), updated, self._keys)}
+
+
+class _RunningNumUniqueFeature(_IncrementalFeature):
+    def __init__(self, name: str, keys: Sequence[str], dtype: pl.DataType, cumulative: CumulativeOptions, column: str, filtering_condition: pl.Expr) -> None:
+        super().__init__(name, keys, dtype)
+        self._cumulative = cumulative
+        self._column = column
+        self._filtering_condition = filtering_condition
+        self._value_keys = order_preserving_unique([*self._keys, column])
+
+    def state_names(self) -> list[str]:
+        return [self._name, self._seen_values_name]
+
+    @property
+    def _seen_values_name(self) -> str:
+        return self._name + SEEN_VALUES_SUFFIX
+
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        data = _join_prior(batch, state.get(self._seen_values_name), self._value_keys, ['seen'])
+        data = _join_prior(data, state.get(self._name), self._keys, ['total', 'first_non_null', 'any_null', 'distinct_totals'])
+        prior_first_non_null = _prior('first_non_null')
+        total = _prior('total').fill_null(0)
+
+        is_new_value = pl.col(self._column).is_first_distinct() & _prior('seen').is_null() & self._filtering_condition
+        data = data.with_columns((is_new_value.cum_sum().over(self._keys) + total).alias(_current_name('running')))
+        running = _current('running')
+
+        last_non_null = pl.coalesce(running.forward_fill().over(self._keys), pl.when(prior_first_non_null.is_not_null()).then(total))
+        first_non_null = pl.coalesce(prior_first_non_null, running.drop_nulls().first().over(self._keys))
+        any_null = _prior('any_null').fill_null(False) | (running.is_null().cum_sum().over(self._keys) > 0)
+        distinct_totals = pl.when(last_non_null.is_not_null()).then(last_non_null - first_non_null + 1).otherwise(0) + any_null.cast(pl.UInt32)
+        data = data.with_columns(
+            first_non_null.alias(_current_name('first_non_null')),
+            any_null.alias(_current_name('any_null')),
+            distinct_totals.alias(_current_name('distinct_totals')),
+        )
+
+        if self._cumulative == CumulativeOptions.INCLUSIVE:
+            output = running
+        else:
+            previous_distinct_totals = _current('distinct_totals').shift(1).over(self._keys)
+            output = pl.when(self._is_first_row()).then(_prior('distinct_totals').fill_null(0)).otherwise(previous_distinct_totals)
+
+        updated = data.group_by(self._keys, maintain_order=True).agg(
+            running.drop_nulls().last().fill_null(total.first()).alias('total'),
+            _current('first_non_null').last().alias('first_non_null'),
+            _current('any_null').last().alias('any_null'),
+            _current('distinct_totals').last().alias('distinct_totals'),
+        )
+        seen_values = data.select(self._value_keys).unique(maintain_order=True).with_columns(pl.lit(True).alias('seen'))
+
+        updated_state = {
+            self._name: _merge_state(state.get(self._name), updated, self._keys),
+            self._seen_values_name: _merge_state(state.get(self._seen_values_name), seen_values, self._value_keys),
+        }
+        return data.select(output).to_series(), updated_state
+
+
+class _RunningModeFeature(_IncrementalFeature):
+    def __init__(self, name: str, keys: Sequence[str], dtype: pl.DataType, cumulative: CumulativeOptions, column: str, filtering_condition: pl.Expr) -> None:
+        super().__init__(name, keys, dtype)
+        self._cumulative = cumulative
+        self._column = column
+        self._filtering_condition = filtering_condition
+        self._value_keys = order_preserving_unique([*self._keys, column])
+
+    def state_names(self) -> list[str]:
+        return [self._name, self._value_counts_name]
+
+    @property
+    def _value_counts_name(self) -> str:
+        return self._name + VALUE_COUNTS_SUFFIX
+
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        data = _join_prior(batch, state.get(self._value_counts_name), self._value_keys, ['value_rows', 'value_count'])
+        data = _join_prior(data, state.get(self._name), self._keys, ['mode_count', 'mode'])
+
+        value_rows = _prior('value_rows').fill_null(0)
+        value_count = pl.when(self._filtering_condition).then(value_rows + pl.int_range(1, pl.len() + 1)).forward_fill().fill_null(_prior('value_count').fill_null(0))
+        data = data.with_columns(value_count.over(self._value_keys).alias(_current_name('value_count')))
+
+        mode_count = pl.max_horizontal(_prior('mode_count').fill_null(0), _current('value_count').cum_max().over(self._keys))
+        data = data.with_columns(mode_count.alias(_current_name('mode_count')))
+
+        mode = pl.when(_current('value_count') == _current('mode_count')).then(pl.col(self._column)).forward_fill().over(self._keys).fill_null(_prior('mode'))
+        data = data.with_columns(mode.alias(_current_name('mode')))
+
+        if self._cumulative == CumulativeOptions.INCLUSIVE:
+            output = _current('mode')
+        else:
+            previous_mode = _current('mode').shift(1).over(self._keys)
+            output = pl.when(self._is_first_row()).then(_prior('mode')).otherwise(previous_mode)
+
+        updated = data.group_by(self._keys, maintain_order=True).agg(
+            _current('mode_count').last().alias('mode_count'),
+            _current('mode').last().alias('mode'),
+        )
+        updated_value_counts = data.group_by(self._value_keys, maintain_order=True).agg(
+            (value_rows.first() + pl.len()).alias('value_rows'),
+            _current('value_count').last().alias('value_count'),
+        )
+
+        updated_state = {
+            self._name: _merge_state(state.get(self._name), updated, self._keys),
+            self._value_counts_name: _merge_state(state.get(self._value_counts_name), updated_value_counts, self._value_keys),
+        }
+        return data.select(output).to_series(), updated_state
+
+
+class _MomentCompositionFeature(_IncrementalFeature):
+    def __init__(self, name: str, dtype: pl.DataType, expr: pl.Expr, dependencies: Sequence[_IncrementalFeature]) -> None:
+        super().__init__(name, (), dtype, dependencies)
+        self._expr = expr
+
+    def state_names(self) -> list[str]:
+        return []
+
+    def _update(self, batch: pl.DataFrame, state: Mapping[str, pl.DataFrame]) -> tuple[pl.Series, StateTables]:
+        return batch.select(self._expr).to_series(), {}
+
+
+class IncrementalUpdater:
+    def update(self, batch: pl.DataFrame, layers: Sequence[Sequence[Transformer]], state: IncrementalState) -> tuple[pl.DataFrame, IncrementalState]:
+        data = batch.with_columns(pl.lit(0, dtype=pl.UInt8).alias(ENTITY_COLUMN))
+        updated_tables: StateTables = {}
+
+        for layer in layers:
+            features = [self._build_feature(transformer, data.schema) for transformer in layer]
+            self._validate_state(state, features)
+
+            layer_outputs: dict[str, pl.Series | pl.Expr] = {}
+            hidden_columns: list[str] = []
+            for transformer, feature in zip(layer, features, strict=True):
+                if feature is None:
+                    layer_outputs[transformer.output_column_specification.name] = transformer.transform()
+                    continue
+                for dependency in self._flatten_dependencies(feature):
+                    if dependency.name not in data.columns:
+                        output, tables = dependency.update(data, state.tables)
+                        data = data.with_columns(output)
+                        hidden_columns.append(dependency.name)
+                        updated_tables |= tables
+                output, tables = feature.update(data, state.tables)
+                layer_outputs[feature.name] = output
+                updated_tables |= tables
+
+            data = data.with_columns(*layer_outputs.values()).drop(hidden_columns)
+
+        return data.drop(ENTITY_COLUMN), IncrementalState(updated_tables)
+
+    @staticmethod
+    def _validate_state(state: IncrementalState, features: Sequence[Optional[_IncrementalFeature]]) -> None:
+        if state.is_empty():
+            return
+        required = {name for feature in features if feature is not None for dependency in [*IncrementalUpdater._flatten_dependencies(feature), feature] for name in dependency.state_names()}
+        missing = required - set(state.tables)
+        if missing:
+            raise ValueError(f'Incremental state does not match the pipeline, missing state for: {sorted(missing)}.')
+
+    @staticmethod
+    def _flatten_dependencies(feature: _IncrementalFeature) -> list[_IncrementalFeature]:
+        dependencies: list[_IncrementalFeature] = []
+        for dependency in feature.dependencies:
+            dependencies.extend(IncrementalUpdater._flatten_dependencies(dependency))
+            dependencies.append(dependency)
+        return dependencies
+
+    def _build_feature(self, transformer: Transformer, schema: pl.Schema) -> Optional[_IncrementalFeature]:
+        if transformer.execution_kind() == ExecutionKind.ROW_LOCAL:
+            return None
+        return self._build_aggregation_feature(transformer, transformer.output_column_specification.name, schema)
+
+    def _build_aggregation_feature(self, transformer: Transformer, name: str, schema: pl.Schema) -> _IncrementalFeature:
+        dtype = pl.LazyFrame(schema=schema).select(transformer.transform()).collect_schema().dtypes()[0]
+
+        keys = [ENTITY_COLUMN]
+        aggregation = transformer
+        wrapper: Optional[OverWrapper[Any]] = None
+        if isinstance(transformer, OverWrapper):
+            keys = transformer.over_columns
+            aggregation = transformer.inner_transformer
+            wrapper = transformer
+
+        cumulative = getattr(aggregation, 'cumulative', CumulativeOptions.NONE)
+        if cumulative == CumulativeOptions.NONE:
+            raise ValueError(f'{transformer.output_column_specification.name} cannot be updated incrementally, only cumulative aggregations are supported.')
+
+        feature = self._build_running_feature(aggregation, name, keys, dtype, cumulative, wrapper, schema)
+        if feature is None:
+            raise ValueError(f'{transformer.output_column_specification.name} cannot be updated incrementally, {type(aggregation).__name__} does not keep a running state.')
+        return feature
+
+    def _build_running_feature(
+            self,
+            aggregation: Transformer,
+            name: str,
+            keys: list[str],
+            dtype: pl.DataType,
+            cumulative: CumulativeOptions,
+            wrapper: Optional[OverWrapper[Any]],
+            schema: pl.Schema,
+    ) -> Optional[_IncrementalFeature]:
+        match aggregation:
+            case CountTransformer():
+                inclusive_count = CountTransformer(CumulativeOptions.INCLUSIVE, aggregation.filtering_condition)
+                return _RunningTotalFeature(name, keys, dtype, cumulative, inclusive_count.transform())
+            case SumTransformer():
+                inclusive_total = type(aggregation)(aggregation.column, CumulativeOptions.INCLUSIVE, aggregation.filtering_condition)
+                return _RunningTotalFeature(name, keys, dtype, cumulative, inclusive_total.transform())
+            case MinTransformer() | MaxTransformer():
+                inclusive_extremum = type(aggregation)(aggregation.column, CumulativeOptions.INCLUSIVE, aggregation.filtering_condition)
+                return _RunningExtremumFeature(name, keys, dtype, cumulative, inclusive_extremum.transform(), EXTREMUM_COMBINATIONS[type(aggregation)])
+            case StdTransformer():
+                mean_transformer = aggregation.mean_transformer
+                dependencies, moment_columns = self._build_moment_dependencies(mean_transformer, wrapper, schema)
+                mean_diff = pl.col(aggregation.column).filter(aggregation.filtering_condition) - mean_transformer.transform_from_moments(moment_columns)
+                inclusive_sum_squared_mean_diff = mean_diff.pow(2).fill_nan(0.0).cum_sum()
+                return _RunningTotalFeature(name, keys, dtype, cumulative, inclusive_sum_squared_mean_diff, finalize=lambda expr: expr.sqrt(), dependencies=dependencies)
+            case MeanTransformer() | ZscoreTransformer():
+                dependencies, moment_columns = self._build_moment_dependencies(aggregation, wrapper, schema)
+                return _MomentCompositionFeature(name, dtype, aggregation.transform_from_moments(moment_columns), dependencies)
+            case NumUniqueTransformer():
+                return _RunningNumUniqueFeature(name, keys, dtype, cumulative, aggregation.column, aggregation.filtering_condition)
+            case ModeTransformer():
+                return _RunningModeFeature(name, keys, dtype, cumulative, aggregation.column.name, aggregation.filtering_condition)
+            case _:
+                return None
+
+    def _build_moment_dependencies(
+            self,
+            aggregation: MeanTransformer | ZscoreTransformer,
+            wrapper: Optional[OverWrapper[Any]],
+            schema: pl.Schema,
+    ) -> tuple[list[_IncrementalFeature], dict[Moment, pl.Expr]]:
+        dependencies: list[_IncrementalFeature] = []
+        moment_columns: dict[Moment, pl.Expr] = {}
+        for moment, moment_transformer in aggregation.moments().items():
+            moment_transformer = wrapper.with_inner_transformer(moment_transformer) if wrapper is not None else moment_transformer
+            moment_name = f'{HIDDEN_COLUMN_PREFIX}{moment_transformer.output_column_specification.name}'
+            dependencies.append(self._build_aggregation_feature(moment_transformer, moment_name, schema))
+            moment_columns[moment] = pl.col(moment_name)
+        return dependencies, moment_columns
+
+
+def _prior(field_name: str) -> pl.Expr:
+    return pl.col(PRIOR_PREFIX + field_name)
+
+
+def _current(field_name: str) -> pl.Expr:
+    return pl.col(_current_name(field_name))
+
+
+def _current_name(field_name: str) -> str:
+    return CURRENT_PREFIX + field_name
+
+
+def _join_prior(data: pl.DataFrame, prior_state: Optional[pl.DataFrame], keys: Sequence[str], fields: Sequence[str]) -> pl.DataFrame:
+    if prior_state is None:
+        return data.with_columns(pl.lit(None).alias(PRIOR_PREFIX + field_name) for field_name in fields)
+    prior_state = prior_state.select(*keys, *(pl.col(field_name).alias(PRIOR_PREFIX + field_name) for field_name in fields))
+    return data.join(prior_state, on=list(keys), how='left', nulls_equal=True, maintain_order='left')
+
+
+def _merge_state(prior_state: Optional[pl.DataFrame], updated: pl.DataFrame, keys: Sequence[str]) -> pl.DataFrame:
+    if prior_state is None:
+        return updated
+    untouched = prior_state.join(updated, on=list(keys), how='anti', nulls_equal=True)
+    return pl.concat([untouched, updated], how='vertical_relaxed')
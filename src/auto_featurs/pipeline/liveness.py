@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Sequence
+
+from auto_featurs.transformers.base import Transformer
+
+
+class LivenessAnalyzer:
+    def dead_columns_per_layer(self, layers: Sequence[Sequence[Transformer]], droppable_names: Iterable[str]) -> list[list[str]]:
+        last_use_layer: dict[str, int] = {}
+        for i, layer in enumerate(layers):
+            for transformer in layer:
+                last_use_layer[transformer.output_column_specification.name] = i
+                last_use_layer.update(dict.fromkeys(transformer.input_column_names(), i))
+
+        dead_columns: list[list[str]] = [[] for _ in layers]
+        for name in droppable_names:
+            dead_columns[last_use_layer.get(name, 0)].append(name)
+        return dead_columns
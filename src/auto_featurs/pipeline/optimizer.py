@@ -1,10 +1,16 @@
 from collections.abc import Iterable
 from collections.abc import Iterator
+from collections.abc import Sequence
 from enum import IntEnum
+from itertools import combinations
+from itertools import permutations
+from itertools import product
 
 from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import ColumnSet
 from auto_featurs.base.schema import Schema
 from auto_featurs.transformers.base import Transformer
+from auto_featurs.utils.utils import order_preserving_unique
 
 
 class OptimizationLevel(IntEnum):
@@ -24,11 +30,11 @@ class Optimizer:
     @staticmethod
     def deduplicate_transformers_against_layers(present_schema: Schema, current_layer_additions: Iterable[Transformer]) -> list[Transformer]:
         deduplicated_current_layer_additions: list[Transformer] = []
-        already_present_columns = set(present_schema.columns)
+        already_present_columns: set[ColumnSpecification] = set()
 
         for transformer in current_layer_additions:
             col_spec = transformer.output_column_specification
-            if col_spec not in already_present_columns:
+            if col_spec not in already_present_columns and col_spec not in present_schema:
                 deduplicated_current_layer_additions.append(transformer)
                 already_present_columns.add(col_spec)
 
@@ -62,3 +68,15 @@ class Optimizer:
         if self._optimization_level >= OptimizationLevel.DEDUPLICATE_COMMUTATIVE:
             optimized = self._deduplicate_input_columns_for_transformer(transformer, optimized)
         yield from optimized
+
+    def enumerate_input_columns(self, transformer: type[Transformer], input_columns: Sequence[ColumnSet]) -> Iterator[tuple[ColumnSpecification, ...]]:
+        has_identical_positions = bool(input_columns) and all(columns == input_columns[0] for columns in input_columns[1:])
+        if not has_identical_positions or self._optimization_level < OptimizationLevel.SKIP_SELF:
+            yield from self.optimize_input_columns(transformer, product(*input_columns))
+            return
+
+        unique_columns = order_preserving_unique(input_columns[0])
+        if self._optimization_level >= OptimizationLevel.DEDUPLICATE_COMMUTATIVE and transformer.is_commutative():
+            yield from combinations(unique_columns, len(input_columns))
+        else:
+            yield from permutations(unique_columns, len(input_columns))
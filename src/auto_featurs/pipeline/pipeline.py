@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Mapping
 from collections.abc import Sequence
 from datetime import timedelta
+from itertools import batched
 from itertools import product
 from pathlib import Path
 from typing import Any
@@ -11,6 +14,7 @@ from typing import Optional
 
 import polars as pl
 from more_itertools import flatten
+from polars._typing import EngineType
 
 from auto_featurs.base.column_specification import ColumnNameOrSpec
 from auto_featurs.base.column_specification import ColumnSpecification
@@ -18,8 +22,26 @@ from auto_featurs.base.schema import ColumnSelection
 from auto_featurs.base.schema import ColumnSet
 from auto_featurs.base.schema import Schema
 from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.dataset.manifest import Manifest
+from auto_featurs.dataset.manifest import ManifestPart
+from auto_featurs.pipeline.checkpointer import Checkpointer
+from auto_featurs.pipeline.checkpointer import CheckpointMode
+from auto_featurs.pipeline.compiled_pipeline import CompiledPipeline
+from auto_featurs.pipeline.dtype_policy import DtypePolicy
+from auto_featurs.pipeline.estimator import Estimator
+from auto_featurs.pipeline.execution_plan import LayerPlan
+from auto_featurs.pipeline.feature_cache import FeatureCache
+from auto_featurs.pipeline.fitter import FittedLayer
+from auto_featurs.pipeline.fitter import Fitter
+from auto_featurs.pipeline.incremental import IncrementalState
+from auto_featurs.pipeline.incremental import IncrementalUpdater
+from auto_featurs.pipeline.liveness import LivenessAnalyzer
 from auto_featurs.pipeline.optimizer import OptimizationLevel
 from auto_featurs.pipeline.optimizer import Optimizer
+from auto_featurs.pipeline.planner import OverStrategy
+from auto_featurs.pipeline.planner import Planner
+from auto_featurs.pipeline.profiler import Profiler
+from auto_featurs.pipeline.sharded_executor import ShardedExecutor
 from auto_featurs.pipeline.validator import Validator
 from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
 from auto_featurs.transformers.aggregating_transformers import ArgMaxTransformer
@@ -33,6 +55,7 @@ from auto_featurs.transformers.aggregating_transformers import LaggedTransformer
 from auto_featurs.transformers.aggregating_transformers import ModeTransformer
 from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
 from auto_featurs.transformers.aggregating_transformers import PointwiseMutualInformationTransformer
+from auto_featurs.transformers.base import ExecutionKind
 from auto_featurs.transformers.base import Transformer
 from auto_featurs.transformers.comparison_transformers import Comparisons
 from auto_featurs.transformers.datetime_transformers import SeasonalOperation
@@ -47,8 +70,10 @@ from auto_featurs.transformers.rolling_wrapper import RollingWrapper
 from auto_featurs.transformers.text_transformers import TextCountMatchesTransformer
 from auto_featurs.transformers.text_transformers import TextExtraction
 from auto_featurs.transformers.text_transformers import TextSimilarity
+from auto_featurs.utils.utils import get_names_from_column_specs
 from auto_featurs.utils.utils import get_valid_param_options
 from auto_featurs.utils.utils import order_preserving_unique
+from auto_featurs.utils.utils import resolve_engine
 
 type TransformerLayers = list[list[Transformer]]
 
@@ -60,12 +85,28 @@ class Pipeline:
         transformers: Optional[TransformerLayers] = None,
         optimization_level: OptimizationLevel = OptimizationLevel.NONE,
         auxiliary_columns: Optional[list[ColumnSpecification]] = None,
+        over_strategy: OverStrategy = OverStrategy.WINDOW,
+        fitted_layers: Optional[list[FittedLayer]] = None,
+        max_output_columns: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        dtype_policy: Optional[DtypePolicy] = None,
+        max_exprs_per_stage: Optional[int] = None,
+        hoist_group_ids: bool = False,
+        feature_cache: Optional[FeatureCache] = None,
     ) -> None:
         self._dataset = dataset
         self._transformers: TransformerLayers = transformers or [[]]
         self._auxiliary_columns: list[ColumnSpecification] = auxiliary_columns or []
         self._optimizer = Optimizer(optimization_level)
         self._validator = Validator()
+        self._planner = Planner(over_strategy, dtype_policy, max_exprs_per_stage, hoist_group_ids, dataset.cached_profile)
+        self._incremental_updater = IncrementalUpdater()
+        self._fitter = Fitter()
+        self._profiler = Profiler(self._planner)
+        self._estimator = Estimator(max_output_columns, memory_budget)
+        self._liveness_analyzer = LivenessAnalyzer()
+        self._feature_cache = feature_cache
+        self._fitted_layers = fitted_layers
 
     def with_seasonal(self, subset: ColumnSelection, operations: Sequence[SeasonalOperation], angular: bool = False, periodic: bool = False, auxiliary: bool = False) -> Pipeline:
         input_columns = self._dataset.get_combinations_from_selections(subset)
@@ -405,33 +446,200 @@ class Pipeline:
 
     def with_new_layer(self) -> Pipeline:
         new_layer_schema = self._get_schema_from_transformers(self._current_layer())
-        return Pipeline(
-            dataset=self._dataset.with_schema(new_schema=new_layer_schema),
-            transformers=self._transformers + [[]],
-            optimization_level=self._optimizer.optimization_level,
-            auxiliary_columns=self._auxiliary_columns,
+        return self._with(dataset=self._dataset.with_schema(new_schema=new_layer_schema), transformers=self._transformers + [[]], fitted_layers=None)
+
+    def collect_plan(
+            self,
+            cache_computation: bool = False,
+            checkpoint: CheckpointMode | Sequence[CheckpointMode] = CheckpointMode.NONE,
+            checkpoint_directory: Optional[str | Path] = None,
+            engine: EngineType = 'auto',
+            streaming: bool = False,
+    ) -> Dataset:
+        checkpoint_modes = [checkpoint] * len(self._transformers) if isinstance(checkpoint, CheckpointMode) else list(checkpoint)
+        if len(checkpoint_modes) != len(self._transformers):
+            raise ValueError(f'Expected one checkpoint mode per layer ({len(self._transformers)}), got {len(checkpoint_modes)}.')
+        dataset = self._apply_layers(checkpointer=Checkpointer(checkpoint_modes, checkpoint_directory, resolve_engine(engine, streaming)))
+
+        if cache_computation:
+            return dataset.with_cached_computation()
+        return dataset
+
+    def fit(self, dataset: Optional[Dataset] = None) -> Pipeline:
+        data = (dataset or self._dataset).data
+        fitted_layers: list[FittedLayer] = []
+        for layer in self._transformers:
+            fitted_layer = self._fitter.fit_layer(layer, data)
+            data = self._planner.plan_layer(layer, data, fitted_layer).apply(data)
+            fitted_layers.append(fitted_layer)
+
+        return self._with(fitted_layers=fitted_layers)
+
+    def is_fitted(self) -> bool:
+        return self._fitted_layers is not None
+
+    def transform(self, dataset: Dataset) -> Dataset:
+        if self._fitted_layers is None:
+            raise ValueError('Pipeline has to be fitted before transforming another dataset, call fit() first.')
+        all_outputs_schema = self._get_schema_from_transformers(list(flatten(self._transformers)))
+        return self._apply_layers(dataset=dataset.with_schema(new_schema=all_outputs_schema))
+
+    def collect(self, engine: EngineType = 'auto', streaming: bool = False, columns: Optional[Sequence[ColumnNameOrSpec]] = None) -> pl.DataFrame:
+        engine = resolve_engine(engine, streaming)
+        if self._feature_cache is not None and self._fitted_layers is None:
+            result = self._scan_with_feature_cache(self._feature_cache, columns, engine).collect(engine=engine)
+            self._feature_cache.evict()
+            return result
+        updated_dataset = self._apply_requested_layers(columns, materialize_before_window_layers=engine == 'streaming')
+        return updated_dataset.collect(engine=engine)
+
+    def sink_parquet(self, path: str | Path, engine: EngineType = 'auto', streaming: bool = False, columns: Optional[Sequence[ColumnNameOrSpec]] = None) -> None:
+        engine = resolve_engine(engine, streaming)
+        if self._feature_cache is not None and self._fitted_layers is None:
+            self._scan_with_feature_cache(self._feature_cache, columns, engine).sink_parquet(path, mkdir=True, engine=engine)
+            self._feature_cache.evict()
+            return
+        updated_dataset = self._apply_requested_layers(columns, materialize_before_window_layers=engine == 'streaming')
+        updated_dataset.sink_parquet(path, engine=engine)
+
+    def restrict_to(self, feature_names: Sequence[ColumnNameOrSpec]) -> Pipeline:
+        requested_names = get_names_from_column_specs(feature_names)
+        input_schema = self._dataset.schema.drop(transformer.output_column_specification for transformer in flatten(self._transformers[:-1]))
+        available_names = {transformer.output_column_specification.name for transformer in flatten(self._transformers)} | set(input_schema.column_names)
+        unknown_names = [name for name in requested_names if name not in available_names]
+        if unknown_names:
+            raise KeyError(f'Requested columns are neither input columns nor produced by the pipeline: {unknown_names}')
+
+        required_names = set(requested_names)
+        restricted_layers: TransformerLayers = []
+        for layer in reversed(self._transformers):
+            kept_transformers = [transformer for transformer in layer if transformer.output_column_specification.name in required_names]
+            for transformer in kept_transformers:
+                required_names.update(transformer.input_column_names())
+            restricted_layers.insert(0, kept_transformers)
+
+        kept_specs = [transformer.output_column_specification for transformer in flatten(restricted_layers)]
+        return self._with(
+            dataset=Dataset(
+                self._dataset.data,
+                input_schema + self._get_schema_from_transformers(list(flatten(restricted_layers[:-1]))),
+                source_paths=self._dataset.source_paths,
+                sort_columns=self._dataset.sort_columns,
+            ),
+            transformers=restricted_layers,
+            auxiliary_columns=[spec for spec in kept_specs if spec.name not in requested_names],
         )
 
-    def collect_plan(self, cache_computation: bool = False) -> Dataset:
+    def compile(self) -> CompiledPipeline:
         current_layer_schema = self._get_schema_from_transformers(self._current_layer())
         dataset = self._dataset.with_schema(new_schema=current_layer_schema)
-        for layer in self._transformers:
-            exprs = [transformer.transform() for transformer in layer]
-            dataset = dataset.with_columns(new_columns=exprs)
+        data, schema = dataset.data, dataset.schema
+        layer_plans: list[LayerPlan] = []
+        for i, layer in enumerate(self._transformers):
+            layer_plan = self._planner.plan_layer(layer, data, self._get_fitted_layer(i))
+            data = layer_plan.apply(data)
+            layer_plans.append(layer_plan)
+            schema = schema.with_dtypes(layer_plan.output_dtypes)
 
-        dataset = dataset.drop(self._auxiliary_columns)
+        return CompiledPipeline(layer_plans=layer_plans, schema=schema.drop(self._auxiliary_columns), auxiliary_columns=list(self._auxiliary_columns))
 
-        if cache_computation:
-            return dataset.with_cached_computation()
-        return dataset
+    def save(self, path: str | Path) -> None:
+        self.compile().save(path)
+
+    @staticmethod
+    def load(path: str | Path) -> CompiledPipeline:
+        return CompiledPipeline.load(path)
 
-    def collect(self) -> pl.DataFrame:
-        updated_dataset = self.collect_plan()
-        return updated_dataset.collect()
+    def collect_sharded(
+            self,
+            partition_columns: Sequence[ColumnNameOrSpec],
+            num_shards: int,
+            max_workers: Optional[int] = None,
+            engine: EngineType = 'auto',
+            streaming: bool = False,
+    ) -> pl.DataFrame:
+        partition_column_names = get_names_from_column_specs(partition_columns)
+        for i, layer in enumerate(self._transformers):
+            fitted_layer = self._get_fitted_layer(i)
+            for transformer in layer:
+                if fitted_layer is None or transformer.output_column_specification.name not in fitted_layer.exprs:
+                    self._validator.validate_partition_safety(transformer, partition_column_names)
+
+        sharded_executor = ShardedExecutor(num_shards=num_shards, max_workers=max_workers)
+        return sharded_executor.collect(self.compile(), self._dataset.data, partition_column_names, engine=resolve_engine(engine, streaming))
+
+    def sink_parquet_chunked(self, directory: str | Path, columns_per_file: int = 1_000, engine: EngineType = 'auto', streaming: bool = False) -> None:
+        if columns_per_file < 1:
+            raise ValueError(f'columns_per_file has to be a positive integer, got {columns_per_file}.')
+        engine = resolve_engine(engine, streaming)
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        *leading_layers, final_layer = self._transformers
+        base_dataset = self._run_layers(leading_layers, materialize_before_window_layers=engine == 'streaming', dataset=self._dataset)
+        base_dataset.sink_parquet(directory / self._chunk_file_name(0), engine=engine)
+        base_data = pl.scan_parquet(directory / self._chunk_file_name(0))
+        auxiliary_names = {column.name for column in self._auxiliary_columns}
+        parts = [ManifestPart(path=self._chunk_file_name(0), columns=[name for name in base_data.collect_schema().names() if name not in auxiliary_names])]
+
+        final_layer_features = [transformer for transformer in final_layer if transformer.output_column_specification not in self._auxiliary_columns]
+        fitted_final_layer = self._get_fitted_layer(len(self._transformers) - 1)
+        final_layer_dtypes: dict[str, pl.DataType] = {}
+        for i, chunk in enumerate(batched(final_layer_features, columns_per_file, strict=False), start=1):
+            chunk_columns = [transformer.output_column_specification.name for transformer in chunk]
+            chunk_plan = self._planner.plan_layer(chunk, base_data, fitted_final_layer)
+            final_layer_dtypes.update(chunk_plan.output_dtypes)
+            parts.append(ManifestPart(path=self._chunk_file_name(i), columns=chunk_columns))
+            chunk_plan.apply(base_data).select(chunk_columns).sink_parquet(directory / parts[-1].path, engine=engine)
+
+        base_schema = base_dataset.schema.drop(column for column in self._auxiliary_columns if column in base_dataset.schema)
+        final_schema = base_schema + self._get_schema_from_transformers(final_layer_features).with_dtypes(final_layer_dtypes)
+        Manifest(directory=directory, parts=parts, schema=final_schema, sort_columns=list(base_dataset.sort_columns)).save()
+
+    def export_state(self) -> IncrementalState:
+        _, state = self.update(self._dataset.data, IncrementalState())
+        return state
+
+    def update(self, new_batch: pl.DataFrame | pl.LazyFrame, state: IncrementalState) -> tuple[pl.DataFrame, IncrementalState]:
+        batch = new_batch.collect() if isinstance(new_batch, pl.LazyFrame) else new_batch
+        updated_batch, updated_state = self._incremental_updater.update(batch, self._transformers, state)
+        return updated_batch.drop(column.name for column in self._auxiliary_columns), updated_state
+
+    def execution_kinds(self) -> pl.DataFrame:
+        return pl.DataFrame(
+            [
+                {
+                    'layer': i + 1,
+                    'column': transformer.output_column_specification.name,
+                    'transformer': type(transformer).__name__,
+                    'execution_kind': transformer.execution_kind().value,
+                }
+                for i, layer in enumerate(self._transformers)
+                for transformer in layer
+            ],
+            schema={'layer': pl.UInt32, 'column': pl.String, 'transformer': pl.String, 'execution_kind': pl.String},
+        )
 
-    def sink_parquet(self, path: str | Path) -> None:
-        updated_dataset = self.collect_plan()
-        updated_dataset.sink_parquet(path)
+    def estimate(self, num_rows: Optional[int] = None) -> pl.DataFrame:
+        data = self._dataset.data
+        num_rows = num_rows if num_rows is not None else data.select(pl.len()).collect().item()
+        layer_schemas = [data.collect_schema()]
+        for i, layer in enumerate(self._transformers):
+            data = self._planner.plan_layer(layer, data, self._get_fitted_layer(i)).apply(data)
+            layer_schemas.append(data.collect_schema())
+        return self._estimator.estimate(self._transformers, layer_schemas, num_rows)
+
+    def profile(self, dataset_sample: Optional[Dataset] = None, engine: EngineType = 'auto') -> pl.DataFrame:
+        data = (dataset_sample or self._dataset).data
+        fitted_layers = [self._get_fitted_layer(i) for i in range(len(self._transformers))]
+        return self._profiler.profile(self._transformers, data, fitted_layers, engine)
+
+    def profile_optimization(self) -> pl.DataFrame:
+        fitted_layers = [self._get_fitted_layer(i) for i in range(len(self._transformers))]
+        return self._profiler.profile_optimization(self._transformers, self._dataset.data, fitted_layers)
+
+    def is_streamable(self) -> bool:
+        return all(self._get_layer_execution_kind(layer) == ExecutionKind.ROW_LOCAL for layer in self._transformers)
 
     def describe(self) -> str:
         result = self.collect_plan(cache_computation=False)
@@ -488,24 +696,126 @@ class Pipeline:
 
         return '\n'.join(description)
 
-    def _with_added_to_current_layer(self, transformers: Transformer | Sequence[Transformer], auxiliary: bool = False) -> Pipeline:
-        current_layer_additions = [transformers] if isinstance(transformers, Transformer) else list(transformers)
+    def _with_added_to_current_layer(self, transformers: Transformer | Iterable[Transformer], auxiliary: bool = False) -> Pipeline:
+        current_layer_additions = [transformers] if isinstance(transformers, Transformer) else transformers
         current_layer_additions = self._optimizer.deduplicate_transformers_against_layers(self._dataset.schema, current_layer_additions)
 
-        auxiliary_columns = self._auxiliary_columns
+        auxiliary_columns = list(self._auxiliary_columns)
         if auxiliary:
             auxiliary_columns.extend(transformer.output_column_specification for transformer in current_layer_additions)
 
-        return Pipeline(
-            dataset=self._dataset,
+        return self._with(
             transformers=self._transformers[:-1] + [self._current_layer() + current_layer_additions],
-            optimization_level=self._optimizer.optimization_level,
             auxiliary_columns=auxiliary_columns,
+            fitted_layers=None,
         )
 
+    def _with(self, **changes: Any) -> Pipeline:
+        arguments: dict[str, Any] = {
+            'dataset': self._dataset,
+            'transformers': self._transformers,
+            'optimization_level': self._optimizer.optimization_level,
+            'auxiliary_columns': self._auxiliary_columns,
+            'over_strategy': self._planner.over_strategy,
+            'fitted_layers': self._fitted_layers,
+            'max_output_columns': self._estimator.max_output_columns,
+            'memory_budget': self._estimator.memory_budget,
+            'dtype_policy': self._planner.dtype_policy,
+            'max_exprs_per_stage': self._planner.max_exprs_per_stage,
+            'hoist_group_ids': self._planner.hoist_group_ids,
+            'feature_cache': self._feature_cache,
+        }
+        return Pipeline(**(arguments | changes))
+
     def _current_layer(self) -> list[Transformer]:
         return self._transformers[-1]
 
+    def _apply_layers(
+            self,
+            materialize_before_window_layers: bool = False,
+            dataset: Optional[Dataset] = None,
+            checkpointer: Optional[Checkpointer] = None,
+            output_names: Optional[Sequence[str]] = None,
+    ) -> Dataset:
+        if dataset is None:
+            current_layer_schema = self._get_schema_from_transformers(self._current_layer())
+            dataset = self._dataset.with_schema(new_schema=current_layer_schema)
+        droppable_names = [column.name for column in self._auxiliary_columns] if output_names is None else [name for name in dataset.schema.column_names if name not in output_names]
+        dead_columns = self._liveness_analyzer.dead_columns_per_layer(self._transformers, droppable_names)
+        return self._run_layers(self._transformers, materialize_before_window_layers, dataset, checkpointer, dead_columns)
+
+    def _apply_requested_layers(self, columns: Optional[Sequence[ColumnNameOrSpec]], materialize_before_window_layers: bool) -> Dataset:
+        if columns is None:
+            self._check_budget()
+            return self._apply_layers(materialize_before_window_layers=materialize_before_window_layers)
+        restricted_pipeline = self.restrict_to(columns)
+        restricted_pipeline._check_budget()
+        output_names = get_names_from_column_specs(columns)
+        return restricted_pipeline._apply_layers(materialize_before_window_layers=materialize_before_window_layers, output_names=output_names).select(columns)
+
+    def _scan_with_feature_cache(self, feature_cache: FeatureCache, columns: Optional[Sequence[ColumnNameOrSpec]], engine: EngineType) -> pl.LazyFrame:
+        feature_keys = feature_cache.feature_keys(self._transformers, self._dataset, salt=repr(self._planner.dtype_policy))
+        if columns is None:
+            auxiliary_names = {column.name for column in self._auxiliary_columns}
+            output_names = self._dataset.data.collect_schema().names() + [name for name in feature_keys if name not in auxiliary_names]
+        else:
+            output_names = get_names_from_column_specs(columns)
+
+        feature_names = [name for name in output_names if name in feature_keys]
+        uncached_names = [name for name in feature_names if feature_keys[name] not in feature_cache]
+        if uncached_names:
+            restricted_pipeline = self.restrict_to(uncached_names)
+            restricted_pipeline._check_budget()
+            computed = restricted_pipeline._apply_layers(materialize_before_window_layers=engine == 'streaming', output_names=uncached_names).data
+            feature_cache.sink(computed, {name: feature_keys[name] for name in uncached_names}, engine)
+
+        input_names = [name for name in output_names if name not in feature_keys]
+        frames = [self._dataset.data.select(input_names)] if input_names else []
+        frames.extend(feature_cache.scan(feature_keys[name]) for name in feature_names)
+        return pl.concat(frames, how='horizontal').select(output_names)
+
+    def _check_budget(self) -> None:
+        if not self._estimator.has_budget():
+            return
+        self._estimator.check_output_columns(len(self._dataset.data.collect_schema()), self._transformers)
+        if self._estimator.memory_budget is not None:
+            self._estimator.check_memory(self.estimate())
+
+    def _run_layers(
+            self,
+            layers: TransformerLayers,
+            materialize_before_window_layers: bool,
+            dataset: Dataset,
+            checkpointer: Optional[Checkpointer] = None,
+            dead_columns: Optional[Sequence[Sequence[str]]] = None,
+    ) -> Dataset:
+        has_pending_layers = False
+        for i, layer in enumerate(layers):
+            if materialize_before_window_layers and has_pending_layers and self._get_layer_execution_kind(layer) == ExecutionKind.WINDOW:
+                dataset = dataset.with_materialized_computation(engine='streaming')
+            layer_plan = self._planner.plan_layer(layer, dataset.data, self._get_fitted_layer(i))
+            dataset = Dataset(layer_plan.apply(dataset.data), dataset.schema.with_dtypes(layer_plan.output_dtypes), source_paths=dataset.source_paths, sort_columns=dataset.sort_columns)
+            if dead_columns is not None and dead_columns[i]:
+                dataset = dataset.drop([dataset.get_column_by_name(name) for name in dead_columns[i]])
+            if checkpointer is not None:
+                dataset = checkpointer.checkpoint(dataset, i)
+            has_pending_layers = True
+
+        return dataset
+
+    def _get_fitted_layer(self, layer_index: int) -> Optional[FittedLayer]:
+        return self._fitted_layers[layer_index] if self._fitted_layers is not None else None
+
+    @staticmethod
+    def _chunk_file_name(chunk_index: int) -> str:
+        return f'part-{chunk_index:05d}.parquet'
+
+    @staticmethod
+    def _get_layer_execution_kind(layer: Sequence[Transformer]) -> ExecutionKind:
+        if any(transformer.execution_kind() == ExecutionKind.WINDOW for transformer in layer):
+            return ExecutionKind.WINDOW
+        return ExecutionKind.ROW_LOCAL
+
     @staticmethod
     def _get_schema_from_transformers(transformers: Sequence[Transformer]) -> Schema:
         output_columns = [transformer.output_column_specification for transformer in transformers]
@@ -525,15 +835,28 @@ class Pipeline:
         self._validator.validate_time_window_index_column(time_windows, index_column)
         input_columns = self._dataset.get_combinations_from_selections(*subsets) if subsets is not None else None
 
-        aggregating_transformers = self._build_transformers(
-            transformer_factory=transformer_factory,
-            input_columns=input_columns,
-            **kwargs,
+        aggregating_transformers = list(
+            self._build_transformers(
+                transformer_factory=transformer_factory,
+                input_columns=input_columns,
+                **kwargs,
+            ),
         )
 
         rolling_aggregations = self._get_rolling_transformers(aggregating_transformers=aggregating_transformers, index_column=index_column, time_windows=time_windows)
         rolling_aggregations_over = self._get_over_transformers(aggregating_transformers=rolling_aggregations, over_columns_combinations=over_columns_combinations)
-        return rolling_aggregations_over
+        return [self._with_time_order(transformer) for transformer in rolling_aggregations_over]
+
+    def _with_time_order[AT: AggregatingTransformer](self, transformer: AT | OverWrapper[AT]) -> AT | OverWrapper[AT]:
+        if not self._dataset.sort_columns or not transformer.is_order_dependent():
+            return transformer
+        *entity_columns, time_column = self._dataset.sort_columns
+        over_columns = transformer.over_columns if isinstance(transformer, OverWrapper) else []
+        if set(entity_columns) <= set(over_columns):
+            return transformer
+        if isinstance(transformer, OverWrapper):
+            return transformer.with_order_by([time_column])
+        return OverWrapper(inner_transformer=transformer, over_columns=[], order_by=[time_column])
 
     def _get_over_transformers[AT: AggregatingTransformer](
             self,
@@ -592,25 +915,17 @@ class Pipeline:
         input_columns: Optional[Sequence[ColumnSet]] = None,
         kw_params: Optional[Mapping[str, Sequence[Any]]] = None,
         **kwargs: Any,
-    ) -> list[T]:
-
-        transformers: list[T] = []
+    ) -> Iterator[T]:
 
         factories = transformer_factory if isinstance(transformer_factory, list) else [transformer_factory]
         input_columns = input_columns or []
         kw_params = kw_params or {}
-
-        input_columns_positional_combinations: list[tuple[ColumnSpecification, ...]] = list(product(*input_columns))
         kw_keys = list(kw_params.keys())
-        kw_params_positional_combinations = list(product(*kw_params.values()))
 
         for factory in factories:
-            optimized_combinations = self._optimizer.optimize_input_columns(factory, input_columns_positional_combinations)
-            for column_combination in optimized_combinations:
-                for kw_params_combination in kw_params_positional_combinations:
+            for column_combination in self._optimizer.enumerate_input_columns(factory, input_columns):
+                for kw_params_combination in product(*kw_params.values()):
                     transformer_kwargs = dict(zip(kw_keys, kw_params_combination, strict=True)) | kwargs
                     transformer = factory(*column_combination, **transformer_kwargs)
                     self._validator.validate_transformer_against_input_columns(transformer, column_combination)
-                    transformers.append(transformer)
-
-        return transformers
+                    yield transformer
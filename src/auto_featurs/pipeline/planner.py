@@ -0,0 +1,349 @@
+import math
+from collections import Counter
+from collections.abc import Collection
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import replace
+from datetime import timedelta
+from enum import Enum
+from typing import Optional
+
+import polars as pl
+
+from auto_featurs.dataset.profile import DatasetProfile
+from auto_featurs.pipeline.dtype_policy import DtypePolicy
+from auto_featurs.pipeline.execution_plan import DropStage
+from auto_featurs.pipeline.execution_plan import GroupByJoinStage
+from auto_featurs.pipeline.execution_plan import GroupIdStage
+from auto_featurs.pipeline.execution_plan import LayerPlan
+from auto_featurs.pipeline.execution_plan import ReorderStage
+from auto_featurs.pipeline.execution_plan import RollingJoinStage
+from auto_featurs.pipeline.execution_plan import SelectStage
+from auto_featurs.pipeline.execution_plan import Stage
+from auto_featurs.pipeline.execution_plan import WithColumnsStage
+from auto_featurs.pipeline.fitter import FittedLayer
+from auto_featurs.pipeline.validator import Validator
+from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
+from auto_featurs.transformers.aggregating_transformers import Moment
+from auto_featurs.transformers.aggregating_transformers import MomentAggregationTransformer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+
+type OverKeys = tuple[str, ...]
+type RollingContext = tuple[str, str | timedelta, OverKeys]
+
+AUTO_GROUP_BY_MAX_CARDINALITY_RATIO = 0.1
+
+
+class OverStrategy(Enum):
+    WINDOW = 'window'
+    GROUP_BY = 'group_by'
+    AUTO = 'auto'
+
+
+@dataclass(frozen=True, slots=True)
+class _MomentDecomposition:
+    transformer: Transformer
+    aggregation: MomentAggregationTransformer
+    moment_transformers: dict[Moment, AggregatingTransformer]
+
+    def moment_names(self) -> dict[Moment, str]:
+        return {moment: transformer.output_column_specification.name for moment, transformer in self.moment_transformers.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class _PlannedExpr:
+    window_expr: pl.Expr
+    over_keys: Optional[OverKeys] = None
+    group_by_expr: Optional[pl.Expr] = None
+    rolling_context: Optional[RollingContext] = None
+    rolling_expr: Optional[pl.Expr] = None
+    partition_keys: tuple[OverKeys, ...] = ()
+    partitioned_transformer: Optional[AggregatingTransformer] = None
+
+    def is_fused(self, fused_over_keys: Collection[OverKeys]) -> bool:
+        return self.over_keys in fused_over_keys and self.group_by_expr is not None
+
+
+class Planner:
+    def __init__(
+            self,
+            over_strategy: OverStrategy = OverStrategy.WINDOW,
+            dtype_policy: Optional[DtypePolicy] = None,
+            max_exprs_per_stage: Optional[int] = None,
+            hoist_group_ids: bool = False,
+            profile: Optional[DatasetProfile] = None,
+    ) -> None:
+        if max_exprs_per_stage is not None and max_exprs_per_stage < 1:
+            raise ValueError(f'max_exprs_per_stage has to be a positive integer, got {max_exprs_per_stage}.')
+        self._over_strategy = over_strategy
+        self._dtype_policy = dtype_policy or DtypePolicy()
+        self._max_exprs_per_stage = max_exprs_per_stage
+        self._hoist_group_ids = hoist_group_ids
+        self._profile = profile
+
+    @property
+    def over_strategy(self) -> OverStrategy:
+        return self._over_strategy
+
+    @property
+    def dtype_policy(self) -> DtypePolicy:
+        return self._dtype_policy
+
+    @property
+    def max_exprs_per_stage(self) -> Optional[int]:
+        return self._max_exprs_per_stage
+
+    @property
+    def hoist_group_ids(self) -> bool:
+        return self._hoist_group_ids
+
+    def plan_layer(self, layer: Sequence[Transformer], data: Optional[pl.LazyFrame] = None, fitted_layer: Optional[FittedLayer] = None) -> LayerPlan:
+        fitted_layer = fitted_layer or FittedLayer()
+        fitted_indices = {i for i, transformer in enumerate(layer) if transformer.output_column_specification.name in fitted_layer.exprs}
+        decompositions = self._find_shared_moments(layer, excluded=fitted_indices)
+
+        moment_exprs: dict[str, _PlannedExpr] = {}
+        for decomposition in decompositions.values():
+            for moment_transformer in decomposition.moment_transformers.values():
+                moment_name = moment_transformer.output_column_specification.name
+                if moment_name not in moment_exprs:
+                    moment_exprs[moment_name] = self._plan_expr(moment_transformer, self._hidden_name(moment_name))
+
+        layer_exprs: list[_PlannedExpr] = []
+        for i, transformer in enumerate(layer):
+            if i in fitted_indices:
+                layer_exprs.append(_PlannedExpr(fitted_layer.exprs[transformer.output_column_specification.name]))
+            elif i in decompositions:
+                layer_exprs.append(_PlannedExpr(self._transform_from_shared_moments(decompositions[i])))
+            else:
+                layer_exprs.append(self._plan_expr(transformer))
+
+        fused_over_keys = self._select_fused_over_keys([*moment_exprs.values(), *layer_exprs], data)
+        group_id_keys = self._select_group_id_keys([*moment_exprs.values(), *layer_exprs], fused_over_keys, data)
+        if group_id_keys:
+            moment_exprs = {name: self._with_group_ids(planned, fused_over_keys, group_id_keys) for name, planned in moment_exprs.items()}
+            layer_exprs = [self._with_group_ids(planned, fused_over_keys, group_id_keys) for planned in layer_exprs]
+
+        hidden_columns = [*fitted_layer.hidden_columns, *map(self._hidden_name, moment_exprs), *map(self._group_id_name, group_id_keys)]
+        stages = self._assemble_stages(fitted_layer, list(moment_exprs.values()), layer_exprs, fused_over_keys, group_id_keys, hidden_columns)
+
+        output_dtypes = self._resolve_output_dtypes(layer, LayerPlan(stages=stages, hidden_columns=hidden_columns), data)
+        if output_dtypes:
+            layer_exprs = [self._cast(planned, output_dtypes.get(planned.window_expr.meta.output_name())) for planned in layer_exprs]
+            stages = self._assemble_stages(fitted_layer, list(moment_exprs.values()), layer_exprs, fused_over_keys, group_id_keys, hidden_columns)
+
+        return LayerPlan(stages=stages, hidden_columns=hidden_columns, output_dtypes=output_dtypes)
+
+    def _assemble_stages(
+            self,
+            fitted_layer: FittedLayer,
+            moment_exprs: Sequence[_PlannedExpr],
+            layer_exprs: Sequence[_PlannedExpr],
+            fused_over_keys: set[OverKeys],
+            group_id_keys: Sequence[OverKeys],
+            hidden_columns: Sequence[str],
+    ) -> list[Stage]:
+        stages: list[Stage] = [*fitted_layer.lookup_stages]
+        if group_id_keys:
+            stages.append(GroupIdStage(keys=[list(keys) for keys in group_id_keys], columns=[self._group_id_name(keys) for keys in group_id_keys]))
+        if moment_exprs:
+            stages.extend(self._build_stages(moment_exprs, fused_over_keys))
+        layer_stages = self._build_stages(layer_exprs, fused_over_keys)
+        stages.extend(layer_stages)
+
+        output_names = [planned.window_expr.meta.output_name() for planned in layer_exprs]
+        if any(isinstance(stage, (GroupByJoinStage, RollingJoinStage)) for stage in stages) or [name for stage in layer_stages for name in stage.output_columns] != output_names:
+            stages.append(ReorderStage(output_names))
+        if hidden_columns and isinstance(stages[-1], WithColumnsStage):
+            stages[-1] = SelectStage(exprs=stages[-1].exprs, dropped_columns=list(hidden_columns))
+        elif hidden_columns:
+            stages.append(DropStage(list(hidden_columns)))
+        return stages
+
+    def _resolve_output_dtypes(self, layer: Sequence[Transformer], layer_plan: LayerPlan, data: Optional[pl.LazyFrame]) -> dict[str, pl.DataType]:
+        if not self._dtype_policy.is_active() or data is None:
+            return {}
+
+        schema = layer_plan.apply(data).collect_schema()
+        output_dtypes: dict[str, pl.DataType] = {}
+        for transformer in layer:
+            name = transformer.output_column_specification.name
+            target_dtype = self._dtype_policy.target_dtype(transformer, schema[name])
+            if target_dtype is not None:
+                output_dtypes[name] = target_dtype
+        return output_dtypes
+
+    @staticmethod
+    def _cast(planned: _PlannedExpr, dtype: Optional[pl.DataType]) -> _PlannedExpr:
+        if dtype is None:
+            return planned
+        return replace(
+            planned,
+            window_expr=planned.window_expr.cast(dtype),
+            group_by_expr=planned.group_by_expr.cast(dtype) if planned.group_by_expr is not None else None,
+            rolling_expr=planned.rolling_expr.cast(dtype) if planned.rolling_expr is not None else None,
+        )
+
+    def _plan_expr(self, transformer: Transformer, alias: Optional[str] = None) -> _PlannedExpr:
+        window_expr = transformer.transform()
+        if __debug__:
+            Validator.validate_output_name(transformer, window_expr)
+        if alias is not None:
+            window_expr = window_expr.alias(alias)
+        output_name = window_expr.meta.output_name()
+
+        over_keys: OverKeys = ()
+        aggregation: Transformer = transformer
+        if isinstance(transformer, OverWrapper):
+            over_keys = tuple(transformer.over_columns)
+            aggregation = transformer.inner_transformer
+
+        if isinstance(aggregation, RollingWrapper) and not aggregation.uses_native_kernel:
+            rolling_context = (aggregation.index_column.name, aggregation.time_window, over_keys)
+            rolling_expr = aggregation.inner_transformer.transform().last().alias(output_name)
+            return _PlannedExpr(window_expr, rolling_context=rolling_context, rolling_expr=rolling_expr)
+
+        planned = _PlannedExpr(window_expr)
+        is_ordered = isinstance(transformer, OverWrapper) and bool(transformer.order_by)
+        if over_keys and isinstance(aggregation, AggregatingTransformer) and aggregation.is_scalar_aggregation() and not is_ordered:
+            planned = _PlannedExpr(window_expr, over_keys=over_keys, group_by_expr=aggregation.transform().alias(output_name))
+        if self._hoist_group_ids and isinstance(transformer, AggregatingTransformer) and (partition_keys := transformer.partitions()):
+            planned = replace(planned, partition_keys=tuple(partition_keys), partitioned_transformer=transformer)
+        return planned
+
+    def _select_fused_over_keys(self, planned_exprs: Sequence[_PlannedExpr], data: Optional[pl.LazyFrame]) -> set[OverKeys]:
+        key_usage = Counter(planned.over_keys for planned in planned_exprs if planned.over_keys is not None)
+
+        if self._over_strategy == OverStrategy.GROUP_BY:
+            return set(key_usage)
+        if self._over_strategy == OverStrategy.WINDOW or data is None:
+            return set()
+
+        candidates = [keys for keys, usage in key_usage.items() if usage > 1]
+        profiled = {keys: is_fused for keys in candidates if (is_fused := self._is_low_cardinality_by_profile(keys)) is not None}
+        unprofiled = [keys for keys in candidates if keys not in profiled]
+        if not unprofiled:
+            return {keys for keys, is_fused in profiled.items() if is_fused}
+
+        cardinalities = data.select(
+            *(pl.struct(keys).n_unique().alias(str(i)) for i, keys in enumerate(unprofiled)),
+            pl.len().alias('len'),
+        ).collect().row(0)
+        *num_groups_per_keys, num_rows = cardinalities
+        return {
+            *(keys for keys, is_fused in profiled.items() if is_fused),
+            *(keys for keys, num_groups in zip(unprofiled, num_groups_per_keys, strict=True) if num_groups / max(num_rows, 1) <= AUTO_GROUP_BY_MAX_CARDINALITY_RATIO),
+        }
+
+    def _is_low_cardinality_by_profile(self, keys: OverKeys) -> Optional[bool]:
+        if self._profile is None or not all(key in self._profile for key in keys):
+            return None
+        num_groups_per_key = [self._profile[key].num_unique for key in keys]
+        num_rows = max(self._profile.num_rows, 1)
+        if math.prod(num_groups_per_key) / num_rows <= AUTO_GROUP_BY_MAX_CARDINALITY_RATIO:
+            return True
+        if max(num_groups_per_key) / num_rows > AUTO_GROUP_BY_MAX_CARDINALITY_RATIO:
+            return False
+        return None
+
+    def _select_group_id_keys(self, planned_exprs: Sequence[_PlannedExpr], fused_over_keys: set[OverKeys], data: Optional[pl.LazyFrame]) -> list[OverKeys]:
+        key_usage = Counter(keys for planned in planned_exprs if not planned.is_fused(fused_over_keys) for keys in planned.partition_keys)
+        schema = data.collect_schema() if data is not None else None
+        return [
+            keys for keys, usage in key_usage.items()
+            if usage > 1 and (len(keys) > 1 or schema is None or not schema[keys[0]].is_integer())
+        ]
+
+    def _with_group_ids(self, planned: _PlannedExpr, fused_over_keys: set[OverKeys], group_id_keys: Collection[OverKeys]) -> _PlannedExpr:
+        group_ids = {keys: self._group_id_name(keys) for keys in planned.partition_keys if keys in group_id_keys}
+        if planned.partitioned_transformer is None or not group_ids or planned.is_fused(fused_over_keys):
+            return planned
+        window_expr = planned.partitioned_transformer.transform_over_group_ids(group_ids).alias(planned.window_expr.meta.output_name())
+        return replace(planned, window_expr=window_expr)
+
+    def _build_stages(self, planned_exprs: Sequence[_PlannedExpr], fused_over_keys: set[OverKeys]) -> list[Stage]:
+        rolling_usage = Counter(planned.rolling_context for planned in planned_exprs if planned.rolling_context is not None)
+
+        fused: dict[OverKeys, list[pl.Expr]] = {}
+        batched_rolling: dict[RollingContext, list[pl.Expr]] = {}
+        window_exprs: list[pl.Expr] = []
+        for planned in planned_exprs:
+            if planned.over_keys in fused_over_keys and planned.group_by_expr is not None:
+                fused.setdefault(planned.over_keys, []).append(planned.group_by_expr)
+            elif planned.rolling_context is not None and planned.rolling_expr is not None and rolling_usage[planned.rolling_context] > 1:
+                batched_rolling.setdefault(planned.rolling_context, []).append(planned.rolling_expr)
+            else:
+                window_exprs.append(planned.window_expr)
+
+        stages: list[Stage] = [GroupByJoinStage(list(keys), exprs) for keys, exprs in fused.items()]
+        stages.extend(
+            RollingJoinStage(index_column=index_column, period=period, keys=list(keys), exprs=exprs)
+            for (index_column, period, keys), exprs in batched_rolling.items()
+        )
+        if window_exprs or not stages:
+            stages.extend(WithColumnsStage(batch) for batch in self._batch_exprs(window_exprs))
+        return stages
+
+    def _batch_exprs(self, exprs: list[pl.Expr]) -> list[list[pl.Expr]]:
+        if self._max_exprs_per_stage is None or len(exprs) <= self._max_exprs_per_stage:
+            return [exprs]
+
+        ordered_exprs = sorted(exprs, key=lambda expr: sorted(expr.meta.root_names()))
+        num_batches = math.ceil(len(ordered_exprs) / self._max_exprs_per_stage)
+        batch_size, num_larger_batches = divmod(len(ordered_exprs), num_batches)
+        batches: list[list[pl.Expr]] = []
+        start = 0
+        for i in range(num_batches):
+            end = start + batch_size + (i < num_larger_batches)
+            batches.append(ordered_exprs[start:end])
+            start = end
+        return batches
+
+    def _find_shared_moments(self, layer: Sequence[Transformer], excluded: Collection[int] = ()) -> dict[int, _MomentDecomposition]:
+        candidates: dict[int, _MomentDecomposition] = {}
+        for i, transformer in enumerate(layer):
+            if i in excluded:
+                continue
+            decomposition = self._decompose(transformer)
+            if decomposition is not None:
+                candidates[i] = decomposition
+
+        moment_usage = Counter(name for decomposition in candidates.values() for name in decomposition.moment_names().values())
+        return {
+            i: decomposition for i, decomposition in candidates.items()
+            if any(moment_usage[name] > 1 for name in decomposition.moment_names().values())
+        }
+
+    @staticmethod
+    def _decompose(transformer: Transformer) -> Optional[_MomentDecomposition]:
+        wrapper: Optional[OverWrapper[AggregatingTransformer]] = None
+        aggregation: Transformer = transformer
+        if isinstance(transformer, OverWrapper):
+            wrapper = transformer
+            aggregation = transformer.inner_transformer
+
+        if not isinstance(aggregation, MomentAggregationTransformer):
+            return None
+
+        moments = aggregation.moments()
+
+        if wrapper is not None:
+            moments = {moment: wrapper.with_inner_transformer(moment_transformer) for moment, moment_transformer in moments.items()}
+
+        return _MomentDecomposition(transformer=transformer, aggregation=aggregation, moment_transformers=moments)
+
+    def _transform_from_shared_moments(self, decomposition: _MomentDecomposition) -> pl.Expr:
+        moment_columns = {moment: pl.col(self._hidden_name(name)) for moment, name in decomposition.moment_names().items()}
+        output_name = decomposition.transformer.output_column_specification.name
+        return decomposition.aggregation.transform_from_moments(moment_columns).alias(output_name)
+
+    @staticmethod
+    def _hidden_name(column_name: str) -> str:
+        return f'{HIDDEN_COLUMN_PREFIX}{column_name}'
+
+    @staticmethod
+    def _group_id_name(keys: OverKeys) -> str:
+        return f'{HIDDEN_COLUMN_PREFIX}group_id_{'_and_'.join(keys)}'
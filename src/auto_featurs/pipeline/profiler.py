@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import resource
+import sys
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+import polars as pl
+from polars._typing import EngineType
+
+from auto_featurs.pipeline.fitter import FittedLayer
+from auto_featurs.pipeline.planner import Planner
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+
+OPTIMIZATION_PROFILE_SCHEMA = {
+    'layer': pl.UInt32,
+    'num_stages': pl.UInt32,
+    'num_exprs': pl.UInt32,
+    'optimization_seconds': pl.Float64,
+    'optimization_seconds_without_cse': pl.Float64,
+}
+PROFILE_SCHEMA = {
+    'layer': pl.UInt32,
+    'layer_seconds': pl.Float64,
+    'layer_peak_rss_mb': pl.Float64,
+    'column': pl.String,
+    'transformer': pl.String,
+    'wrapper': pl.String,
+    'cumulative': pl.String,
+    'execution_kind': pl.String,
+    'estimated_seconds': pl.Float64,
+}
+
+
+class Profiler:
+    def __init__(self, planner: Planner) -> None:
+        self._planner = planner
+
+    def profile(self, layers: Sequence[Sequence[Transformer]], data: pl.LazyFrame, fitted_layers: Sequence[Optional[FittedLayer]], engine: EngineType = 'auto') -> pl.DataFrame:
+        frame = data.collect(engine=engine)
+        rows: list[dict[str, object]] = []
+        for i, (layer, fitted_layer) in enumerate(zip(layers, fitted_layers, strict=True)):
+            layer_plan = self._planner.plan_layer(layer, frame.lazy(), fitted_layer)
+            start = time.perf_counter()
+            layer_output = layer_plan.apply(frame.lazy()).collect(engine=engine)
+            layer_seconds = time.perf_counter() - start
+            layer_peak_rss_mb = self._peak_rss_mb()
+
+            for transformer in layer:
+                inner_transformer, wrapper = self._unwrap(transformer)
+                rows.append({
+                    'layer': i + 1,
+                    'layer_seconds': layer_seconds,
+                    'layer_peak_rss_mb': layer_peak_rss_mb,
+                    'column': transformer.output_column_specification.name,
+                    'transformer': type(inner_transformer).__name__,
+                    'wrapper': wrapper,
+                    'cumulative': getattr(inner_transformer, 'cumulative', CumulativeOptions.NONE).value,
+                    'execution_kind': transformer.execution_kind().value,
+                    'estimated_seconds': self._time_transformer(transformer, frame, fitted_layer, engine),
+                })
+            frame = layer_output
+
+        return pl.DataFrame(rows, schema=PROFILE_SCHEMA)
+
+    def profile_optimization(self, layers: Sequence[Sequence[Transformer]], data: pl.LazyFrame, fitted_layers: Sequence[Optional[FittedLayer]]) -> pl.DataFrame:
+        rows: list[dict[str, object]] = []
+        for i, (layer, fitted_layer) in enumerate(zip(layers, fitted_layers, strict=True)):
+            layer_plan = self._planner.plan_layer(layer, data, fitted_layer)
+            empty_input = pl.LazyFrame(schema=data.collect_schema())
+            rows.append({
+                'layer': i + 1,
+                'num_stages': layer_plan.num_stages,
+                'num_exprs': sum(len(stage.output_columns) for stage in layer_plan.stages),
+                'optimization_seconds': self._time_optimization(layer_plan.apply(empty_input), comm_subexpr_elim=True),
+                'optimization_seconds_without_cse': self._time_optimization(layer_plan.apply(empty_input), comm_subexpr_elim=False),
+            })
+            data = layer_plan.apply(data)
+
+        return pl.DataFrame(rows, schema=OPTIMIZATION_PROFILE_SCHEMA)
+
+    @staticmethod
+    def _time_optimization(data: pl.LazyFrame, comm_subexpr_elim: bool) -> float:
+        start = time.perf_counter()
+        data.explain(optimizations=pl.QueryOptFlags(comm_subexpr_elim=comm_subexpr_elim))
+        return time.perf_counter() - start
+
+    def _time_transformer(self, transformer: Transformer, frame: pl.DataFrame, fitted_layer: Optional[FittedLayer], engine: EngineType) -> float:
+        transformer_plan = self._planner.plan_layer([transformer], frame.lazy(), fitted_layer)
+        start = time.perf_counter()
+        transformer_plan.apply(frame.lazy()).select(transformer.output_column_specification.name).collect(engine=engine)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _unwrap(transformer: Transformer) -> tuple[Transformer, str]:
+        wrappers: list[str] = []
+        while isinstance(transformer, (OverWrapper, RollingWrapper)):
+            wrappers.append('over' if isinstance(transformer, OverWrapper) else 'rolling')
+            transformer = transformer.inner_transformer
+        return transformer, '_'.join(wrappers) if wrappers else 'none'
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        bytes_per_unit = 1 if sys.platform == 'darwin' else 1024
+        return peak_rss * bytes_per_unit / 2**20
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import polars as pl
+from polars._typing import EngineType
+
+from auto_featurs.pipeline.compiled_pipeline import CompiledPipeline
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+
+ROW_INDEX_COLUMN = f'{HIDDEN_COLUMN_PREFIX}row_index'
+SHARD_COLUMN = f'{HIDDEN_COLUMN_PREFIX}shard'
+
+
+class ShardedExecutor:
+    def __init__(self, num_shards: int, max_workers: Optional[int] = None) -> None:
+        if num_shards < 1:
+            raise ValueError(f'num_shards has to be a positive integer, got {num_shards}.')
+        self._num_shards = num_shards
+        self._max_workers = max_workers or num_shards
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    def collect(self, compiled_pipeline: CompiledPipeline, data: pl.LazyFrame, partition_columns: Sequence[str], engine: EngineType = 'auto') -> pl.DataFrame:
+        shard_ids = (pl.struct(partition_columns).hash(seed=0) % self._num_shards).alias(SHARD_COLUMN)
+        indexed_data = data.with_row_index(ROW_INDEX_COLUMN).with_columns(shard_ids).collect(engine=engine)
+        shards = [shard.drop(SHARD_COLUMN) for shard in indexed_data.partition_by(SHARD_COLUMN)] or [indexed_data.drop(SHARD_COLUMN)]
+
+        with ProcessPoolExecutor(max_workers=self._max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(_collect_shard, [compiled_pipeline] * len(shards), shards, [engine] * len(shards)))
+
+        return pl.concat(results).sort(ROW_INDEX_COLUMN).drop(ROW_INDEX_COLUMN)
+
+
+def _collect_shard(compiled_pipeline: CompiledPipeline, shard: pl.DataFrame, engine: EngineType) -> pl.DataFrame:
+    return compiled_pipeline.collect(shard, engine=engine)
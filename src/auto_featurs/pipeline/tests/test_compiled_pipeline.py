@@ -0,0 +1,134 @@
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from auto_featurs.base.column_specification import ColumnRole
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.column_specification import ColumnType
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.compiled_pipeline import CompiledPipeline
+from auto_featurs.pipeline.dtype_policy import DtypePolicy
+from auto_featurs.pipeline.pipeline import Pipeline
+from auto_featurs.pipeline.planner import OverStrategy
+from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregations
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.numeric_transformers import ArithmeticOperation
+from auto_featurs.transformers.numeric_transformers import Scaling
+from auto_featurs.utils.utils_for_tests import BASIC_FRAME
+
+SCHEMA = Schema(
+    [
+        ColumnSpecification.numeric(name='NUMERIC_FEATURE'),
+        ColumnSpecification.numeric(name='NUMERIC_FEATURE_2'),
+        ColumnSpecification.nominal(name='GROUPING_FEATURE_NUM', role=ColumnRole.IDENTIFIER),
+        ColumnSpecification.datetime(name='DATE_FEATURE', role=ColumnRole.TIME_INFO),
+        ColumnSpecification.boolean(name='BOOL_FEATURE'),
+    ],
+)
+
+OTHER_FRAME = BASIC_FRAME.with_columns(pl.col('NUMERIC_FEATURE') * 3, pl.col('NUMERIC_FEATURE_2') + 7)
+
+
+class TestCompiledPipeline:
+    @pytest.mark.parametrize('over_strategy', [OverStrategy.WINDOW, OverStrategy.GROUP_BY])
+    def test_loaded_pipeline_matches_collect(self, over_strategy: OverStrategy, tmp_path: Path) -> None:
+        pipeline = self._get_pipeline(BASIC_FRAME, over_strategy)
+
+        pipeline.save(tmp_path / 'pipeline.json')
+        compiled_pipeline = Pipeline.load(tmp_path / 'pipeline.json')
+
+        assert compiled_pipeline.schema == pipeline.collect_plan().schema
+        assert compiled_pipeline.auxiliary_columns == [ColumnSpecification.numeric(name='NUMERIC_FEATURE_2_pow_2')]
+        assert_frame_equal(compiled_pipeline.collect(BASIC_FRAME), pipeline.collect())
+
+    def test_group_id_stages_are_persisted(self, tmp_path: Path) -> None:
+        pipeline = (
+            Pipeline(dataset=Dataset(BASIC_FRAME, SCHEMA), hoist_group_ids=True)
+            .with_arithmetic_aggregation(
+                'NUMERIC_FEATURE',
+                [ArithmeticAggregations.SUM, ArithmeticAggregations.MEAN],
+                over_columns_combinations=[['GROUPING_FEATURE_NUM']],
+                cumulative=CumulativeOptions.INCLUSIVE,
+            )
+        )
+
+        pipeline.save(tmp_path / 'pipeline.json')
+        compiled_pipeline = Pipeline.load(tmp_path / 'pipeline.json')
+
+        assert '"group_id"' in (tmp_path / 'pipeline.json').read_text()
+        assert_frame_equal(compiled_pipeline.collect(BASIC_FRAME), pipeline.collect())
+
+    def test_loaded_pipeline_runs_on_new_data(self, tmp_path: Path) -> None:
+        pipeline = self._get_pipeline(BASIC_FRAME, OverStrategy.WINDOW)
+
+        pipeline.save(tmp_path / 'pipeline.json')
+        result = CompiledPipeline.load(tmp_path / 'pipeline.json').transform(Dataset(OTHER_FRAME, SCHEMA))
+
+        assert result.schema == pipeline.collect_plan().schema
+        assert_frame_equal(result.collect(), self._get_pipeline(OTHER_FRAME, OverStrategy.WINDOW).collect())
+
+    def test_downcast_counts_fit_larger_data(self) -> None:
+        large_frame = pl.LazyFrame({'GROUPING_FEATURE_NUM': [1] * 300})
+        schema = Schema([ColumnSpecification.nominal(name='GROUPING_FEATURE_NUM', role=ColumnRole.IDENTIFIER)])
+        pipeline = Pipeline(dataset=Dataset(large_frame.head(10), schema), dtype_policy=DtypePolicy(downcast_integers=True)).with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+
+        result = pipeline.compile().collect(large_frame)
+
+        assert result.schema['count_over_GROUPING_FEATURE_NUM'] == pl.UInt32()
+        assert result['count_over_GROUPING_FEATURE_NUM'].unique().to_list() == [300]
+
+    def test_fitted_statistics_are_persisted(self, tmp_path: Path) -> None:
+        pipeline = (
+            Pipeline(dataset=Dataset(BASIC_FRAME, SCHEMA))
+            .with_scaling('NUMERIC_FEATURE', [Scaling.STANDARD, Scaling.MIN_MAX])
+            .with_arithmetic_aggregation('NUMERIC_FEATURE', [ArithmeticAggregations.MEAN, ArithmeticAggregations.ZSCORE], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .fit()
+        )
+
+        pipeline.save(tmp_path / 'pipeline.json')
+        compiled_pipeline = Pipeline.load(tmp_path / 'pipeline.json')
+
+        assert_frame_equal(compiled_pipeline.collect(OTHER_FRAME), pipeline.transform(Dataset(OTHER_FRAME, SCHEMA)).collect())
+
+    def test_mismatching_polars_version_is_rejected(self, tmp_path: Path) -> None:
+        Pipeline(dataset=Dataset(BASIC_FRAME, SCHEMA)).with_polynomial('NUMERIC_FEATURE', [2]).save(tmp_path / 'pipeline.json')
+        content = json.loads((tmp_path / 'pipeline.json').read_text())
+        content['polars_version'] = '0.0.1'
+        (tmp_path / 'pipeline.json').write_text(json.dumps(content))
+
+        with pytest.raises(ValueError, match='saved with polars 0.0.1'):
+            Pipeline.load(tmp_path / 'pipeline.json')
+
+    def test_column_specifications_are_preserved(self, tmp_path: Path) -> None:
+        schema = Schema([ColumnSpecification(name='A', column_type=ColumnType.ORDINAL, column_role=ColumnRole.LABEL)])
+        CompiledPipeline(layer_plans=[], schema=schema, auxiliary_columns=[]).save(tmp_path / 'pipeline.json')
+
+        assert CompiledPipeline.load(tmp_path / 'pipeline.json').schema == schema
+
+    @staticmethod
+    def _get_pipeline(data: pl.LazyFrame, over_strategy: OverStrategy) -> Pipeline:
+        return (
+            Pipeline(dataset=Dataset(data, SCHEMA), over_strategy=over_strategy)
+            .with_polynomial('NUMERIC_FEATURE_2', [2], auxiliary=True)
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']], filtering_condition=pl.col('BOOL_FEATURE'))
+            .with_arithmetic_aggregation(
+                'NUMERIC_FEATURE',
+                [ArithmeticAggregations.SUM, ArithmeticAggregations.MEAN, ArithmeticAggregations.STD],
+                over_columns_combinations=[[], ['GROUPING_FEATURE_NUM']],
+            )
+            .with_arithmetic_aggregation(
+                'NUMERIC_FEATURE',
+                [ArithmeticAggregations.SUM, ArithmeticAggregations.MAX],
+                over_columns_combinations=[['GROUPING_FEATURE_NUM']],
+                time_windows=['2d', timedelta(days=2, hours=1)],
+                index_column_name='DATE_FEATURE',
+            )
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']], cumulative=CumulativeOptions.INCLUSIVE)
+            .with_new_layer()
+            .with_arithmetic(['NUMERIC_FEATURE_sum_over_GROUPING_FEATURE_NUM'], ['NUMERIC_FEATURE_2_pow_2'], [ArithmeticOperation.ADD])
+        )
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.feature_cache import FeatureCache
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.numeric_transformers import LogTransformer
+from auto_featurs.transformers.numeric_transformers import PolynomialTransformer
+
+SCHEMA = Schema([ColumnSpecification.numeric(name='a'), ColumnSpecification.numeric(name='b')])
+
+
+class TestFeatureCache:
+    def test_scan_returns_sunk_column(self, tmp_path: Path) -> None:
+        feature_cache = FeatureCache(tmp_path)
+        data = pl.LazyFrame({'a': [1, 2, 3], 'a_pow_2': [1, 4, 9]})
+
+        assert 'key' not in feature_cache
+        with pytest.raises(KeyError, match='Feature key is not cached'):
+            feature_cache.scan('key')
+        feature_cache.sink(data, {'a_pow_2': 'key'})
+
+        assert 'key' in feature_cache
+        assert_frame_equal(feature_cache.scan('key').collect(), data.select('a_pow_2').collect())
+        assert [path.name for path in tmp_path.iterdir()] == ['key.arrow']
+
+    def test_eviction_drops_least_recently_used(self, tmp_path: Path) -> None:
+        data = pl.LazyFrame({'a': list(range(100))})
+        FeatureCache(tmp_path).sink(data, {'a': 'first'})
+        entry_bytes = (tmp_path / 'first.arrow').stat().st_size
+        feature_cache = FeatureCache(tmp_path, max_bytes=2 * entry_bytes)
+
+        feature_cache.sink(data, {'a': 'second'})
+        os.utime(tmp_path / 'first.arrow', ns=(0, 0))
+        os.utime(tmp_path / 'second.arrow', ns=(1, 1))
+        feature_cache.scan('first')
+        feature_cache.sink(data, {'a': 'third'})
+        feature_cache.evict()
+
+        assert 'second' not in feature_cache
+        assert 'first' in feature_cache
+        assert 'third' in feature_cache
+        assert feature_cache.num_bytes <= 2 * entry_bytes
+
+    def test_feature_keys_follow_transitive_inputs(self, tmp_path: Path) -> None:
+        feature_cache = FeatureCache(tmp_path)
+        dataset = Dataset(pl.LazyFrame({'a': [1, 2], 'b': [3, 4]}), SCHEMA)
+        layers: list[list[Transformer]] = [[PolynomialTransformer(column='a', degree=2), PolynomialTransformer(column='b', degree=2)], [LogTransformer(column='a_pow_2', base=10)]]
+        changed_layers: list[list[Transformer]] = [[PolynomialTransformer(column='a', degree=3), PolynomialTransformer(column='b', degree=2)]]
+        log_of_input_layers: list[list[Transformer]] = [[LogTransformer(column='a_pow_2', base=10)]]
+
+        keys = feature_cache.feature_keys(layers, dataset)
+
+        assert keys == feature_cache.feature_keys(layers, Dataset(pl.LazyFrame({'a': [1, 2], 'b': [3, 4]}), SCHEMA))
+        assert keys != feature_cache.feature_keys(layers, Dataset(pl.LazyFrame({'a': [1, 5], 'b': [3, 4]}), SCHEMA))
+        assert keys != feature_cache.feature_keys(layers, dataset, salt='float32')
+        assert keys['b_pow_2'] == feature_cache.feature_keys(changed_layers, dataset)['b_pow_2']
+        assert keys['a_pow_2_log10'] != feature_cache.feature_keys(log_of_input_layers, dataset)['a_pow_2_log10']
+
+    def test_feature_keys_change_with_source_files(self, tmp_path: Path) -> None:
+        feature_cache = FeatureCache(tmp_path / 'cache')
+        pl.DataFrame({'a': [1, 2], 'b': [3, 4]}).write_parquet(tmp_path / 'data.parquet')
+        layers: list[list[Transformer]] = [[PolynomialTransformer(column='a', degree=2)]]
+
+        keys = feature_cache.feature_keys(layers, Dataset.from_parquet(tmp_path / 'data.parquet', SCHEMA))
+        pl.DataFrame({'a': [1, 2, 3], 'b': [3, 4, 5]}).write_parquet(tmp_path / 'data.parquet')
+
+        assert keys != feature_cache.feature_keys(layers, Dataset.from_parquet(tmp_path / 'data.parquet', SCHEMA))
+
+    def test_requires_positive_max_bytes(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match='max_bytes'):
+            FeatureCache(tmp_path, max_bytes=0)
@@ -0,0 +1,106 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from auto_featurs.pipeline.execution_plan import LookupJoinStage
+from auto_featurs.pipeline.fitter import Fitter
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import StdTransformer
+from auto_featurs.transformers.aggregating_transformers import SumTransformer
+from auto_featurs.transformers.aggregating_transformers import ZscoreTransformer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.numeric_transformers import MinMaxScaler
+from auto_featurs.transformers.numeric_transformers import PolynomialTransformer
+from auto_featurs.transformers.numeric_transformers import StandardScaler
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+from auto_featurs.utils.utils_for_tests import BASIC_FRAME
+
+OTHER_FRAME = pl.LazyFrame({'NUMERIC_FEATURE': [10, 20], 'GROUPING_FEATURE_NUM': ['ODD', 'UNSEEN']})
+
+
+class TestFitter:
+    def setup_method(self) -> None:
+        self._fitter = Fitter()
+
+    def test_scalers_are_fitted_to_literals(self) -> None:
+        layer: list[Transformer] = [StandardScaler(column='NUMERIC_FEATURE'), MinMaxScaler(column='NUMERIC_FEATURE')]
+
+        fitted_layer = self._fitter.fit_layer(layer, BASIC_FRAME)
+
+        assert fitted_layer.lookup_stages == []
+        assert_frame_equal(
+            OTHER_FRAME.select(*fitted_layer.exprs.values()).collect(),
+            pl.DataFrame({'NUMERIC_FEATURE_standard_scaled': [(10 - 2.5) / 1.8708286933869707, (20 - 2.5) / 1.8708286933869707], 'NUMERIC_FEATURE_minmax_scaled': [2.0, 4.0]}),
+        )
+
+    def test_moments_are_fitted_as_mean_and_std(self) -> None:
+        layer: list[Transformer] = [OverWrapper(inner_transformer=ZscoreTransformer(column='NUMERIC_FEATURE'), over_columns=['GROUPING_FEATURE_NUM'])]
+
+        fitted_layer = self._fitter.fit_layer(layer, BASIC_FRAME)
+
+        assert fitted_layer.hidden_columns == [f'{HIDDEN_COLUMN_PREFIX}NUMERIC_FEATURE_{statistic}_over_GROUPING_FEATURE_NUM' for statistic in ('mean', 'std')]
+
+    def test_over_aggregations_are_fitted_to_lookup_tables(self) -> None:
+        layer: list[Transformer] = [
+            OverWrapper(inner_transformer=transformer, over_columns=['GROUPING_FEATURE_NUM'])
+            for transformer in (CountTransformer(), SumTransformer(column='NUMERIC_FEATURE'), ZscoreTransformer(column='NUMERIC_FEATURE'))
+        ]
+
+        fitted_layer = self._fitter.fit_layer(layer, BASIC_FRAME)
+
+        assert len(fitted_layer.lookup_stages) == 1
+        lookup_stage = fitted_layer.lookup_stages[0]
+        assert isinstance(lookup_stage, LookupJoinStage)
+        assert lookup_stage.keys == ['GROUPING_FEATURE_NUM']
+        assert lookup_stage.table.height == 3
+
+        result = lookup_stage.apply(OTHER_FRAME).select(*fitted_layer.exprs.values()).collect()
+        assert_frame_equal(
+            result,
+            pl.DataFrame(
+                {
+                    'count_over_GROUPING_FEATURE_NUM': [3, None],
+                    'NUMERIC_FEATURE_sum_over_GROUPING_FEATURE_NUM': [9, None],
+                    'NUMERIC_FEATURE_z_score_over_GROUPING_FEATURE_NUM': [3.5, None],
+                },
+            ),
+            check_dtypes=False,
+        )
+
+    def test_global_aggregations_are_fitted_to_literals(self) -> None:
+        fitted_layer = self._fitter.fit_layer([MeanTransformer(column='NUMERIC_FEATURE')], BASIC_FRAME)
+
+        assert fitted_layer.lookup_stages == []
+        assert OTHER_FRAME.select(*fitted_layer.exprs.values()).collect().to_series().to_list() == [2.5]
+
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    def test_fitted_moments_are_stable_for_large_values(self, over_columns: list[str]) -> None:
+        frame = BASIC_FRAME.with_columns(pl.col('NUMERIC_FEATURE').mul(0.1).add(1e9))
+        layer: list[Transformer] = [
+            OverWrapper(inner_transformer=transformer, over_columns=over_columns) if over_columns else transformer
+            for transformer in (StdTransformer(column='NUMERIC_FEATURE'), ZscoreTransformer(column='NUMERIC_FEATURE'))
+        ]
+
+        fitted_layer = self._fitter.fit_layer(layer, frame)
+
+        fitted_frame = frame
+        for lookup_stage in fitted_layer.lookup_stages:
+            fitted_frame = lookup_stage.apply(fitted_frame)
+        assert_frame_equal(
+            fitted_frame.select(*fitted_layer.exprs.values()).collect(),
+            frame.select(transformer.transform() for transformer in layer).collect(),
+        )
+
+    def test_row_local_and_cumulative_transformers_are_not_fitted(self) -> None:
+        layer: list[Transformer] = [
+            PolynomialTransformer(column='NUMERIC_FEATURE', degree=2),
+            OverWrapper(inner_transformer=SumTransformer(column='NUMERIC_FEATURE', cumulative=CumulativeOptions.INCLUSIVE), over_columns=['GROUPING_FEATURE_NUM']),
+        ]
+
+        fitted_layer = self._fitter.fit_layer(layer, BASIC_FRAME)
+
+        assert fitted_layer.exprs == {}
+        assert fitted_layer.lookup_stages == []
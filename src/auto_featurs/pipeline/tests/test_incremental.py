@@ -0,0 +1,113 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.incremental import IncrementalState
+from auto_featurs.pipeline.pipeline import Pipeline
+from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregations
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.numeric_transformers import ArithmeticOperation
+
+HISTORY_FRAME = pl.DataFrame(
+    {
+        'ENTITY': ['A', 'B', 'A', 'A', 'C', 'B', 'A', 'B', 'C', 'A', 'B', 'A', 'D', 'A', 'B', 'D'],
+        'VALUE': [3.0, 1.0, None, 5.0, 2.0, 2.0, 1.0, None, 7.0, 5.0, 4.0, 0.0, 1.0, 2.0, 2.0, None],
+        'CATEGORY': ['x', 'y', 'x', None, 'z', 'y', 'z', 'x', 'z', 'x', 'y', 'z', 'x', 'z', None, 'y'],
+        'FLAG': [True, False, True, None, True, True, False, True, False, True, None, True, False, True, True, False],
+    },
+)
+
+SCHEMA = Schema(
+    [
+        ColumnSpecification.nominal(name='ENTITY'),
+        ColumnSpecification.numeric(name='VALUE'),
+        ColumnSpecification.nominal(name='CATEGORY'),
+        ColumnSpecification.boolean(name='FLAG'),
+    ],
+)
+
+
+class TestIncrementalUpdates:
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.INCLUSIVE, CumulativeOptions.EXCLUSIVE])
+    @pytest.mark.parametrize('over_columns_combinations', [(), (['ENTITY'],)])
+    def test_update_matches_full_recompute(self, cumulative: CumulativeOptions, over_columns_combinations: tuple[list[str], ...]) -> None:
+        full = self._get_pipeline(HISTORY_FRAME, cumulative, over_columns_combinations).collect()
+
+        pipeline = self._get_pipeline(HISTORY_FRAME.head(6), cumulative, over_columns_combinations)
+        state = pipeline.export_state()
+        first_batch, state = pipeline.update(HISTORY_FRAME.slice(6, 5), state)
+        second_batch, state = pipeline.update(HISTORY_FRAME.slice(11).lazy(), state)
+
+        assert_frame_equal(pl.concat([first_batch, second_batch]), full.slice(6))
+
+    def test_state_holds_one_row_per_entity(self) -> None:
+        pipeline = self._get_pipeline(HISTORY_FRAME, CumulativeOptions.INCLUSIVE, (['ENTITY'],))
+
+        state = pipeline.export_state()
+
+        assert state.tables['inclusive_cum_count_over_ENTITY'].sort('ENTITY')['total'].to_list() == [7, 5, 2, 2]
+        assert state.tables['CATEGORY_inclusive_cum_num_unique_over_ENTITY/seen_values'].height == HISTORY_FRAME.select('ENTITY', 'CATEGORY').n_unique()
+
+    def test_later_layers_use_updated_features(self) -> None:
+        full = self._get_layered_pipeline(HISTORY_FRAME).collect()
+        pipeline = self._get_layered_pipeline(HISTORY_FRAME.head(8))
+
+        updated, _ = pipeline.update(HISTORY_FRAME.slice(8), pipeline.export_state())
+
+        assert_frame_equal(updated, full.slice(8))
+
+    def test_non_cumulative_aggregations_are_rejected(self) -> None:
+        pipeline = Pipeline(dataset=Dataset(HISTORY_FRAME, SCHEMA)).with_count(over_columns_combinations=[['ENTITY']])
+
+        with pytest.raises(ValueError, match='only cumulative aggregations are supported'):
+            pipeline.export_state()
+
+    def test_unsupported_cumulative_aggregations_are_rejected(self) -> None:
+        pipeline = Pipeline(dataset=Dataset(HISTORY_FRAME, SCHEMA)).with_arithmetic_aggregation('VALUE', [ArithmeticAggregations.MEDIAN], cumulative=CumulativeOptions.INCLUSIVE)
+
+        with pytest.raises(ValueError, match='MedianTransformer does not keep a running state'):
+            pipeline.export_state()
+
+    def test_state_must_match_pipeline(self) -> None:
+        count_pipeline = Pipeline(dataset=Dataset(HISTORY_FRAME, SCHEMA)).with_count(cumulative=CumulativeOptions.INCLUSIVE)
+        sum_pipeline = Pipeline(dataset=Dataset(HISTORY_FRAME, SCHEMA)).with_arithmetic_aggregation('VALUE', [ArithmeticAggregations.SUM], cumulative=CumulativeOptions.INCLUSIVE)
+
+        with pytest.raises(ValueError, match='Incremental state does not match the pipeline'):
+            sum_pipeline.update(HISTORY_FRAME, count_pipeline.export_state())
+
+        assert sum_pipeline.update(HISTORY_FRAME, IncrementalState())[0].equals(sum_pipeline.collect())
+
+    @staticmethod
+    def _get_pipeline(data: pl.DataFrame, cumulative: CumulativeOptions, over_columns_combinations: tuple[list[str], ...]) -> Pipeline:
+        aggregations = [
+            ArithmeticAggregations.SUM,
+            ArithmeticAggregations.MIN,
+            ArithmeticAggregations.MAX,
+            ArithmeticAggregations.MEAN,
+            ArithmeticAggregations.STD,
+            ArithmeticAggregations.ZSCORE,
+        ]
+        return (
+            Pipeline(dataset=Dataset(data, SCHEMA))
+            .with_count(over_columns_combinations=over_columns_combinations, cumulative=cumulative)
+            .with_count(over_columns_combinations=over_columns_combinations, cumulative=cumulative, filtering_condition=pl.col('FLAG'))
+            .with_arithmetic_aggregation('VALUE', aggregations, over_columns_combinations=over_columns_combinations, cumulative=cumulative)
+            .with_arithmetic_aggregation('VALUE', [ArithmeticAggregations.MAX], over_columns_combinations=over_columns_combinations, cumulative=cumulative, filtering_condition=pl.col('FLAG'))
+            .with_num_unique(['CATEGORY', 'VALUE'], over_columns_combinations=over_columns_combinations, cumulative=cumulative)
+            .with_num_unique('CATEGORY', over_columns_combinations=over_columns_combinations, cumulative=cumulative, filtering_condition=pl.col('FLAG'))
+            .with_mode('CATEGORY', over_columns_combinations=over_columns_combinations, cumulative=cumulative)
+            .with_mode('CATEGORY', over_columns_combinations=over_columns_combinations, cumulative=cumulative, filtering_condition=pl.col('FLAG'))
+        )
+
+    @staticmethod
+    def _get_layered_pipeline(data: pl.DataFrame) -> Pipeline:
+        return (
+            Pipeline(dataset=Dataset(data, SCHEMA))
+            .with_count(over_columns_combinations=[['ENTITY']], cumulative=CumulativeOptions.INCLUSIVE, auxiliary=True)
+            .with_arithmetic_aggregation('VALUE', [ArithmeticAggregations.SUM], over_columns_combinations=[['ENTITY']], cumulative=CumulativeOptions.INCLUSIVE)
+            .with_new_layer()
+            .with_arithmetic(['VALUE_inclusive_cum_sum_over_ENTITY'], ['inclusive_cum_count_over_ENTITY'], [ArithmeticOperation.DIVIDE])
+        )
@@ -0,0 +1,24 @@
+from auto_featurs.pipeline.liveness import LivenessAnalyzer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.numeric_transformers import AddTransformer
+from auto_featurs.transformers.numeric_transformers import PolynomialTransformer
+
+
+class TestLivenessAnalyzer:
+    def setup_method(self) -> None:
+        self._liveness_analyzer = LivenessAnalyzer()
+        self._layers: list[list[Transformer]] = [
+            [PolynomialTransformer(column='a', degree=2), PolynomialTransformer(column='b', degree=2)],
+            [AddTransformer(left_column='a_pow_2', right_column='c')],
+            [PolynomialTransformer(column='a_pow_2_add_c', degree=2)],
+        ]
+
+    def test_columns_are_dropped_after_last_consumer(self) -> None:
+        dead_columns = self._liveness_analyzer.dead_columns_per_layer(self._layers, ['a_pow_2', 'b_pow_2', 'a_pow_2_add_c'])
+
+        assert dead_columns == [['b_pow_2'], ['a_pow_2'], ['a_pow_2_add_c']]
+
+    def test_unused_input_columns_are_dropped_after_first_layer(self) -> None:
+        dead_columns = self._liveness_analyzer.dead_columns_per_layer(self._layers, ['d', 'c', 'a'])
+
+        assert dead_columns == [['d', 'a'], ['c'], []]
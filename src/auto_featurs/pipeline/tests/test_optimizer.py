@@ -1,6 +1,9 @@
 from collections.abc import Iterable
+from itertools import islice
+from itertools import product
 
 import polars as pl
+import pytest
 
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
@@ -30,8 +33,8 @@ class MockCommutativeTransformer(Transformer):
     def _transform(self) -> pl.Expr:
         return pl.lit('commutative')
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_commutative_mock_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_commutative_mock_{self._right_column}'
 
 
 class MockNonCommutativeTransformer(Transformer):
@@ -52,8 +55,8 @@ class MockNonCommutativeTransformer(Transformer):
     def _transform(self) -> pl.Expr:
         return pl.lit('non-commutative')
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_non_commutative_mock_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_non_commutative_mock_{self._right_column}'
 
 
 class TestOptimizer:
@@ -105,3 +108,20 @@ class TestOptimizer:
 
         assert commutative_optimized == [['a', 'b']]
         assert non_commutative_optimized == [['a', 'b'], ['b', 'a']]
+
+    @pytest.mark.parametrize('optimization_level', list(OptimizationLevel))
+    @pytest.mark.parametrize('transformer', [MockCommutativeTransformer, MockNonCommutativeTransformer])
+    def test_enumerate_input_columns_matches_optimized_product(self, optimization_level: OptimizationLevel, transformer: type[Transformer]) -> None:
+        optimizer = Optimizer(optimization_level)
+        columns = [ColumnSpecification.numeric(name=name) for name in 'abcd']
+
+        for input_columns in ([columns, columns], [columns, columns, columns], [columns[:2], columns[1:]]):
+            enumerated = list(optimizer.enumerate_input_columns(transformer, input_columns))
+            assert enumerated == list(optimizer.optimize_input_columns(transformer, product(*input_columns)))
+
+    def test_enumerate_input_columns_is_lazy(self) -> None:
+        columns = [ColumnSpecification.numeric(name=f'col_{i}') for i in range(10_000)]
+
+        enumerated = self._deduplicate_commutative_level_optimizer.enumerate_input_columns(MockCommutativeTransformer, [columns, columns])
+
+        assert self._flatten_to_names(islice(enumerated, 3)) == [['col_0', 'col_1'], ['col_0', 'col_2'], ['col_0', 'col_3']]
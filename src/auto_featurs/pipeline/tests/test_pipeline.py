@@ -1,10 +1,12 @@
 import math
 from datetime import timedelta
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import polars as pl
 import pytest
+from polars._typing import EngineType
 from polars.testing import assert_frame_equal
 
 from auto_featurs.base.column_specification import ColumnRole
@@ -12,8 +14,12 @@ from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.schema import Schema
 from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.checkpointer import CheckpointMode
+from auto_featurs.pipeline.dtype_policy import DtypePolicy
+from auto_featurs.pipeline.feature_cache import FeatureCache
 from auto_featurs.pipeline.optimizer import OptimizationLevel
 from auto_featurs.pipeline.pipeline import Pipeline
+from auto_featurs.pipeline.planner import OverStrategy
 from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregations
 from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
 from auto_featurs.transformers.comparison_transformers import Comparisons
@@ -33,6 +39,10 @@ class TestPipeline:
     def setup_method(self) -> None:
         df = pl.LazyFrame({'NUMERIC_FEATURE': [0, 1, 2, 3, 4, 5]})
         self._simple_dataset = Dataset(data=df, schema=Schema([ColumnSpecification.numeric(name='NUMERIC_FEATURE')]))
+        self._mixed_dataset = Dataset(
+            data=BASIC_FRAME,
+            schema=Schema([ColumnSpecification.numeric(name='NUMERIC_FEATURE'), ColumnSpecification.nominal(name='GROUPING_FEATURE_NUM')]),
+        )
 
     def test_transformers_from_init(self) -> None:
         pipeline = Pipeline(
@@ -157,6 +167,551 @@ class TestPipeline:
             expected_new_columns=expected_new_columns,
         )
 
+    def test_execution_kinds(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+
+        assert_frame_equal(
+            pipeline.execution_kinds(),
+            pl.DataFrame({
+                'layer': [1, 2, 3],
+                'column': ['NUMERIC_FEATURE_pow_2', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10'],
+                'transformer': ['PolynomialTransformer', 'OverWrapper', 'LogTransformer'],
+                'execution_kind': ['row_local', 'window', 'row_local'],
+            }),
+            check_dtypes=False,
+        )
+        assert not pipeline.is_streamable()
+        assert Pipeline(dataset=self._simple_dataset).with_polynomial(subset='NUMERIC_FEATURE', degrees=[2]).is_streamable()
+
+    def test_profile(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']], cumulative=CumulativeOptions.INCLUSIVE)
+        )
+
+        sample = Dataset(BASIC_FRAME.head(5), Schema([ColumnSpecification.numeric(name='NUMERIC_FEATURE'), ColumnSpecification.nominal(name='GROUPING_FEATURE_NUM')]))
+        profile = pipeline.profile(sample)
+
+        assert_frame_equal(
+            profile.select('layer', 'column', 'transformer', 'wrapper', 'cumulative', 'execution_kind'),
+            pl.DataFrame({
+                'layer': [1, 2, 3, 3],
+                'column': [
+                    'NUMERIC_FEATURE_pow_2',
+                    'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM',
+                    'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10',
+                    'inclusive_cum_count_over_GROUPING_FEATURE_NUM',
+                ],
+                'transformer': ['PolynomialTransformer', 'SumTransformer', 'LogTransformer', 'CountTransformer'],
+                'wrapper': ['none', 'over', 'none', 'over'],
+                'cumulative': ['none', 'none', 'none', 'inclusive'],
+                'execution_kind': ['row_local', 'window', 'row_local', 'window'],
+            }),
+            check_dtypes=False,
+        )
+        assert all(value > 0 for value in profile.select(pl.col('layer_seconds', 'layer_peak_rss_mb', 'estimated_seconds').min()).row(0))
+        assert profile.filter(pl.col('layer') == 3)['layer_seconds'].n_unique() == 1
+
+    @pytest.mark.parametrize('engine', ['auto', 'in-memory', 'streaming'])
+    def test_collect_with_engine(self, engine: EngineType) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+
+        assert_frame_equal(pipeline.collect(engine=engine), pipeline.collect_plan().collect())
+
+    def test_streaming_collect_and_sink(self, tmp_path: Path) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+
+        pipeline.sink_parquet(tmp_path / 'test.parquet', streaming=True)
+
+        assert_frame_equal(pl.read_parquet(tmp_path / 'test.parquet'), pipeline.collect())
+        assert_frame_equal(pipeline.collect(streaming=True), pipeline.collect())
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_sink_parquet_chunked(self, tmp_path: Path, streaming: bool) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_polynomial(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', degrees=[2], auxiliary=True)
+            .with_arithmetic_aggregation(
+                subset='NUMERIC_FEATURE',
+                aggregations=[ArithmeticAggregations.MEAN, ArithmeticAggregations.STD, ArithmeticAggregations.MAX],
+                over_columns_combinations=[['GROUPING_FEATURE_NUM']],
+            )
+        )
+
+        pipeline.sink_parquet_chunked(tmp_path / 'features', columns_per_file=2, streaming=streaming)
+        result = Dataset.from_manifest(tmp_path / 'features')
+
+        assert sorted(path.name for path in (tmp_path / 'features').iterdir()) == ['manifest.json', 'part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet']
+        assert result.schema == pipeline.collect_plan().schema
+        assert_frame_equal(result.collect(), pipeline.collect())
+
+    def test_sort_by_time_orders_cumulative_and_lagged_features(self, tmp_path: Path) -> None:
+        schema = Schema([
+            ColumnSpecification.nominal(name='ENTITY'),
+            ColumnSpecification.datetime(name='TIME', role=ColumnRole.TIME_INFO),
+            ColumnSpecification.numeric(name='VALUE'),
+        ])
+        frame = pl.LazyFrame({'ENTITY': ['a', 'b', 'a', 'b', 'a'], 'TIME': [3, 2, 1, 1, 2], 'VALUE': [1.0, 2.0, 3.0, 4.0, 5.0]}).with_columns(pl.col('TIME').cast(pl.Datetime))
+        pipeline = (
+            Pipeline(dataset=Dataset(frame, schema).sort_by_time(entity_columns=['ENTITY']))
+            .with_arithmetic_aggregation(subset='VALUE', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['ENTITY']], cumulative=CumulativeOptions.INCLUSIVE)
+            .with_lagged(subset='VALUE', lags=[1], over_columns_combinations=[['ENTITY']])
+        )
+
+        pipeline.sink_parquet_chunked(tmp_path / 'features', columns_per_file=1)
+        result = Dataset.from_manifest(tmp_path / 'features')
+
+        assert result.sort_columns == ('ENTITY', 'TIME')
+        assert_frame_equal(
+            result.collect().select('ENTITY', 'VALUE', 'VALUE_inclusive_cum_sum_over_ENTITY', 'VALUE_lagged_1_over_ENTITY'),
+            pl.DataFrame({
+                'ENTITY': ['a', 'a', 'a', 'b', 'b'],
+                'VALUE': [3.0, 5.0, 1.0, 4.0, 2.0],
+                'VALUE_inclusive_cum_sum_over_ENTITY': [3.0, 8.0, 9.0, 4.0, 6.0],
+                'VALUE_lagged_1_over_ENTITY': [None, 3.0, 5.0, None, 4.0],
+            }),
+        )
+
+    def test_sort_by_time_orders_windows_outside_entities_across_layers(self) -> None:
+        schema = Schema([
+            ColumnSpecification.nominal(name='ENTITY'),
+            ColumnSpecification.numeric(name='TIME', role=ColumnRole.TIME_INFO),
+            ColumnSpecification.nominal(name='MERCHANT'),
+            ColumnSpecification.numeric(name='VALUE'),
+        ])
+        frame = pl.LazyFrame({'ENTITY': ['a', 'a', 'a', 'b', 'b'], 'TIME': [1, 4, 5, 2, 3], 'MERCHANT': ['x', 'y', 'x', 'x', 'y'], 'VALUE': [1.0, 2.0, 3.0, 4.0, 5.0]})
+        pipeline = (
+            Pipeline(dataset=Dataset(frame, schema).sort_by_time(entity_columns=['ENTITY']))
+            .with_polynomial(subset='VALUE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='VALUE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['MERCHANT']], cumulative=CumulativeOptions.INCLUSIVE)
+            .with_first_value(subset='VALUE_pow_2', over_columns_combinations=[['MERCHANT']])
+            .with_lagged(subset='VALUE_pow_2', lags=[1])
+        )
+        columns = ['VALUE_pow_2_inclusive_cum_sum_over_MERCHANT', 'VALUE_pow_2_first_value_over_MERCHANT', 'VALUE_pow_2_lagged_1']
+
+        result = pipeline.collect(columns=columns)
+
+        assert_frame_equal(result, pl.DataFrame({
+            'VALUE_pow_2_inclusive_cum_sum_over_MERCHANT': [1.0, 29.0, 26.0, 17.0, 25.0],
+            'VALUE_pow_2_first_value_over_MERCHANT': [1.0, 25.0, 1.0, 1.0, 25.0],
+            'VALUE_pow_2_lagged_1': [None, 25.0, 4.0, 1.0, 16.0],
+        }))
+        assert_frame_equal(pipeline.fit().collect(columns=columns), result)
+
+    def test_sink_parquet_chunked_requires_positive_chunk_size(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match='columns_per_file has to be a positive integer, got 0'):
+            Pipeline(dataset=self._simple_dataset).with_polynomial(subset='NUMERIC_FEATURE', degrees=[2]).sink_parquet_chunked(tmp_path, columns_per_file=0)
+
+    def test_collect_sharded(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']], cumulative=CumulativeOptions.INCLUSIVE)
+            .with_lagged(subset='NUMERIC_FEATURE', lags=[1], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_scaling(subset='NUMERIC_FEATURE', scalings=[Scaling.STANDARD])
+            .fit()
+        )
+
+        result = pipeline.collect_sharded(partition_columns=['GROUPING_FEATURE_NUM'], num_shards=3, max_workers=2)
+
+        assert_frame_equal(result, pipeline.collect())
+
+    def test_collect_sharded_rejects_unsafe_transformers(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_count(over_columns_combinations=[[]])
+        )
+
+        with pytest.raises(ValueError, match="Transformer producing 'count' is not partition-safe for \\['GROUPING_FEATURE_NUM'\\]"):
+            pipeline.collect_sharded(partition_columns=['GROUPING_FEATURE_NUM'], num_shards=2)
+
+    def test_restrict_to_keeps_only_required_transformers(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_polynomial(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', degrees=[2, 3])
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+        )
+
+        restricted_pipeline = pipeline.restrict_to(['NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10', 'count_over_GROUPING_FEATURE_NUM'])
+
+        assert restricted_pipeline.execution_kinds()['column'].to_list() == [
+            'NUMERIC_FEATURE_pow_2',
+            'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM',
+            'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10',
+            'count_over_GROUPING_FEATURE_NUM',
+        ]
+        assert_frame_equal(
+            restricted_pipeline.collect(),
+            pipeline.collect().drop('NUMERIC_FEATURE_pow_2', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', '^.*_pow_[23]$'),
+        )
+
+    def test_collect_and_sink_requested_columns(self, tmp_path: Path) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_scaling(subset='NUMERIC_FEATURE', scalings=[Scaling.STANDARD])
+            .fit()
+        )
+        columns = ['GROUPING_FEATURE_NUM', 'NUMERIC_FEATURE_standard_scaled', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM']
+
+        pipeline.sink_parquet(tmp_path / 'test.parquet', columns=columns)
+
+        assert_frame_equal(pipeline.collect(columns=columns), pipeline.collect().select(columns))
+        assert_frame_equal(pl.read_parquet(tmp_path / 'test.parquet'), pipeline.collect().select(columns))
+
+    def test_feature_cache_computes_only_missing_features(self, tmp_path: Path) -> None:
+        feature_cache = FeatureCache(tmp_path / 'cache')
+        cached_pipeline = (
+            Pipeline(dataset=self._mixed_dataset, feature_cache=feature_cache)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+        expected = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_log(subset='NUMERIC_FEATURE', bases=[10])
+            .collect()
+        )
+
+        assert_frame_equal(cached_pipeline.collect(), expected.drop('NUMERIC_FEATURE_log10'))
+        assert len(list(feature_cache.directory.iterdir())) == 3
+
+        for path in feature_cache.directory.iterdir():
+            pl.read_ipc(path, memory_map=False).with_columns(pl.all() * 0).write_ipc(path)
+        pipeline = cached_pipeline.with_log(subset='NUMERIC_FEATURE', bases=[10])
+        pipeline.sink_parquet(tmp_path / 'test.parquet')
+
+        cached_features = ['NUMERIC_FEATURE_pow_2', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', 'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10']
+        assert_frame_equal(pl.read_parquet(tmp_path / 'test.parquet'), expected.with_columns(pl.col(cached_features) * 0))
+        assert_frame_equal(pipeline.collect(columns=['NUMERIC_FEATURE_log10', 'NUMERIC_FEATURE']), expected.select('NUMERIC_FEATURE_log10', 'NUMERIC_FEATURE'))
+        assert len(list(feature_cache.directory.iterdir())) == 4
+
+    @pytest.mark.parametrize('cached', [False, True])
+    def test_feature_cache_sink_parquet_streams(self, tmp_path: Path, cached: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+        feature_cache = FeatureCache(tmp_path / 'cache')
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset, feature_cache=feature_cache)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+        expected = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .collect()
+        )
+        if cached:
+            pipeline.collect()
+
+        def fail_to_write(*args: object, **kwargs: object) -> None:
+            raise AssertionError('Feature cache must not materialize the output eagerly.')
+
+        monkeypatch.setattr(pl.DataFrame, 'write_parquet', fail_to_write)
+        pipeline.sink_parquet(tmp_path / 'output' / 'test.parquet', streaming=True)
+
+        assert_frame_equal(pl.read_parquet(tmp_path / 'output' / 'test.parquet'), expected)
+        assert sorted(path.suffix for path in feature_cache.directory.iterdir()) == ['.arrow'] * 3
+
+    def test_collect_plan_checkpoints(self, tmp_path: Path) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+        expected = pipeline.collect()
+
+        in_memory = pipeline.collect_plan(checkpoint=CheckpointMode.MEMORY)
+        streamed = pipeline.collect_plan(checkpoint=CheckpointMode.MEMORY, engine='streaming')
+        on_disk = pipeline.collect_plan(checkpoint=[CheckpointMode.DISK, CheckpointMode.NONE, CheckpointMode.DISK], checkpoint_directory=tmp_path)
+        checkpoint_files = sorted(path.name for path in tmp_path.iterdir())
+
+        assert_frame_equal(in_memory.collect(), expected)
+        assert_frame_equal(streamed.collect(), expected)
+        assert_frame_equal(on_disk.collect(), expected)
+        assert [name[:9] for name in checkpoint_files] == ['layer-001', 'layer-003']
+        assert on_disk.source_paths == (tmp_path / checkpoint_files[-1],)
+
+        modification_times = [path.stat().st_mtime_ns for path in sorted(tmp_path.iterdir())]
+        assert_frame_equal(pipeline.collect_plan(checkpoint=[CheckpointMode.DISK, CheckpointMode.NONE, CheckpointMode.DISK], checkpoint_directory=tmp_path).collect(), expected)
+        assert [path.stat().st_mtime_ns for path in sorted(tmp_path.iterdir())] == modification_times
+
+    def test_collect_plan_checkpoint_validation(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+
+        with pytest.raises(ValueError, match='one checkpoint mode per layer'):
+            pipeline.collect_plan(checkpoint=[CheckpointMode.MEMORY])
+        with pytest.raises(ValueError, match='checkpoint_directory'):
+            pipeline.collect_plan(checkpoint=CheckpointMode.DISK)
+
+    def test_restrict_to_unknown_columns(self) -> None:
+        pipeline = Pipeline(dataset=self._mixed_dataset).with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+
+        with pytest.raises(KeyError, match="neither input columns nor produced by the pipeline: \\['MISSING'\\]"):
+            pipeline.restrict_to(['NUMERIC_FEATURE', 'MISSING'])
+
+    def test_profile_optimization_with_batched_stages(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset, max_exprs_per_stage=2)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2, 3, 4, 5, 6])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2', bases=[10])
+        )
+
+        profile = pipeline.profile_optimization()
+        expected = (
+            Pipeline(dataset=self._simple_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2, 3, 4, 5, 6])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2', bases=[10])
+            .collect()
+        )
+
+        assert profile['num_stages'].to_list() == [3, 1]
+        assert profile['num_exprs'].to_list() == [5, 1]
+        assert all(value > 0 for value in profile.select(pl.col('optimization_seconds', 'optimization_seconds_without_cse').min()).row(0))
+        assert_frame_equal(pipeline.collect(), expected)
+
+    def test_estimate(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_scaling(subset='NUMERIC_FEATURE_pow_2', scalings=[Scaling.STANDARD])
+        )
+
+        estimate = pipeline.estimate()
+
+        assert_frame_equal(
+            estimate,
+            pl.DataFrame({
+                'layer': [1, 2],
+                'execution_kind': ['row_local', 'window'],
+                'num_new_columns': [1, 1],
+                'num_columns': [2, 3],
+                'bytes_per_row': [16.0, 24.0],
+                'output_bytes': [48, 48],
+                'frame_bytes': [96, 144],
+                'peak_bytes': [96, 168],
+            }),
+            check_dtypes=False,
+        )
+        assert pipeline.estimate(num_rows=1_000)['frame_bytes'].to_list() == [16_000, 24_000]
+
+    @pytest.mark.parametrize(
+        ('max_output_columns', 'memory_budget', 'message'),
+        [
+            (2, None, 'would hold 3 columns after layer 2, more than max_output_columns=2'),
+            (None, 100, 'estimated to need 168 bytes in layer 2, more than memory_budget=100'),
+        ],
+    )
+    def test_budget_guard_fails_before_computation(self, tmp_path: Path, max_output_columns: Optional[int], memory_budget: Optional[int], message: str) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset, max_output_columns=max_output_columns, memory_budget=memory_budget)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_scaling(subset='NUMERIC_FEATURE_pow_2', scalings=[Scaling.STANDARD])
+        )
+
+        with pytest.raises(ValueError, match=message):
+            pipeline.collect()
+        with pytest.raises(ValueError, match=message):
+            pipeline.sink_parquet(tmp_path / 'test.parquet')
+        assert not (tmp_path / 'test.parquet').exists()
+
+    def test_budget_guard_allows_pipeline_within_budget(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset, max_output_columns=3, memory_budget=168)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_scaling(subset='NUMERIC_FEATURE_pow_2', scalings=[Scaling.STANDARD])
+        )
+
+        result = pipeline.collect()
+
+        assert result.columns == ['NUMERIC_FEATURE', 'NUMERIC_FEATURE_pow_2', 'NUMERIC_FEATURE_pow_2_standard_scaled']
+
+    def test_budget_guard_counts_only_requested_columns(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset, max_output_columns=2)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_scaling(subset='NUMERIC_FEATURE_pow_2', scalings=[Scaling.STANDARD])
+        )
+
+        result = pipeline.collect(columns=['NUMERIC_FEATURE_pow_2'])
+
+        assert result.columns == ['NUMERIC_FEATURE_pow_2']
+
+    def test_max_output_columns_has_to_be_positive(self) -> None:
+        with pytest.raises(ValueError, match='max_output_columns has to be a positive integer'):
+            Pipeline(dataset=self._simple_dataset, max_output_columns=0)
+
+    def test_dtype_policy_is_reflected_in_schema(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset, dtype_policy=DtypePolicy(float_dtype=pl.Float32, downcast_integers=True))
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_count(over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+        )
+
+        dataset = pipeline.collect_plan()
+        result = dataset.collect()
+
+        assert result.schema['NUMERIC_FEATURE_pow_2'] == pl.Int64()
+        assert result.schema['count_over_GROUPING_FEATURE_NUM'] == pl.UInt32()
+        assert dataset.schema.get_column_by_name('count_over_GROUPING_FEATURE_NUM').dtype == pl.UInt32()
+        assert pipeline.compile().schema.get_column_by_name('count_over_GROUPING_FEATURE_NUM').dtype == pl.UInt32()
+
+    def test_dtype_policy_casts_float_features(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._simple_dataset, dtype_policy=DtypePolicy(float_dtype=pl.Float32))
+            .with_log(subset='NUMERIC_FEATURE', bases=[10])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_log10', bases=[10])
+        )
+
+        result = pipeline.collect()
+        expected = (
+            Pipeline(dataset=self._simple_dataset)
+            .with_log(subset='NUMERIC_FEATURE', bases=[10])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_log10', bases=[10])
+            .collect()
+        )
+
+        assert result.dtypes == [pl.Int64(), pl.Float32(), pl.Float32()]
+        assert [column.dtype for column in pipeline.collect_plan().schema.columns] == [None, pl.Float32(), pl.Float32()]
+        assert_frame_equal(result, expected, check_dtypes=False)
+
+    def test_streaming_conflicts_with_other_engine(self) -> None:
+        with pytest.raises(ValueError, match="Cannot use streaming=True together with engine='in-memory'."):
+            Pipeline(dataset=self._simple_dataset).with_polynomial(subset='NUMERIC_FEATURE', degrees=[2]).collect(engine='in-memory', streaming=True)
+
+    def test_fit_keeps_collect_results(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+        )
+
+        fitted_pipeline = pipeline.fit()
+
+        assert fitted_pipeline.is_fitted()
+        assert not pipeline.is_fitted()
+        assert not fitted_pipeline.with_new_layer().is_fitted()
+        assert_frame_equal(fitted_pipeline.collect(), pipeline.collect())
+
+    def test_transform_applies_fitted_statistics(self) -> None:
+        pipeline = (
+            Pipeline(dataset=self._mixed_dataset)
+            .with_polynomial(subset='NUMERIC_FEATURE', degrees=[2])
+            .with_new_layer()
+            .with_arithmetic_aggregation(subset='NUMERIC_FEATURE_pow_2', aggregations=[ArithmeticAggregations.SUM], over_columns_combinations=[['GROUPING_FEATURE_NUM']])
+            .with_new_layer()
+            .with_log(subset='NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM', bases=[10])
+            .with_scaling(subset='NUMERIC_FEATURE', scalings=[Scaling.MIN_MAX])
+            .fit()
+        )
+        other_dataset = Dataset(
+            data=pl.LazyFrame({'NUMERIC_FEATURE': [10, 2], 'GROUPING_FEATURE_NUM': ['EVEN', 'UNSEEN']}),
+            schema=Schema([ColumnSpecification.numeric(name='NUMERIC_FEATURE'), ColumnSpecification.nominal(name='GROUPING_FEATURE_NUM')]),
+        )
+
+        result = pipeline.transform(other_dataset).collect()
+
+        assert_frame_equal(
+            result,
+            pl.DataFrame(
+                {
+                    'NUMERIC_FEATURE': [10, 2],
+                    'GROUPING_FEATURE_NUM': ['EVEN', 'UNSEEN'],
+                    'NUMERIC_FEATURE_pow_2': [100, 4],
+                    'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM': [20, None],
+                    'NUMERIC_FEATURE_pow_2_sum_over_GROUPING_FEATURE_NUM_log10': [math.log10(20), None],
+                    'NUMERIC_FEATURE_minmax_scaled': [2.0, 0.4],
+                },
+            ),
+        )
+
+    def test_transform_requires_fit(self) -> None:
+        with pytest.raises(ValueError, match='Pipeline has to be fitted'):
+            Pipeline(dataset=self._simple_dataset).with_polynomial(subset='NUMERIC_FEATURE', degrees=[2]).transform(self._simple_dataset)
+
     def test_index_column_must_be_present_in_schema(self) -> None:
         pipeline = Pipeline(dataset=Dataset(data=BASIC_FRAME, schema=Schema([])))
 
@@ -201,7 +756,8 @@ class TestPipeline:
         assert 'Initial Column Count:' in description
         assert 'Total Features Created (of which auxiliary):' in description
 
-    def test_basic_sample_with_all_transformers(self) -> None:
+    @pytest.mark.parametrize('over_strategy', [OverStrategy.WINDOW, OverStrategy.GROUP_BY, OverStrategy.AUTO])
+    def test_basic_sample_with_all_transformers(self, over_strategy: OverStrategy) -> None:
         pipeline = Pipeline(
             dataset=Dataset(
                 data=BASIC_FRAME,
@@ -219,6 +775,7 @@ class TestPipeline:
                     ColumnSpecification.text(name='TEXT_FEATURE_3'),
                 ]),
             ),
+            over_strategy=over_strategy,
         )
         pipeline = (
             pipeline
@@ -0,0 +1,361 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.base.schema import Schema
+from auto_featurs.dataset.dataset import Dataset
+from auto_featurs.pipeline.dtype_policy import DtypePolicy
+from auto_featurs.pipeline.execution_plan import GroupByJoinStage
+from auto_featurs.pipeline.execution_plan import GroupIdStage
+from auto_featurs.pipeline.execution_plan import ReorderStage
+from auto_featurs.pipeline.execution_plan import RollingJoinStage
+from auto_featurs.pipeline.execution_plan import SelectStage
+from auto_featurs.pipeline.execution_plan import WithColumnsStage
+from auto_featurs.pipeline.planner import OverStrategy
+from auto_featurs.pipeline.planner import Planner
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
+from auto_featurs.transformers.aggregating_transformers import EntityEntropyTransformer
+from auto_featurs.transformers.aggregating_transformers import FirstValueTransformer
+from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import MedianTransformer
+from auto_featurs.transformers.aggregating_transformers import MinTransformer
+from auto_featurs.transformers.aggregating_transformers import ModeTransformer
+from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
+from auto_featurs.transformers.aggregating_transformers import PointwiseMutualInformationTransformer
+from auto_featurs.transformers.aggregating_transformers import StdTransformer
+from auto_featurs.transformers.aggregating_transformers import SumTransformer
+from auto_featurs.transformers.aggregating_transformers import ZscoreTransformer
+from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.datetime_transformers import HourOfDayTransformer
+from auto_featurs.transformers.numeric_transformers import PolynomialTransformer
+from auto_featurs.transformers.over_wrapper import OverWrapper
+from auto_featurs.transformers.rolling_wrapper import RollingWrapper
+from auto_featurs.utils.constants import HIDDEN_COLUMN_PREFIX
+from auto_featurs.utils.utils_for_tests import BASIC_FRAME
+
+
+class TestPlanner:
+    def setup_method(self) -> None:
+        self._planner = Planner()
+
+    def test_layer_without_shared_moments_is_single_stage(self) -> None:
+        layer: list[Transformer] = [MeanTransformer(column='NUMERIC_FEATURE'), MinTransformer(column='NUMERIC_FEATURE')]
+
+        layer_plan = self._planner.plan_layer(layer)
+
+        assert layer_plan.num_stages == 1
+        assert layer_plan.hidden_columns == []
+
+    def test_shared_moments_are_computed_once(self) -> None:
+        layer: list[Transformer] = [
+            OverWrapper(inner_transformer=transformer_type(column='NUMERIC_FEATURE'), over_columns=['GROUPING_FEATURE_NUM'])
+            for transformer_type in (SumTransformer, MeanTransformer, StdTransformer, ZscoreTransformer)
+        ]
+
+        layer_plan = self._planner.plan_layer(layer)
+
+        assert sorted(layer_plan.hidden_columns) == [f'{HIDDEN_COLUMN_PREFIX}NUMERIC_FEATURE_{moment}_over_GROUPING_FEATURE_NUM' for moment in ('mean', 'std')]
+        assert layer_plan.num_stages == 2
+        assert isinstance(layer_plan.stages[0], WithColumnsStage)
+        assert isinstance(layer_plan.stages[1], SelectStage)
+        assert layer_plan.stages[1].dropped_columns == layer_plan.hidden_columns
+        assert layer_plan.stages[1].output_columns == [transformer.output_column_specification.name for transformer in layer]
+
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM'], ['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2']])
+    def test_planned_layer_matches_direct_transform(self, cumulative: CumulativeOptions, over_columns: list[str]) -> None:
+        layer: list[Transformer] = []
+        for transformer_type in (SumTransformer, MeanTransformer, StdTransformer, ZscoreTransformer, MinTransformer):
+            transformer = transformer_type(column='NUMERIC_FEATURE', cumulative=cumulative)
+            layer.append(OverWrapper(inner_transformer=transformer, over_columns=over_columns) if over_columns else transformer)
+
+        layer_plan = self._planner.plan_layer(layer)
+
+        assert layer_plan.hidden_columns
+        assert_frame_equal(
+            layer_plan.apply(BASIC_FRAME),
+            BASIC_FRAME.with_columns(transformer.transform() for transformer in layer),
+            check_dtypes=False,
+        )
+
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    def test_shared_moments_are_stable_for_large_values(self, over_columns: list[str]) -> None:
+        frame = BASIC_FRAME.with_columns(pl.col('NUMERIC_FEATURE').mul(0.1).add(1e9))
+        layer: list[Transformer] = []
+        for transformer_type in (MeanTransformer, StdTransformer, ZscoreTransformer):
+            transformer = transformer_type(column='NUMERIC_FEATURE')
+            layer.append(OverWrapper(inner_transformer=transformer, over_columns=over_columns) if over_columns else transformer)
+
+        layer_plan = self._planner.plan_layer(layer)
+
+        assert layer_plan.hidden_columns
+        assert_frame_equal(layer_plan.apply(frame), frame.with_columns(transformer.transform() for transformer in layer))
+
+    def test_filtered_moments_are_shared(self) -> None:
+        layer: list[Transformer] = [
+            MeanTransformer(column='NUMERIC_FEATURE', filtering_condition=pl.col('BOOL_FEATURE')),
+            ZscoreTransformer(column='NUMERIC_FEATURE', filtering_condition=pl.col('BOOL_FEATURE')),
+        ]
+
+        layer_plan = self._planner.plan_layer(layer)
+
+        assert f'{HIDDEN_COLUMN_PREFIX}NUMERIC_FEATURE_mean_where_BOOL_FEATURE' in layer_plan.hidden_columns
+        assert_frame_equal(
+            layer_plan.apply(BASIC_FRAME),
+            BASIC_FRAME.with_columns(transformer.transform() for transformer in layer),
+            check_dtypes=False,
+        )
+
+
+class TestOverStrategy:
+    @staticmethod
+    def _get_layer(cumulative: CumulativeOptions = CumulativeOptions.NONE) -> list[Transformer]:
+        inner_transformers = [
+            CountTransformer(cumulative=cumulative),
+            SumTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            MeanTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            StdTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            ZscoreTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            MinTransformer(column='NUMERIC_FEATURE', cumulative=cumulative, filtering_condition=pl.col('BOOL_FEATURE')),
+            ModeTransformer(column=ColumnSpecification.nominal(name='CATEGORICAL_FEATURE'), cumulative=cumulative),
+            NumUniqueTransformer(column='CATEGORICAL_FEATURE', cumulative=cumulative),
+            FirstValueTransformer(column=ColumnSpecification.numeric(name='NUMERIC_FEATURE_2')),
+        ]
+        return [
+            OverWrapper(inner_transformer=transformer, over_columns=over_columns)
+            for over_columns in (['GROUPING_FEATURE_NUM'], ['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2'])
+            for transformer in inner_transformers
+        ]
+
+    def test_window_strategy_does_not_fuse(self) -> None:
+        layer_plan = Planner(OverStrategy.WINDOW).plan_layer(self._get_layer(), BASIC_FRAME)
+
+        assert not any(isinstance(stage, GroupByJoinStage) for stage in layer_plan.stages)
+
+    def test_group_by_strategy_fuses_per_key_set(self) -> None:
+        layer_plan = Planner(OverStrategy.GROUP_BY).plan_layer(self._get_layer(), BASIC_FRAME)
+
+        group_by_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupByJoinStage)]
+        assert [stage.keys for stage in group_by_stages] == [
+            ['GROUPING_FEATURE_NUM'], ['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2'],
+        ] * 2
+
+    def test_cumulative_aggregations_are_not_fused(self) -> None:
+        layer_plan = Planner(OverStrategy.GROUP_BY).plan_layer(self._get_layer(CumulativeOptions.EXCLUSIVE), BASIC_FRAME)
+
+        group_by_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupByJoinStage)]
+        assert all(stage.output_columns == [f'NUMERIC_FEATURE_2_first_value_over_{'_and_'.join(stage.keys)}'] for stage in group_by_stages)
+
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    @pytest.mark.parametrize('over_strategy', [OverStrategy.GROUP_BY, OverStrategy.AUTO])
+    def test_fused_layer_matches_window_layer(self, cumulative: CumulativeOptions, over_strategy: OverStrategy) -> None:
+        layer = self._get_layer(cumulative)
+
+        assert_frame_equal(
+            Planner(over_strategy).plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME),
+            Planner(OverStrategy.WINDOW).plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME),
+        )
+
+    def test_repeated_over_keys_are_hoisted_into_group_ids(self) -> None:
+        layer_plan = Planner(hoist_group_ids=True).plan_layer(self._get_layer(), BASIC_FRAME)
+
+        group_id_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupIdStage)]
+        assert len(group_id_stages) == 1
+        assert group_id_stages[0].keys == [['GROUPING_FEATURE_NUM'], ['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2']]
+        assert set(group_id_stages[0].columns) <= set(layer_plan.hidden_columns)
+        assert not set(group_id_stages[0].columns) & set(layer_plan.apply(BASIC_FRAME).collect_schema().names())
+
+    def test_integer_over_keys_are_not_hoisted(self) -> None:
+        frame = BASIC_FRAME.with_columns(pl.col('NUMERIC_FEATURE_2').alias('GROUPING_FEATURE_NUM'))
+
+        layer_plan = Planner(hoist_group_ids=True).plan_layer(self._get_layer(), frame)
+
+        group_id_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupIdStage)]
+        assert [stage.keys for stage in group_id_stages] == [[['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2']]]
+
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    def test_entropy_and_pmi_partitions_are_hoisted(self, cumulative: CumulativeOptions) -> None:
+        layer: list[Transformer] = [
+            EntityEntropyTransformer(source='GROUPING_FEATURE_NUM', target='CATEGORICAL_FEATURE', cumulative=cumulative),
+            EntityEntropyTransformer(source='GROUPING_FEATURE_NUM', target='GROUPING_FEATURE_CAT_2', cumulative=cumulative),
+            PointwiseMutualInformationTransformer(column_a='GROUPING_FEATURE_NUM', column_b='GROUPING_FEATURE_CAT_2', cumulative=cumulative),
+            OverWrapper(
+                inner_transformer=PointwiseMutualInformationTransformer(column_a='GROUPING_FEATURE_NUM', column_b='GROUPING_FEATURE_CAT_2', cumulative=cumulative),
+                over_columns=['BOOL_FEATURE'],
+            ),
+        ]
+
+        layer_plan = Planner(hoist_group_ids=True).plan_layer(layer, BASIC_FRAME)
+
+        group_id_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupIdStage)]
+        assert [stage.keys for stage in group_id_stages] == [[['GROUPING_FEATURE_NUM'], ['GROUPING_FEATURE_CAT_2'], ['GROUPING_FEATURE_NUM', 'GROUPING_FEATURE_CAT_2']]]
+        assert_frame_equal(layer_plan.apply(BASIC_FRAME), Planner().plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME))
+
+    def test_group_ids_are_dense(self) -> None:
+        frame = pl.LazyFrame({'a': ['x', None, 'x', 'y', None], 'b': [1, 2, 1, None, 2]})
+
+        group_ids = GroupIdStage(keys=[['a'], ['a', 'b']], columns=['a_id', 'a_b_id']).apply(frame).collect()
+
+        assert group_ids.schema['a_id'] == pl.UInt32
+        assert group_ids['a_id'].to_list() == [2, 1, 2, 3, 1]
+        assert group_ids['a_b_id'].to_list() == [2, 1, 2, 3, 1]
+
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    @pytest.mark.parametrize('over_strategy', [OverStrategy.WINDOW, OverStrategy.GROUP_BY])
+    def test_group_id_layer_matches_window_layer(self, cumulative: CumulativeOptions, over_strategy: OverStrategy) -> None:
+        layer = self._get_layer(cumulative)
+
+        assert_frame_equal(
+            Planner(over_strategy, hoist_group_ids=True).plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME),
+            Planner(OverStrategy.WINDOW).plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME),
+        )
+
+    def test_auto_strategy_depends_on_cardinality(self) -> None:
+        layer = self._get_layer()
+        low_cardinality_frame = pl.LazyFrame({
+            'GROUPING_FEATURE_NUM': ['A', 'B'] * 50,
+            'GROUPING_FEATURE_CAT_2': list(range(100)),
+        })
+
+        layer_plan = Planner(OverStrategy.AUTO).plan_layer(layer, low_cardinality_frame)
+
+        group_by_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupByJoinStage)]
+        assert {tuple(stage.keys) for stage in group_by_stages} == {('GROUPING_FEATURE_NUM',)}
+
+    def test_auto_strategy_uses_dataset_profile(self) -> None:
+        layer = self._get_layer()
+        low_cardinality_frame = pl.LazyFrame({
+            'GROUPING_FEATURE_NUM': ['A', 'B'] * 50,
+            'GROUPING_FEATURE_CAT_2': list(range(100)),
+        })
+        profile = Dataset(low_cardinality_frame, Schema([])).profile()
+
+        layer_plan = Planner(OverStrategy.AUTO, profile=profile).plan_layer(layer, low_cardinality_frame.select(pl.lit(1).alias('unused')))
+
+        group_by_stages = [stage for stage in layer_plan.stages if isinstance(stage, GroupByJoinStage)]
+        assert {tuple(stage.keys) for stage in group_by_stages} == {('GROUPING_FEATURE_NUM',)}
+
+    def test_auto_strategy_without_data_does_not_fuse(self) -> None:
+        layer_plan = Planner(OverStrategy.AUTO).plan_layer(self._get_layer())
+
+        assert not any(isinstance(stage, GroupByJoinStage) for stage in layer_plan.stages)
+
+    @pytest.mark.parametrize('over_strategy', [OverStrategy.WINDOW, OverStrategy.GROUP_BY])
+    def test_dtype_policy_casts_outputs(self, over_strategy: OverStrategy) -> None:
+        layer: list[Transformer] = [
+            *(OverWrapper(inner_transformer=transformer, over_columns=['GROUPING_FEATURE_NUM']) for transformer in (MeanTransformer(column='NUMERIC_FEATURE'), CountTransformer())),
+            CountTransformer(cumulative=CumulativeOptions.INCLUSIVE),
+            HourOfDayTransformer(column='DATE_FEATURE'),
+            PolynomialTransformer(column='NUMERIC_FEATURE', degree=2),
+        ]
+        planner = Planner(over_strategy, DtypePolicy(float_dtype=pl.Float32, downcast_integers=True))
+
+        layer_plan = planner.plan_layer(layer, BASIC_FRAME)
+        result = layer_plan.apply(BASIC_FRAME).collect()
+
+        expected_dtypes = {
+            'NUMERIC_FEATURE_mean_over_GROUPING_FEATURE_NUM': pl.Float32(),
+            'count_over_GROUPING_FEATURE_NUM': pl.UInt32(),
+            'inclusive_cum_count': pl.UInt32(),
+            'DATE_FEATURE_hour_of_day': pl.UInt8(),
+        }
+        assert layer_plan.output_dtypes == expected_dtypes
+        assert {name: result.schema[name] for name in expected_dtypes} == expected_dtypes
+        assert result.schema['NUMERIC_FEATURE_pow_2'] == pl.Int64()
+        assert_frame_equal(result, Planner(over_strategy).plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME).collect(), check_dtypes=False)
+
+    def test_large_layer_is_split_into_balanced_stages(self) -> None:
+        layer: list[Transformer] = [
+            *(PolynomialTransformer(column=column, degree=degree) for degree in range(2, 5) for column in ('NUMERIC_FEATURE', 'NUMERIC_FEATURE_2')),
+            CountTransformer(cumulative=CumulativeOptions.INCLUSIVE),
+        ]
+
+        layer_plan = Planner(max_exprs_per_stage=3).plan_layer(layer, BASIC_FRAME)
+
+        with_columns_stages = [stage for stage in layer_plan.stages if isinstance(stage, WithColumnsStage)]
+        assert [len(stage.exprs) for stage in with_columns_stages] == [3, 2, 2]
+        assert [expr.meta.root_names() for stage in with_columns_stages for expr in stage.exprs] == [[], *[['NUMERIC_FEATURE']] * 3, *[['NUMERIC_FEATURE_2']] * 3]
+        assert isinstance(layer_plan.stages[-1], ReorderStage)
+        assert_frame_equal(layer_plan.apply(BASIC_FRAME), Planner().plan_layer(layer, BASIC_FRAME).apply(BASIC_FRAME))
+
+    def test_max_exprs_per_stage_has_to_be_positive(self) -> None:
+        with pytest.raises(ValueError, match='max_exprs_per_stage has to be a positive integer, got 0.'):
+            Planner(max_exprs_per_stage=0)
+
+    def test_dtype_policy_rejects_non_float_dtype(self) -> None:
+        with pytest.raises(ValueError, match='float_dtype has to be a floating point dtype'):
+            DtypePolicy(float_dtype=pl.Int32)
+
+
+class TestRollingBatching:
+    def setup_method(self) -> None:
+        self._index_column = ColumnSpecification.datetime(name='DATE_FEATURE')
+        self._frame = pl.LazyFrame({
+            'DATE_FEATURE': [datetime(year=2_000, month=1, day=day, tzinfo=UTC) for day in (1, 2, 2, 3, 3, 5, 6, 6)],
+            'GROUPING_FEATURE_NUM': ['A', 'B', 'A', 'A', None, 'B', None, 'A'],
+            'NUMERIC_FEATURE': [1, 2, 3, None, 5, 6, 7, 8],
+        })
+
+    def _get_layer(self, time_window: str | timedelta, over_columns: list[str], cumulative: CumulativeOptions = CumulativeOptions.NONE) -> list[Transformer]:
+        layer: list[Transformer] = []
+        for inner_transformer in (
+            MedianTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            NumUniqueTransformer(column='NUMERIC_FEATURE', cumulative=cumulative),
+            ModeTransformer(column=ColumnSpecification.numeric(name='NUMERIC_FEATURE'), cumulative=cumulative),
+            MinTransformer(column='NUMERIC_FEATURE', cumulative=CumulativeOptions.INCLUSIVE, filtering_condition=pl.col('NUMERIC_FEATURE') > 2),
+        ):
+            rolling_transformer = RollingWrapper(inner_transformer=inner_transformer, index_column=self._index_column, time_window=time_window)
+            layer.append(OverWrapper(inner_transformer=rolling_transformer, over_columns=over_columns) if over_columns else rolling_transformer)
+        return layer
+
+    @pytest.mark.parametrize('time_window', ['2d', timedelta(days=3)])
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    def test_batched_rolling_matches_rolling_expressions(self, time_window: str | timedelta, over_columns: list[str], cumulative: CumulativeOptions) -> None:
+        layer = self._get_layer(time_window, over_columns, cumulative)
+
+        layer_plan = Planner().plan_layer(layer, self._frame)
+
+        rolling_stages = [stage for stage in layer_plan.stages if isinstance(stage, RollingJoinStage)]
+        assert len(rolling_stages) == 1
+        assert rolling_stages[0].keys == over_columns
+        assert rolling_stages[0].output_columns == [transformer.output_column_specification.name for transformer in layer]
+        assert_frame_equal(
+            layer_plan.apply(self._frame),
+            self._frame.with_columns(transformer.transform() for transformer in layer),
+        )
+
+    def test_rolling_contexts_are_batched_separately(self) -> None:
+        layer = self._get_layer('2d', []) + self._get_layer('3d', []) + self._get_layer('2d', ['GROUPING_FEATURE_NUM'])
+
+        layer_plan = Planner().plan_layer(layer, self._frame)
+
+        rolling_stages = [stage for stage in layer_plan.stages if isinstance(stage, RollingJoinStage)]
+        assert [(stage.period, stage.keys) for stage in rolling_stages] == [('2d', []), ('3d', []), ('2d', ['GROUPING_FEATURE_NUM'])]
+        assert_frame_equal(
+            layer_plan.apply(self._frame),
+            self._frame.with_columns(transformer.transform() for transformer in layer),
+        )
+
+    def test_single_rolling_aggregation_is_not_batched(self) -> None:
+        layer = self._get_layer('2d', [])[:1]
+
+        layer_plan = Planner().plan_layer(layer, self._frame)
+
+        assert not any(isinstance(stage, RollingJoinStage) for stage in layer_plan.stages)
+
+    def test_native_kernels_are_not_batched(self) -> None:
+        layer: list[Transformer] = [
+            RollingWrapper(inner_transformer=transformer, index_column=self._index_column, time_window='2d')
+            for transformer in (CountTransformer(), SumTransformer(column='NUMERIC_FEATURE'), StdTransformer(column='NUMERIC_FEATURE'))
+        ]
+
+        layer_plan = Planner().plan_layer(layer, self._frame)
+
+        assert not any(isinstance(stage, RollingJoinStage) for stage in layer_plan.stages)
@@ -6,7 +6,11 @@ from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 from auto_featurs.pipeline.validator import Validator
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
 from auto_featurs.transformers.base import Transformer
+from auto_featurs.transformers.numeric_transformers import PolynomialTransformer
+from auto_featurs.transformers.numeric_transformers import StandardScaler
+from auto_featurs.transformers.over_wrapper import OverWrapper
 
 
 class MockInputTypeTransformer(Transformer):
@@ -26,8 +30,8 @@ class MockInputTypeTransformer(Transformer):
     def _transform(self) -> pl.Expr:
         return pl.lit('Mock')
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias('Mock')
+    def _output_name(self) -> str:
+        return 'Mock'
 
 
 class TestValidator:
@@ -64,3 +68,19 @@ class TestValidator:
         transformer = MockInputTypeTransformer(frozenset([ColumnType.NUMERIC]))
         input_columns = (ColumnSpecification(name='a', column_type=ColumnType.NUMERIC),)
         self._validator.validate_transformer_against_input_columns(transformer, input_columns)
+
+    def test_validate_output_name(self) -> None:
+        transformer = MockInputTypeTransformer(frozenset([ColumnType.NUMERIC]))
+
+        self._validator.validate_output_name(transformer, transformer.transform())
+        with pytest.raises(ValueError, match="declares output column 'Mock', but its expression produces 'Other'"):
+            self._validator.validate_output_name(transformer, transformer.transform().alias('Other'))
+
+    def test_validate_partition_safety(self) -> None:
+        self._validator.validate_partition_safety(PolynomialTransformer(column='a', degree=2), ['key'])
+        self._validator.validate_partition_safety(OverWrapper(inner_transformer=CountTransformer(), over_columns=['key', 'other']), ['key'])
+
+        with pytest.raises(ValueError, match="'count_over_other' is not partition-safe"):
+            self._validator.validate_partition_safety(OverWrapper(inner_transformer=CountTransformer(), over_columns=['other']), ['key'])
+        with pytest.raises(ValueError, match="'a_standard_scaled' is not partition-safe"):
+            self._validator.validate_partition_safety(StandardScaler(column='a'), ['key'])
@@ -1,11 +1,15 @@
+from collections.abc import Collection
 from collections.abc import Sequence
 from datetime import timedelta
 from typing import Optional
 
+import polars as pl
+
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.base import ExecutionKind
 from auto_featurs.transformers.base import Transformer
 from auto_featurs.transformers.over_wrapper import OverWrapper
 from auto_featurs.transformers.rolling_wrapper import RollingWrapper
@@ -19,6 +23,23 @@ class Validator:
         if index_column is not None and index_column.column_type != ColumnType.DATETIME:
             raise ValueError(f'Currently only {ColumnType.DATETIME} columns are supported for rolling aggregation but {index_column.column_type} was passed for {index_column.name}.')
 
+    @staticmethod
+    def validate_output_name(transformer: Transformer, expr: pl.Expr) -> None:
+        expr_name = expr.meta.output_name()
+        if expr_name != transformer.output_column_specification.name:
+            raise ValueError(f'Transformer {transformer} declares output column {transformer.output_column_specification.name!r}, but its expression produces {expr_name!r}.')
+
+    @staticmethod
+    def validate_partition_safety(transformer: Transformer, partition_columns: Collection[str]) -> None:
+        if transformer.execution_kind() == ExecutionKind.ROW_LOCAL:
+            return
+        if isinstance(transformer, OverWrapper) and set(partition_columns).issubset(transformer.over_columns):
+            return
+        raise ValueError(
+            f'Transformer producing {transformer.output_column_specification.name!r} is not partition-safe for {sorted(partition_columns)}, '
+            f'window-based features have to be computed over all partition columns (or fitted first).',
+        )
+
     @staticmethod
     def validate_transformer_against_input_columns(transformer: Transformer, input_columns: tuple[ColumnSpecification, ...]) -> None:
         if isinstance(transformer, RollingWrapper | OverWrapper | CountTransformer):
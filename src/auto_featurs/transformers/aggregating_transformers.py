@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Mapping
 from enum import Enum
 from typing import Any
 from typing import Optional
@@ -12,11 +13,18 @@ from auto_featurs.base.column_specification import ColumnNameOrSpec
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
+from auto_featurs.transformers.base import ExecutionKind
 from auto_featurs.transformers.base import Transformer
 from auto_featurs.utils.utils import default_true_filtering_condition
 from auto_featurs.utils.utils import filtering_condition_to_string
 from auto_featurs.utils.utils import parse_column_name
 
+type OverKeys = tuple[str, ...]
+
+
+def partition_columns(keys: OverKeys, group_ids: Mapping[OverKeys, str]) -> list[str]:
+    return [group_ids[keys]] if keys in group_ids else list(keys)
+
 
 class CumulativeOptions(Enum):
     NONE = 'none'
@@ -27,8 +35,31 @@ class CumulativeOptions(Enum):
         return f'{self.value}_cum_' if self != CumulativeOptions.NONE else ''
 
 
+class Moment(Enum):
+    COUNT = 'count'
+    SUM = 'sum'
+    MEAN = 'mean'
+    STD = 'std'
+
+
 class AggregatingTransformer(Transformer, ABC):
-    pass
+    def is_scalar_aggregation(self) -> bool:
+        return False
+
+    def execution_kind(self) -> ExecutionKind:
+        return ExecutionKind.WINDOW
+
+    def is_order_dependent(self) -> bool:
+        return False
+
+    def partitions(self) -> list[OverKeys]:
+        return []
+
+    def transform_over_group_ids(self, group_ids: Mapping[OverKeys, str]) -> pl.Expr:
+        return self._transform_over_group_ids(group_ids).alias(self.output_column_specification.name)
+
+    def _transform_over_group_ids(self, group_ids: Mapping[OverKeys, str]) -> pl.Expr:
+        return self._transform()
 
 
 class CountTransformer(AggregatingTransformer):
@@ -36,6 +67,14 @@ class CountTransformer(AggregatingTransformer):
         self._cumulative = cumulative
         self._filtering_condition = filtering_condition
 
+    @property
+    def cumulative(self) -> CumulativeOptions:
+        return self._cumulative
+
+    @property
+    def filtering_condition(self) -> Optional[pl.Expr]:
+        return self._filtering_condition
+
     def input_type(self) -> ColumnTypeSelector:
         return ColumnTypeSelector(frozenset())
 
@@ -43,6 +82,12 @@ class CountTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
@@ -64,9 +109,9 @@ class CountTransformer(AggregatingTransformer):
                 case CumulativeOptions.INCLUSIVE:
                     return pl.int_range(1, pl.len() + 1)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         condition_name = filtering_condition_to_string(self._filtering_condition)
-        return transform.alias(str(self._cumulative) + 'count' + condition_name)
+        return str(self._cumulative) + 'count' + condition_name
 
 
 class LaggedTransformer(AggregatingTransformer):
@@ -82,14 +127,17 @@ class LaggedTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_order_dependent(self) -> bool:
+        return True
+
     def _return_type(self) -> ColumnType:
         return self._column.column_type
 
     def _transform(self) -> pl.Expr:
         return pl.col(self._column.name).shift(self._lag, fill_value=self._fill_value)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column.name}_lagged_{self._lag}')
+    def _output_name(self) -> str:
+        return f'{self._column.name}_lagged_{self._lag}'
 
 
 class FirstValueTransformer(AggregatingTransformer):
@@ -104,14 +152,20 @@ class FirstValueTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_scalar_aggregation(self) -> bool:
+        return True
+
+    def is_order_dependent(self) -> bool:
+        return True
+
     def _return_type(self) -> ColumnType:
         return self._column.column_type
 
     def _transform(self) -> pl.Expr:
         return pl.col(self._column.name).filter(self._filtering_condition).first()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column.name}_first_value' + filtering_condition_to_string(self._filtering_condition))
+    def _output_name(self) -> str:
+        return f'{self._column.name}_first_value' + filtering_condition_to_string(self._filtering_condition)
 
 
 class ModeTransformer(AggregatingTransformer):
@@ -120,6 +174,18 @@ class ModeTransformer(AggregatingTransformer):
         self._cumulative = cumulative
         self._filtering_condition = default_true_filtering_condition(filtering_condition)
 
+    @property
+    def column(self) -> ColumnSpecification:
+        return self._column
+
+    @property
+    def cumulative(self) -> CumulativeOptions:
+        return self._cumulative
+
+    @property
+    def filtering_condition(self) -> pl.Expr:
+        return self._filtering_condition
+
     def input_type(self) -> ColumnTypeSelector:
         return ColumnTypeSelector.any()
 
@@ -127,6 +193,12 @@ class ModeTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return self._column.column_type
 
@@ -144,9 +216,9 @@ class ModeTransformer(AggregatingTransformer):
 
             return cum_mode
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         condition_name = filtering_condition_to_string(self._filtering_condition)
-        return transform.alias(f'{self._column.name}_{str(self._cumulative)}mode' + condition_name)
+        return f'{self._column.name}_{str(self._cumulative)}mode' + condition_name
 
 
 class NumUniqueTransformer(AggregatingTransformer):
@@ -155,6 +227,18 @@ class NumUniqueTransformer(AggregatingTransformer):
         self._cumulative = cumulative
         self._filtering_condition = default_true_filtering_condition(filtering_condition)
 
+    @property
+    def column(self) -> str:
+        return self._column
+
+    @property
+    def cumulative(self) -> CumulativeOptions:
+        return self._cumulative
+
+    @property
+    def filtering_condition(self) -> pl.Expr:
+        return self._filtering_condition
+
     def input_type(self) -> ColumnTypeSelector:
         return ColumnTypeSelector.any()
 
@@ -162,6 +246,12 @@ class NumUniqueTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
@@ -176,9 +266,9 @@ class NumUniqueTransformer(AggregatingTransformer):
 
         return cum_n_unique
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         condition_name = filtering_condition_to_string(self._filtering_condition)
-        return transform.alias(f'{self._column}_{str(self._cumulative)}num_unique' + condition_name)
+        return f'{self._column}_{str(self._cumulative)}num_unique' + condition_name
 
 
 class EntityEntropyTransformer(AggregatingTransformer):
@@ -205,23 +295,33 @@ class EntityEntropyTransformer(AggregatingTransformer):
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
+    def partitions(self) -> list[OverKeys]:
+        return [(self._source,)]
+
     def _transform(self) -> pl.Expr:
+        return self._transform_over_group_ids({})
+
+    def _transform_over_group_ids(self, group_ids: Mapping[OverKeys, str]) -> pl.Expr:
         col = pl.col(self._target).cast(pl.String).fill_null('N/A')
+        over_columns = partition_columns((self._source,), group_ids)
         match self._cumulative:
             case CumulativeOptions.NONE:
-                return self._entropy_expr(expr=col).over(self._source)
+                return self._entropy_expr(expr=col).over(over_columns)
             case CumulativeOptions.EXCLUSIVE:
-                return col.cumulative_eval(self._entropy_expr(pl.element())).shift(1).over(self._source)
+                return col.cumulative_eval(self._entropy_expr(pl.element())).shift(1).over(over_columns)
             case CumulativeOptions.INCLUSIVE:
-                return col.cumulative_eval(self._entropy_expr(pl.element())).over(self._source)
+                return col.cumulative_eval(self._entropy_expr(pl.element())).over(over_columns)
 
     @staticmethod
     def _entropy_expr(expr: pl.Expr) -> pl.Expr:
         return expr.unique_counts().entropy(base=2)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         agg_name = str(self._cumulative) + 'entropy'
-        return transform.alias(f'{self._target}_by_{self._source}_{agg_name}')
+        return f'{self._target}_by_{self._source}_{agg_name}'
 
 
 class PointwiseMutualInformationTransformer(AggregatingTransformer):
@@ -248,19 +348,30 @@ class PointwiseMutualInformationTransformer(AggregatingTransformer):
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
+    def partitions(self) -> list[OverKeys]:
+        if self._column_a == self._column_b:
+            return [(self._column_a,)]
+        return [(self._column_a,), (self._column_b,), (self._column_a, self._column_b)]
+
     def _transform(self) -> pl.Expr:
+        return self._transform_over_group_ids({})
+
+    def _transform_over_group_ids(self, group_ids: Mapping[OverKeys, str]) -> pl.Expr:
         total_count = self._count_transformer.transform()
-        prob_a = self._compute_probability(self._column_a, total_count=total_count)
-        prob_b = self._compute_probability(self._column_b, total_count=total_count)
-        prob_ab = self._compute_probability(self._column_a, self._column_b, total_count=total_count)
+        prob_a = self._compute_probability(partition_columns((self._column_a,), group_ids), total_count=total_count)
+        prob_b = self._compute_probability(partition_columns((self._column_b,), group_ids), total_count=total_count)
+        prob_ab = self._compute_probability(partition_columns((self._column_a, self._column_b), group_ids), total_count=total_count)
         return (prob_ab / (prob_a * prob_b)).log(base=2)
 
-    def _compute_probability(self, *over_columns: str, total_count: pl.Expr) -> pl.Expr:
-        return self._count_transformer.transform().over(*over_columns) / total_count
+    def _compute_probability(self, over_columns: list[str], total_count: pl.Expr) -> pl.Expr:
+        return self._count_transformer.transform().over(over_columns) / total_count
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         agg_name = str(self._cumulative) + 'pmi'
-        return transform.alias(f'{self._column_a}_{self._column_b}_{agg_name}' + filtering_condition_to_string(self._filtering_condition))
+        return f'{self._column_a}_{self._column_b}_{agg_name}' + filtering_condition_to_string(self._filtering_condition)
 
 
 class ArithmeticAggregationTransformer(AggregatingTransformer, ABC):
@@ -269,6 +380,18 @@ class ArithmeticAggregationTransformer(AggregatingTransformer, ABC):
         self._cumulative = cumulative
         self._filtering_condition = default_true_filtering_condition(filtering_condition)
 
+    @property
+    def column(self) -> str:
+        return self._column
+
+    @property
+    def cumulative(self) -> CumulativeOptions:
+        return self._cumulative
+
+    @property
+    def filtering_condition(self) -> pl.Expr:
+        return self._filtering_condition
+
     def input_type(self) -> ColumnTypeSelector:
         return ColumnType.NUMERIC | ColumnType.BOOLEAN
 
@@ -276,11 +399,17 @@ class ArithmeticAggregationTransformer(AggregatingTransformer, ABC):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_{self._cumulative}{self._aggregation}' + filtering_condition_to_string(self._filtering_condition))
+    def _output_name(self) -> str:
+        return f'{self._column}_{self._cumulative}{self._aggregation}' + filtering_condition_to_string(self._filtering_condition)
 
     @property
     @abstractmethod
@@ -288,6 +417,16 @@ class ArithmeticAggregationTransformer(AggregatingTransformer, ABC):
         raise NotImplementedError
 
 
+class MomentAggregationTransformer(ArithmeticAggregationTransformer, ABC):
+    @abstractmethod
+    def moments(self) -> dict[Moment, AggregatingTransformer]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def transform_from_moments(self, moments: Mapping[Moment, pl.Expr]) -> pl.Expr:
+        raise NotImplementedError
+
+
 class MinTransformer(ArithmeticAggregationTransformer):
     def _transform(self) -> pl.Expr:
         col = pl.when(self._filtering_condition).then(pl.col(self._column))
@@ -320,7 +459,7 @@ class MaxTransformer(ArithmeticAggregationTransformer):
         return 'max'
 
 
-class SumTransformer(ArithmeticAggregationTransformer):
+class SumTransformer(MomentAggregationTransformer):
     def _transform(self) -> pl.Expr:
         col = pl.col(self._column).filter(self._filtering_condition)
         match self._cumulative:
@@ -331,6 +470,12 @@ class SumTransformer(ArithmeticAggregationTransformer):
             case CumulativeOptions.INCLUSIVE:
                 return col.cum_sum()
 
+    def moments(self) -> dict[Moment, AggregatingTransformer]:
+        return {Moment.SUM: self}
+
+    def transform_from_moments(self, moments: Mapping[Moment, pl.Expr]) -> pl.Expr:
+        return moments[Moment.SUM]
+
     @property
     def _aggregation(self) -> str:
         return 'sum'
@@ -363,7 +508,7 @@ class MedianTransformer(QuantileTransformer):
         super().__init__(column, 0.5, cumulative, filtering_condition)
 
 
-class MeanTransformer(ArithmeticAggregationTransformer):
+class MeanTransformer(MomentAggregationTransformer):
     def __init__(self, column: ColumnNameOrSpec, cumulative: CumulativeOptions = CumulativeOptions.NONE, filtering_condition: Optional[pl.Expr] = None) -> None:
         super().__init__(column, cumulative, filtering_condition)
         self._sum_transformer = SumTransformer(column, cumulative, filtering_condition)
@@ -372,16 +517,30 @@ class MeanTransformer(ArithmeticAggregationTransformer):
     def _transform(self) -> pl.Expr:
         return self._sum_transformer.transform() / self._count_transformer.transform()
 
+    def moments(self) -> dict[Moment, AggregatingTransformer]:
+        if self._cumulative != CumulativeOptions.NONE:
+            return {Moment.SUM: self._sum_transformer, Moment.COUNT: self._count_transformer}
+        return {Moment.MEAN: self}
+
+    def transform_from_moments(self, moments: Mapping[Moment, pl.Expr]) -> pl.Expr:
+        if self._cumulative != CumulativeOptions.NONE:
+            return moments[Moment.SUM] / moments[Moment.COUNT]
+        return moments[Moment.MEAN]
+
     @property
     def _aggregation(self) -> str:
         return 'mean'
 
 
-class StdTransformer(ArithmeticAggregationTransformer):
+class StdTransformer(MomentAggregationTransformer):
     def __init__(self, column: ColumnNameOrSpec, cumulative: CumulativeOptions = CumulativeOptions.NONE, filtering_condition: Optional[pl.Expr] = None) -> None:
         super().__init__(column, cumulative, filtering_condition)
         self._mean_transformer = MeanTransformer(column, cumulative, filtering_condition)
 
+    @property
+    def mean_transformer(self) -> MeanTransformer:
+        return self._mean_transformer
+
     def _transform(self) -> pl.Expr:
         col = pl.col(self._column).filter(self._filtering_condition)
         match self._cumulative:
@@ -396,20 +555,35 @@ class StdTransformer(ArithmeticAggregationTransformer):
                 cum_sum_squared_mean_diff = mean_diff.pow(2).fill_nan(0.0).cum_sum()
                 return cum_sum_squared_mean_diff.sqrt()
 
+    def moments(self) -> dict[Moment, AggregatingTransformer]:
+        return {Moment.STD: self}
+
+    def transform_from_moments(self, moments: Mapping[Moment, pl.Expr]) -> pl.Expr:
+        return moments[Moment.STD]
+
     @property
     def _aggregation(self) -> str:
         return 'std'
 
 
-class ZscoreTransformer(ArithmeticAggregationTransformer):
+class ZscoreTransformer(MomentAggregationTransformer):
     def __init__(self, column: ColumnNameOrSpec, cumulative: CumulativeOptions = CumulativeOptions.NONE, filtering_condition: Optional[pl.Expr] = None) -> None:
         super().__init__(column, cumulative, filtering_condition)
         self._mean_transformer = MeanTransformer(column, cumulative, filtering_condition)
         self._std_transformer = StdTransformer(column, cumulative, filtering_condition)
 
+    def is_scalar_aggregation(self) -> bool:
+        return False
+
     def _transform(self) -> pl.Expr:
         return (pl.col(self._column) - self._mean_transformer.transform()) / self._std_transformer.transform()
 
+    def moments(self) -> dict[Moment, AggregatingTransformer]:
+        return self._mean_transformer.moments() | self._std_transformer.moments()
+
+    def transform_from_moments(self, moments: Mapping[Moment, pl.Expr]) -> pl.Expr:
+        return (pl.col(self._column) - self._mean_transformer.transform_from_moments(moments)) / self._std_transformer.transform_from_moments(moments)
+
     @property
     def _aggregation(self) -> str:
         return 'z_score'
@@ -441,6 +615,12 @@ class ArgMinTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return False
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return self._arg_column.column_type
 
@@ -457,9 +637,9 @@ class ArgMinTransformer(AggregatingTransformer):
                 arg_col = arg_col.shift(1)
             return pl.when(value_col == value_col_min).then(arg_col).forward_fill()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         condition_name = filtering_condition_to_string(self._filtering_condition)
-        return transform.alias(f'{str(self._cumulative)}argmin_of_{self._value_column}_by_{self._arg_column.name}' + condition_name)
+        return f'{str(self._cumulative)}argmin_of_{self._value_column}_by_{self._arg_column.name}' + condition_name
 
 
 class ArgMaxTransformer(AggregatingTransformer):
@@ -477,6 +657,12 @@ class ArgMaxTransformer(AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return False
 
+    def is_scalar_aggregation(self) -> bool:
+        return self._cumulative == CumulativeOptions.NONE
+
+    def is_order_dependent(self) -> bool:
+        return self._cumulative != CumulativeOptions.NONE
+
     def _return_type(self) -> ColumnType:
         return self._arg_column.column_type
 
@@ -493,6 +679,6 @@ class ArgMaxTransformer(AggregatingTransformer):
                 arg_col = arg_col.shift(1)
             return pl.when(value_col == value_col_max).then(arg_col).forward_fill()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         condition_name = filtering_condition_to_string(self._filtering_condition)
-        return transform.alias(f'{str(self._cumulative)}argmax_of_{self._value_column}_by_{self._arg_column.name}' + condition_name)
+        return f'{str(self._cumulative)}argmax_of_{self._value_column}_by_{self._arg_column.name}' + condition_name
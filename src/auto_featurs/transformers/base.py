@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from enum import Enum
 from functools import cached_property
 
 import polars as pl
@@ -9,6 +10,11 @@ from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 
 
+class ExecutionKind(Enum):
+    ROW_LOCAL = 'row_local'
+    WINDOW = 'window'
+
+
 class Transformer(ABC):
     @abstractmethod
     def input_type(self) -> ColumnTypeSelector | tuple[ColumnTypeSelector, ...]:
@@ -28,15 +34,21 @@ class Transformer(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         raise NotImplementedError
 
+    def execution_kind(self) -> ExecutionKind:
+        return ExecutionKind.ROW_LOCAL
+
     def transform(self) -> pl.Expr:
-        return self._name(self._transform())
+        return self._transform().alias(self.output_column_specification.name)
+
+    def input_column_names(self) -> set[str]:
+        return set(self.transform().meta.root_names())
 
     @cached_property
     def output_column_specification(self) -> ColumnSpecification:
         return ColumnSpecification(
-            name=self.transform().meta.output_name(),
+            name=self._output_name(),
             column_type=self._return_type(),
         )
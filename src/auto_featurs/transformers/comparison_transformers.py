@@ -4,16 +4,26 @@ from enum import Enum
 import polars as pl
 
 from auto_featurs.base.column_specification import ColumnNameOrSpec
+from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 from auto_featurs.transformers.base import Transformer
 from auto_featurs.utils.utils import parse_column_name
 
 
+def _as_comparable(column: ColumnNameOrSpec) -> pl.Expr:
+    expr = pl.col(parse_column_name(column))
+    if isinstance(column, ColumnSpecification) and column.column_type in (ColumnType.NOMINAL, ColumnType.ORDINAL):
+        return expr.cast(pl.String)
+    return expr
+
+
 class ComparisonTransformer(Transformer, ABC):
     def __init__(self, left_column: ColumnNameOrSpec, right_column: ColumnNameOrSpec) -> None:
         self._left_column = parse_column_name(left_column)
         self._right_column = parse_column_name(right_column)
+        self._left = _as_comparable(left_column)
+        self._right = _as_comparable(right_column)
 
     def input_type(self) -> tuple[ColumnTypeSelector, ColumnTypeSelector]:
         return ColumnTypeSelector.any(), ColumnTypeSelector.any()
@@ -28,10 +38,10 @@ class EqualTransformer(ComparisonTransformer):
         return True
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._left_column) == pl.col(self._right_column)
+        return self._left == self._right
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_equal_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_equal_{self._right_column}'
 
 
 class GreaterThanTransformer(ComparisonTransformer):
@@ -40,10 +50,10 @@ class GreaterThanTransformer(ComparisonTransformer):
         return False
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._left_column) > pl.col(self._right_column)
+        return self._left > self._right
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_greater_than_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_greater_than_{self._right_column}'
 
 
 class GreaterOrEqualTransformer(ComparisonTransformer):
@@ -52,10 +62,10 @@ class GreaterOrEqualTransformer(ComparisonTransformer):
         return False
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._left_column) >= pl.col(self._right_column)
+        return self._left >= self._right
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_greater_or_equal_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_greater_or_equal_{self._right_column}'
 
 
 class Comparisons(Enum):
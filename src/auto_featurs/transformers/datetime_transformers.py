@@ -55,8 +55,8 @@ class HourOfDayTransformer(SeasonalTransformer):
             res = res.mul(2 * math.pi).truediv(24)
         return self._gon_transform(res)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_hour_of_day' + self._suffix())
+    def _output_name(self) -> str:
+        return f'{self._column}_hour_of_day' + self._suffix()
 
 
 class DayOfWeekTransformer(SeasonalTransformer):
@@ -66,8 +66,8 @@ class DayOfWeekTransformer(SeasonalTransformer):
             res = res.sub(1).mul(2 * math.pi).truediv(7)
         return self._gon_transform(res)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_day_of_week' + self._suffix())
+    def _output_name(self) -> str:
+        return f'{self._column}_day_of_week' + self._suffix()
 
 
 class MonthOfYearTransformer(SeasonalTransformer):
@@ -77,8 +77,8 @@ class MonthOfYearTransformer(SeasonalTransformer):
             res = res.sub(1).mul(2 * math.pi).truediv(12)
         return self._gon_transform(res)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_month_of_year' + self._suffix())
+    def _output_name(self) -> str:
+        return f'{self._column}_month_of_year' + self._suffix()
 
 
 class SeasonalOperation(Enum):
@@ -113,7 +113,7 @@ class TimeDiffTransformer(Transformer):
             case 'd':
                 return diff.dt.total_days()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         unit_str: str = ''
         match self._unit:
             case 's':
@@ -125,4 +125,4 @@ class TimeDiffTransformer(Transformer):
             case _:
                 assert_never(self._unit)
 
-        return transform.alias(f'{self._left_column}_total_{unit_str}_diff_{self._right_column}')
+        return f'{self._left_column}_total_{unit_str}_diff_{self._right_column}'
@@ -1,5 +1,7 @@
 import math
 from abc import ABC
+from abc import abstractmethod
+from collections.abc import Mapping
 from enum import Enum
 
 import polars as pl
@@ -7,6 +9,7 @@ import polars as pl
 from auto_featurs.base.column_specification import ColumnNameOrSpec
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
+from auto_featurs.transformers.base import ExecutionKind
 from auto_featurs.transformers.base import Transformer
 from auto_featurs.utils.utils import parse_column_name
 
@@ -34,8 +37,8 @@ class PolynomialTransformer(NumericTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._column).pow(self._degree)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.name.suffix(f'_pow_{self._degree}')
+    def _output_name(self) -> str:
+        return f'{self._column}_pow_{self._degree}'
 
 
 class LogTransformer(NumericTransformer):
@@ -46,25 +49,25 @@ class LogTransformer(NumericTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._column).log(self._base)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _output_name(self) -> str:
         suffix = '_ln' if self._base == math.e else f'_log{self._base}'
-        return transform.name.suffix(suffix)
+        return self._column + suffix
 
 
 class SinTransformer(NumericTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._column).sin()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.name.suffix('_sin')
+    def _output_name(self) -> str:
+        return f'{self._column}_sin'
 
 
 class CosTransformer(NumericTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._column).cos()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.name.suffix('_cos')
+    def _output_name(self) -> str:
+        return f'{self._column}_cos'
 
 
 class Goniometric(Enum):
@@ -72,22 +75,44 @@ class Goniometric(Enum):
     COS = CosTransformer
 
 
-class StandardScaler(NumericTransformer):
+class ScalingTransformer(NumericTransformer, ABC):
+    def execution_kind(self) -> ExecutionKind:
+        return ExecutionKind.WINDOW
+
+    @abstractmethod
+    def statistics(self) -> dict[str, pl.Expr]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def transform_from_statistics(self, statistics: Mapping[str, pl.Expr]) -> pl.Expr:
+        raise NotImplementedError
+
     def _transform(self) -> pl.Expr:
+        return self.transform_from_statistics(self.statistics())
+
+
+class StandardScaler(ScalingTransformer):
+    def statistics(self) -> dict[str, pl.Expr]:
         col = pl.col(self._column)
-        return (col - col.mean()) / col.std()
+        return {'mean': col.mean(), 'std': col.std()}
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_standard_scaled')
+    def transform_from_statistics(self, statistics: Mapping[str, pl.Expr]) -> pl.Expr:
+        return (pl.col(self._column) - statistics['mean']) / statistics['std']
 
+    def _output_name(self) -> str:
+        return f'{self._column}_standard_scaled'
 
-class MinMaxScaler(NumericTransformer):
-    def _transform(self) -> pl.Expr:
+
+class MinMaxScaler(ScalingTransformer):
+    def statistics(self) -> dict[str, pl.Expr]:
         col = pl.col(self._column)
-        return (col - col.min()) / (col.max() - col.min())
+        return {'min': col.min(), 'max': col.max()}
+
+    def transform_from_statistics(self, statistics: Mapping[str, pl.Expr]) -> pl.Expr:
+        return (pl.col(self._column) - statistics['min']) / (statistics['max'] - statistics['min'])
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_minmax_scaled')
+    def _output_name(self) -> str:
+        return f'{self._column}_minmax_scaled'
 
 
 class Scaling(Enum):
@@ -115,8 +140,8 @@ class AddTransformer(ArithmeticTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._left_column) + pl.col(self._right_column)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_add_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_add_{self._right_column}'
 
 
 class SubtractTransformer(ArithmeticTransformer):
@@ -127,8 +152,8 @@ class SubtractTransformer(ArithmeticTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._left_column) - pl.col(self._right_column)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_subtract_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_subtract_{self._right_column}'
 
 
 class MultiplyTransformer(ArithmeticTransformer):
@@ -139,8 +164,8 @@ class MultiplyTransformer(ArithmeticTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._left_column) * pl.col(self._right_column)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_multiply_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_multiply_{self._right_column}'
 
 
 class DivideTransformer(ArithmeticTransformer):
@@ -151,8 +176,8 @@ class DivideTransformer(ArithmeticTransformer):
     def _transform(self) -> pl.Expr:
         return pl.col(self._left_column) / pl.col(self._right_column)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_divide_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_divide_{self._right_column}'
 
 
 class ArithmeticOperation(Enum):
@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 from collections.abc import Iterable
+from collections.abc import Mapping
 from typing import Any
 
 import polars as pl
@@ -7,13 +10,34 @@ from auto_featurs.base.column_specification import ColumnNameOrSpec
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
+from auto_featurs.transformers.aggregating_transformers import OverKeys
+from auto_featurs.transformers.aggregating_transformers import partition_columns
 from auto_featurs.utils.utils import get_names_from_column_specs
 
 
 class OverWrapper[AT: AggregatingTransformer](AggregatingTransformer):
-    def __init__(self, inner_transformer: AT, over_columns: Iterable[ColumnNameOrSpec], *args: Any) -> None:
+    def __init__(self, inner_transformer: AT, over_columns: Iterable[ColumnNameOrSpec], *args: Any, order_by: Iterable[ColumnNameOrSpec] = ()) -> None:
         self._inner_transformer = inner_transformer
         self._over_columns: list[str] = get_names_from_column_specs(over_columns)
+        self._order_by: list[str] = get_names_from_column_specs(order_by)
+
+    @property
+    def inner_transformer(self) -> AT:
+        return self._inner_transformer
+
+    @property
+    def over_columns(self) -> list[str]:
+        return self._over_columns
+
+    @property
+    def order_by(self) -> list[str]:
+        return self._order_by
+
+    def with_inner_transformer[NT: AggregatingTransformer](self, inner_transformer: NT) -> OverWrapper[NT]:
+        return OverWrapper(inner_transformer=inner_transformer, over_columns=self._over_columns, order_by=self._order_by)
+
+    def with_order_by(self, order_by: Iterable[ColumnNameOrSpec]) -> OverWrapper[AT]:
+        return OverWrapper(inner_transformer=self._inner_transformer, over_columns=self._over_columns, order_by=order_by)
 
     def input_type(self) -> ColumnTypeSelector | tuple[ColumnTypeSelector, ...]:
         return self._inner_transformer.input_type()
@@ -22,13 +46,31 @@ class OverWrapper[AT: AggregatingTransformer](AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def is_order_dependent(self) -> bool:
+        return self._inner_transformer.is_order_dependent()
+
+    def input_column_names(self) -> set[str]:
+        return super().input_column_names() | self._inner_transformer.input_column_names()
+
     def _return_type(self) -> ColumnType:
         return self._inner_transformer.output_column_specification.column_type
 
+    def partitions(self) -> list[OverKeys]:
+        own_partitions = [tuple(self._over_columns)] if self._over_columns else []
+        return [*own_partitions, *self._inner_transformer.partitions()]
+
     def _transform(self) -> pl.Expr:
-        agg_expr = self._inner_transformer.transform()
-        return agg_expr.over(self._over_columns)
+        return self._over(self._inner_transformer.transform(), self._over_columns)
+
+    def _transform_over_group_ids(self, group_ids: Mapping[OverKeys, str]) -> pl.Expr:
+        agg_expr = self._inner_transformer.transform_over_group_ids(group_ids)
+        return self._over(agg_expr, partition_columns(tuple(self._over_columns), group_ids) if self._over_columns else [])
+
+    def _over(self, agg_expr: pl.Expr, over_columns: list[str]) -> pl.Expr:
+        if self._order_by:
+            return agg_expr.over(over_columns or None, order_by=self._order_by)
+        return agg_expr.over(over_columns)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        over_name = '_over_' + '_and_'.join(self._over_columns)
-        return transform.name.suffix(over_name)
+    def _output_name(self) -> str:
+        over_name = '_over_' + '_and_'.join(self._over_columns) if self._over_columns else ''
+        return self._inner_transformer.output_column_specification.name + over_name
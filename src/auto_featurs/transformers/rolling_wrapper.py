@@ -1,5 +1,9 @@
+from __future__ import annotations
+
 from datetime import timedelta
+from functools import cached_property
 from typing import Any
+from typing import Optional
 
 import polars as pl
 
@@ -7,9 +11,114 @@ from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
 from auto_featurs.base.column_specification import ColumnTypeSelector
 from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
+from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregationTransformer
+from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import MaxTransformer
+from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import MinTransformer
+from auto_featurs.transformers.aggregating_transformers import Moment
+from auto_featurs.transformers.aggregating_transformers import MomentAggregationTransformer
+from auto_featurs.transformers.aggregating_transformers import StdTransformer
+from auto_featurs.transformers.aggregating_transformers import SumTransformer
 from auto_featurs.utils.utils import format_timedelta
 
 
+class _RollingKernels:
+    def __init__(self, index_column: str, time_window: str | timedelta) -> None:
+        self._index_column = index_column
+        self._time_window = time_window
+
+    def build(self, transformer: AggregatingTransformer) -> Optional[pl.Expr]:
+        if not transformer.is_scalar_aggregation():
+            return None
+
+        match transformer:
+            case CountTransformer():
+                return self._count(transformer.filtering_condition)
+            case SumTransformer():
+                return self._sum(transformer)
+            case MinTransformer() | MaxTransformer():
+                return self._extreme(transformer, minimum=isinstance(transformer, MinTransformer))
+            case MeanTransformer():
+                return self._mean(transformer)
+            case StdTransformer():
+                return self._std(transformer)
+            case MomentAggregationTransformer():
+                return self._from_moments(transformer)
+            case _:
+                return None
+
+    def _rolling_sum(self, expr: pl.Expr) -> pl.Expr:
+        return expr.rolling_sum_by(self._index_column, window_size=self._time_window)
+
+    def _count(self, filtering_condition: Optional[pl.Expr]) -> pl.Expr:
+        in_count = pl.col(self._index_column).is_not_null()
+        if filtering_condition is not None:
+            in_count = in_count & filtering_condition.fill_null(False)
+        return self._rolling_sum(in_count.cast(pl.UInt32))
+
+    @staticmethod
+    def _is_valid(transformer: ArithmeticAggregationTransformer) -> pl.Expr:
+        return transformer.filtering_condition.fill_null(False) & pl.col(transformer.column).is_not_null()
+
+    def _sum(self, transformer: ArithmeticAggregationTransformer) -> pl.Expr:
+        values = pl.when(self._is_valid(transformer)).then(pl.col(transformer.column)).fill_null(strategy='zero')
+        return pl.when(self._valid_count(transformer) > 0).then(self._rolling_sum(values)).otherwise(0)
+
+    def _valid_count(self, transformer: ArithmeticAggregationTransformer) -> pl.Expr:
+        return self._rolling_sum(self._is_valid(transformer).cast(pl.UInt32))
+
+    def _num_rows(self) -> pl.Expr:
+        return self._rolling_sum(pl.col(self._index_column).is_not_null().cast(pl.UInt32))
+
+    def _centered(self, transformer: ArithmeticAggregationTransformer) -> tuple[pl.Expr, pl.Expr]:
+        col = pl.col(transformer.column).cast(pl.Float64)
+        is_valid = self._is_valid(transformer)
+        reference = col.filter(is_valid & ~col.is_nan()).mean().fill_null(0.0)
+        return pl.when(is_valid).then(col - reference).otherwise(0.0), reference
+
+    def _mean(self, transformer: ArithmeticAggregationTransformer) -> pl.Expr:
+        centered, reference = self._centered(transformer)
+        count = self._count(transformer.filtering_condition)
+        centered_mean = centered.rolling_mean_by(self._index_column, window_size=self._time_window)
+        return reference * (self._valid_count(transformer) / count) + centered_mean * (self._num_rows() / count)
+
+    def _std(self, transformer: ArithmeticAggregationTransformer) -> pl.Expr:
+        centered, _ = self._centered(transformer)
+        num_rows = self._num_rows()
+        valid_count = self._valid_count(transformer)
+        centered_sum = self._rolling_sum(centered)
+        sum_of_squared_deviations = (
+            centered.rolling_var_by(self._index_column, window_size=self._time_window).fill_null(0.0) * (num_rows - 1)
+            + centered_sum.pow(2) * (1 / num_rows - 1 / valid_count)
+        )
+        return pl.when(valid_count > 1).then((sum_of_squared_deviations / (valid_count - 1)).clip(lower_bound=0.0).sqrt())
+
+    def _extreme(self, transformer: ArithmeticAggregationTransformer, minimum: bool) -> pl.Expr:
+        col = pl.col(transformer.column)
+        is_nan = col.cast(pl.Float64).is_nan()
+        is_valid = self._is_valid(transformer)
+        is_comparable = is_valid & ~is_nan
+
+        neutral_value = (col.max() if minimum else col.min()).fill_null(strategy='zero')
+        values = pl.when(is_comparable).then(col).otherwise(neutral_value)
+        extreme = values.rolling_min_by(self._index_column, window_size=self._time_window) if minimum else values.rolling_max_by(self._index_column, window_size=self._time_window)
+
+        return (
+            pl.when(self._rolling_sum(is_comparable.cast(pl.UInt32)) > 0).then(extreme)
+            .when(self._rolling_sum(is_valid.cast(pl.UInt32)) > 0).then(col.filter(is_nan).first())
+        )
+
+    def _from_moments(self, transformer: MomentAggregationTransformer) -> Optional[pl.Expr]:
+        moments: dict[Moment, pl.Expr] = {}
+        for moment, moment_transformer in transformer.moments().items():
+            moment_kernel = self.build(moment_transformer)
+            if moment_kernel is None:
+                return None
+            moments[moment] = moment_kernel
+        return transformer.transform_from_moments(moments)
+
+
 class RollingWrapper[AT: AggregatingTransformer](AggregatingTransformer):
     def __init__(self, inner_transformer: AT, index_column: ColumnSpecification, time_window: str | timedelta, *args: Any) -> None:
         if index_column.column_type != ColumnType.DATETIME:
@@ -19,6 +128,25 @@ class RollingWrapper[AT: AggregatingTransformer](AggregatingTransformer):
         self._index_column = index_column
         self._time_window = time_window
 
+    @property
+    def inner_transformer(self) -> AT:
+        return self._inner_transformer
+
+    @property
+    def index_column(self) -> ColumnSpecification:
+        return self._index_column
+
+    @property
+    def time_window(self) -> str | timedelta:
+        return self._time_window
+
+    @cached_property
+    def uses_native_kernel(self) -> bool:
+        return self._native_kernel() is not None
+
+    def with_inner_transformer[NT: AggregatingTransformer](self, inner_transformer: NT) -> RollingWrapper[NT]:
+        return RollingWrapper(inner_transformer=inner_transformer, index_column=self._index_column, time_window=self._time_window)
+
     def input_type(self) -> ColumnTypeSelector | tuple[ColumnTypeSelector, ...]:
         return self._inner_transformer.input_type()
 
@@ -26,13 +154,23 @@ class RollingWrapper[AT: AggregatingTransformer](AggregatingTransformer):
     def is_commutative(cls) -> bool:
         return True
 
+    def input_column_names(self) -> set[str]:
+        return super().input_column_names() | self._inner_transformer.input_column_names() | {self._index_column.name}
+
     def _return_type(self) -> ColumnType:
         return self._inner_transformer.output_column_specification.column_type
 
     def _transform(self) -> pl.Expr:
+        native_kernel = self._native_kernel()
+        if native_kernel is not None:
+            return native_kernel.alias(self._inner_transformer.output_column_specification.name)
+
         agg_expr = self._inner_transformer.transform()
         return agg_expr.last().rolling(index_column=self._index_column.name, period=self._time_window)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
+    def _native_kernel(self) -> Optional[pl.Expr]:
+        return _RollingKernels(self._index_column.name, self._time_window).build(self._inner_transformer)
+
+    def _output_name(self) -> str:
         time_window = format_timedelta(self._time_window) if isinstance(self._time_window, timedelta) else self._time_window
-        return transform.name.suffix(f'_in_the_last_{time_window}')
+        return f'{self._inner_transformer.output_column_specification.name}_in_the_last_{time_window}'
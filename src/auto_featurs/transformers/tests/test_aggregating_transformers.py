@@ -1,6 +1,7 @@
 import numpy as np
 import polars as pl
 import pytest
+from polars.testing import assert_frame_equal
 
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.base.column_specification import ColumnType
@@ -17,6 +18,7 @@ from auto_featurs.transformers.aggregating_transformers import MeanTransformer
 from auto_featurs.transformers.aggregating_transformers import MedianTransformer
 from auto_featurs.transformers.aggregating_transformers import MinTransformer
 from auto_featurs.transformers.aggregating_transformers import ModeTransformer
+from auto_featurs.transformers.aggregating_transformers import MomentAggregationTransformer
 from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
 from auto_featurs.transformers.aggregating_transformers import PointwiseMutualInformationTransformer
 from auto_featurs.transformers.aggregating_transformers import StdTransformer
@@ -429,6 +431,20 @@ class TestArithmeticAggregationTransformers:
         df = BASIC_FRAME.with_columns(transformer.transform())
         assert_new_columns_in_frame(original_frame=BASIC_FRAME, new_frame=df, expected_new_columns=expected_new_columns)
 
+    @pytest.mark.parametrize('transformer_type', [SumTransformer, MeanTransformer, StdTransformer, ZscoreTransformer])
+    @pytest.mark.parametrize('cumulative', [CumulativeOptions.NONE, CumulativeOptions.EXCLUSIVE, CumulativeOptions.INCLUSIVE])
+    def test_transform_from_moments_matches_transform(self, transformer_type: type[MomentAggregationTransformer], cumulative: CumulativeOptions) -> None:
+        transformer = transformer_type(column='NUMERIC_FEATURE', cumulative=cumulative)
+        moments = {moment: moment_transformer.transform() for moment, moment_transformer in transformer.moments().items()}
+
+        expected = BASIC_FRAME.select(transformer.transform())
+        res = BASIC_FRAME.select(transformer.transform_from_moments(moments).alias(transformer.output_column_specification.name))
+
+        assert_frame_equal(res, expected, check_dtypes=False)
+
+    def test_min_has_no_moments(self) -> None:
+        assert not isinstance(MinTransformer(column='NUMERIC_FEATURE'), MomentAggregationTransformer)
+
 
 class TestArgMinTransformer:
     def setup_method(self) -> None:
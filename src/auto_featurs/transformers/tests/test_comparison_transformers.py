@@ -1,5 +1,7 @@
+import polars as pl
 import pytest
 
+from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.transformers.comparison_transformers import ComparisonTransformer
 from auto_featurs.transformers.comparison_transformers import EqualTransformer
 from auto_featurs.transformers.comparison_transformers import GreaterOrEqualTransformer
@@ -34,3 +36,19 @@ class TestComparisonTransformers:
         transformer = transformer_type(left_column='NUMERIC_FEATURE_2', right_column='NUMERIC_FEATURE')
         df = BASIC_FRAME.with_columns(transformer.transform())
         assert_new_columns_in_frame(original_frame=BASIC_FRAME, new_frame=df, expected_new_columns=expected_new_columns)
+
+    def test_comparison_of_differently_encoded_categorical_columns(self) -> None:
+        df = pl.DataFrame({'left': ['a', 'c', 'b'], 'right': ['a', 'b', 'c']}).with_columns(
+            pl.col('left').cast(pl.Enum(['a', 'b', 'c'])),
+            pl.col('right').cast(pl.Enum(['a', 'b', 'c', 'd'])),
+        )
+        left_column = ColumnSpecification.nominal(name='left')
+        right_column = ColumnSpecification.ordinal(name='right')
+
+        new_df = df.with_columns(
+            EqualTransformer(left_column=left_column, right_column=right_column).transform(),
+            GreaterThanTransformer(left_column=left_column, right_column=right_column).transform(),
+        )
+
+        assert new_df['left_equal_right'].to_list() == [True, False, False]
+        assert new_df['left_greater_than_right'].to_list() == [False, True, False]
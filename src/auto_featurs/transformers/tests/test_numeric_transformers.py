@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from auto_featurs.transformers.base import ExecutionKind
 from auto_featurs.transformers.numeric_transformers import AddTransformer
 from auto_featurs.transformers.numeric_transformers import ArithmeticTransformer
 from auto_featurs.transformers.numeric_transformers import CosTransformer
@@ -107,6 +108,11 @@ class TestScalers:
             },
         )
 
+    def test_scalers_are_window_based(self) -> None:
+        assert self._standard_scaler.execution_kind() == ExecutionKind.WINDOW
+        assert self._min_max_scaler.execution_kind() == ExecutionKind.WINDOW
+        assert PolynomialTransformer(column='NUMERIC_FEATURE', degree=2).execution_kind() == ExecutionKind.ROW_LOCAL
+
 
 class TestArithmeticTransformers:
     @pytest.mark.parametrize(
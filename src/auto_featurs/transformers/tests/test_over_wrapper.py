@@ -81,6 +81,24 @@ class TestOverWrapper:
             },
         )
 
+    def test_ordered_lagged_transform(self) -> None:
+        lagged_1_transformer = LaggedTransformer(column=ColumnSpecification.numeric(name='NUMERIC_FEATURE'), lag=1)
+        ordered_over_grouping_num_transformer = OverWrapper(inner_transformer=lagged_1_transformer, over_columns=self._num_group, order_by=['NUMERIC_FEATURE_2'])
+        ordered_transformer = OverWrapper(inner_transformer=lagged_1_transformer, over_columns=[], order_by=['NUMERIC_FEATURE_2'])
+
+        df = BASIC_FRAME.with_columns(ordered_over_grouping_num_transformer.transform(), ordered_transformer.transform())
+
+        assert_new_columns_in_frame(
+            original_frame=BASIC_FRAME,
+            new_frame=df,
+            expected_new_columns={
+                'NUMERIC_FEATURE_lagged_1_over_GROUPING_FEATURE_NUM': [None, 3, 4, 5, None, None],
+                'NUMERIC_FEATURE_lagged_1': [1, 2, 3, 4, 5, None],
+            },
+        )
+        assert 'NUMERIC_FEATURE_2' in ordered_over_grouping_num_transformer.input_column_names()
+        assert str(ordered_over_grouping_num_transformer.transform()).count('.over(') == 1
+
     def test_grouped_first_value_transform(self) -> None:
         first_value_transformer = FirstValueTransformer(column=ColumnSpecification.numeric(name='NUMERIC_FEATURE'))
         first_value_over_grouping_num_transformer = OverWrapper(inner_transformer=first_value_transformer, over_columns=self._num_group)
@@ -223,3 +241,22 @@ class TestOverWrapper:
             new_frame=df,
             expected_new_columns={'NUMERIC_FEATURE_first_value_in_the_last_2d1h_over_GROUPING_FEATURE_NUM': [0, 1, 2, 1, 2, 3]},
         )
+
+    def test_with_inner_transformer(self) -> None:
+        sum_over_transformer = OverWrapper(inner_transformer=SumTransformer(column='NUMERIC_FEATURE'), over_columns=self._num_group)
+
+        mean_over_transformer = sum_over_transformer.with_inner_transformer(MeanTransformer(column='NUMERIC_FEATURE'))
+
+        assert mean_over_transformer.over_columns == self._num_group
+        assert mean_over_transformer.output_column_specification.name == 'NUMERIC_FEATURE_mean_over_GROUPING_FEATURE_NUM'
+
+    def test_output_name_is_declared_without_building_expressions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fail_to_build(self: SumTransformer) -> None:
+            raise AssertionError('Expression was built.')
+
+        monkeypatch.setattr(SumTransformer, '_transform', fail_to_build)
+        monkeypatch.setattr(OverWrapper, '_transform', fail_to_build)
+
+        transformer = OverWrapper(inner_transformer=SumTransformer(column='NUMERIC_FEATURE'), over_columns=self._num_cat_group)
+
+        assert transformer.output_column_specification == ColumnSpecification.numeric(name='NUMERIC_FEATURE_sum_over_GROUPING_FEATURE_NUM_and_GROUPING_FEATURE_CAT_2')
@@ -1,10 +1,21 @@
+from datetime import UTC
+from datetime import datetime
+from typing import Optional
+
+import polars as pl
 import pytest
+from polars.testing import assert_frame_equal
 
 from auto_featurs.base.column_specification import ColumnSpecification
+from auto_featurs.transformers.aggregating_transformers import AggregatingTransformer
 from auto_featurs.transformers.aggregating_transformers import ArithmeticAggregationTransformer
 from auto_featurs.transformers.aggregating_transformers import CountTransformer
+from auto_featurs.transformers.aggregating_transformers import CumulativeOptions
 from auto_featurs.transformers.aggregating_transformers import FirstValueTransformer
+from auto_featurs.transformers.aggregating_transformers import MaxTransformer
 from auto_featurs.transformers.aggregating_transformers import MeanTransformer
+from auto_featurs.transformers.aggregating_transformers import MedianTransformer
+from auto_featurs.transformers.aggregating_transformers import MinTransformer
 from auto_featurs.transformers.aggregating_transformers import ModeTransformer
 from auto_featurs.transformers.aggregating_transformers import NumUniqueTransformer
 from auto_featurs.transformers.aggregating_transformers import StdTransformer
@@ -102,3 +113,122 @@ class TestRollingWrapper:
             new_frame=df,
             expected_new_columns={'NUMERIC_FEATURE_first_value_over_GROUPING_FEATURE_NUM_in_the_last_2d1h': [0, 1, 2, 1, 2, 3]},
         )
+
+    def test_with_inner_transformer(self) -> None:
+        sum_rolling_transformer = RollingWrapper(inner_transformer=SumTransformer(column='NUMERIC_FEATURE'), index_column=self._index_col, time_window=self._time_window)
+
+        mean_rolling_transformer = sum_rolling_transformer.with_inner_transformer(MeanTransformer(column='NUMERIC_FEATURE'))
+
+        assert mean_rolling_transformer.index_column == self._index_col
+        assert mean_rolling_transformer.time_window == self._time_window
+        assert mean_rolling_transformer.output_column_specification.name == 'NUMERIC_FEATURE_mean_in_the_last_2d1h'
+
+    @pytest.mark.parametrize(
+        ('inner_transformer', 'uses_native_kernel'),
+        [
+            (CountTransformer(), True),
+            (CountTransformer(filtering_condition=pl.col('BOOL_FEATURE')), True),
+            (SumTransformer(column='NUMERIC_FEATURE'), True),
+            (MeanTransformer(column='NUMERIC_FEATURE', filtering_condition=pl.col('BOOL_FEATURE')), True),
+            (StdTransformer(column='NUMERIC_FEATURE'), True),
+            (MinTransformer(column='NUMERIC_FEATURE'), True),
+            (MaxTransformer(column='NUMERIC_FEATURE'), True),
+            (CountTransformer(cumulative=CumulativeOptions.INCLUSIVE), False),
+            (SumTransformer(column='NUMERIC_FEATURE', cumulative=CumulativeOptions.EXCLUSIVE), False),
+            (MedianTransformer(column='NUMERIC_FEATURE'), False),
+            (ZscoreTransformer(column='NUMERIC_FEATURE'), False),
+            (OverWrapper(inner_transformer=SumTransformer(column='NUMERIC_FEATURE'), over_columns=['GROUPING_FEATURE_NUM']), False),
+        ],
+    )
+    def test_uses_native_kernel(self, inner_transformer: AggregatingTransformer, uses_native_kernel: bool) -> None:
+        rolling_transformer = RollingWrapper(inner_transformer=inner_transformer, index_column=self._index_col, time_window=self._time_window)
+
+        assert rolling_transformer.uses_native_kernel == uses_native_kernel
+
+    def test_input_column_names_include_index_column(self) -> None:
+        mode_transformer = ModeTransformer(column=ColumnSpecification.ordinal(name='GROUPING_FEATURE_CAT_2'))
+        mode_rolling_transformer = RollingWrapper(inner_transformer=mode_transformer, index_column=self._index_col, time_window=self._time_window)
+        grouped_transformer = OverWrapper(inner_transformer=mode_rolling_transformer, over_columns=['GROUPING_FEATURE_NUM'])
+
+        assert mode_rolling_transformer.input_column_names() == {'GROUPING_FEATURE_CAT_2', 'DATE_FEATURE'}
+        assert grouped_transformer.input_column_names() == {'GROUPING_FEATURE_CAT_2', 'DATE_FEATURE', 'GROUPING_FEATURE_NUM'}
+
+
+class TestRollingNativeKernels:
+    def setup_method(self) -> None:
+        self._index_col = ColumnSpecification.datetime(name='DATE_FEATURE')
+        self._frame = pl.LazyFrame({
+            'DATE_FEATURE': [datetime(year=2_000, month=1, day=day, tzinfo=UTC) for day in (1, 2, 2, 3, 3, 5, 6, 6, 9)],
+            'GROUPING_FEATURE_NUM': ['A', 'B', 'A', 'A', None, 'B', None, 'A', 'A'],
+            'NUMERIC_FEATURE': [1, 2, 3, None, 5, 6, 7, 8, None],
+            'FLOAT_FEATURE': [1.5, -2.0, 3.0, None, 5.0, 6.0, 0.5, 8.0, None],
+            'BOOL_FEATURE': [True, False, None, True, True, False, True, False, None],
+        })
+
+    @pytest.mark.parametrize('inner_transformer_type', [SumTransformer, MeanTransformer, StdTransformer, MinTransformer, MaxTransformer])
+    @pytest.mark.parametrize('column', ['NUMERIC_FEATURE', 'FLOAT_FEATURE', 'BOOL_FEATURE'])
+    @pytest.mark.parametrize('filtering_condition', [None, pl.col('NUMERIC_FEATURE') > 2])
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    @pytest.mark.parametrize('time_window', ['1d', '3d12h'])
+    def test_native_kernel_matches_rolling_context(
+            self,
+            inner_transformer_type: type[ArithmeticAggregationTransformer],
+            column: str,
+            filtering_condition: Optional[pl.Expr],
+            over_columns: list[str],
+            time_window: str,
+    ) -> None:
+        self._assert_matches_rolling_context(inner_transformer_type(column=column, filtering_condition=filtering_condition), over_columns, time_window)
+
+    @pytest.mark.parametrize('filtering_condition', [None, pl.col('BOOL_FEATURE')])
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    def test_count_native_kernel_matches_rolling_context(self, filtering_condition: Optional[pl.Expr], over_columns: list[str]) -> None:
+        self._assert_matches_rolling_context(CountTransformer(filtering_condition=filtering_condition), over_columns, '2d')
+
+    @pytest.mark.parametrize('inner_transformer_type', [MeanTransformer, StdTransformer])
+    @pytest.mark.parametrize('filtering_condition', [None, pl.col('NUMERIC_FEATURE') > 2])
+    @pytest.mark.parametrize('over_columns', [[], ['GROUPING_FEATURE_NUM']])
+    def test_moment_native_kernels_are_stable_for_large_values(
+            self,
+            inner_transformer_type: type[ArithmeticAggregationTransformer],
+            filtering_condition: Optional[pl.Expr],
+            over_columns: list[str],
+    ) -> None:
+        self._frame = self._frame.with_columns(pl.col('NUMERIC_FEATURE').mul(0.1).add(1e9).alias('FLOAT_FEATURE'))
+
+        self._assert_matches_rolling_context(inner_transformer_type(column='FLOAT_FEATURE', filtering_condition=filtering_condition), over_columns, '3d12h')
+
+    @pytest.mark.parametrize('inner_transformer_type', [MeanTransformer, StdTransformer])
+    def test_moment_native_kernels_propagate_nan(self, inner_transformer_type: type[ArithmeticAggregationTransformer]) -> None:
+        self._frame = self._frame.with_columns(pl.when(pl.col('NUMERIC_FEATURE') == 3).then(float('nan')).otherwise(pl.col('FLOAT_FEATURE')).alias('FLOAT_FEATURE'))
+
+        self._assert_matches_rolling_context(inner_transformer_type(column='FLOAT_FEATURE'), [], '1d')
+
+    def test_min_native_kernel_ignores_nan(self) -> None:
+        frame = pl.LazyFrame({
+            'DATE_FEATURE': [datetime(year=2_000, month=1, day=day, tzinfo=UTC) for day in range(1, 6)],
+            'FLOAT_FEATURE': [1.0, float('nan'), 0.5, float('nan'), float('nan')],
+        })
+        min_rolling_transformer = RollingWrapper(inner_transformer=MinTransformer(column='FLOAT_FEATURE'), index_column=self._index_col, time_window='2d')
+
+        df = frame.with_columns(min_rolling_transformer.transform())
+
+        assert_new_columns_in_frame(
+            original_frame=frame,
+            new_frame=df,
+            expected_new_columns={'FLOAT_FEATURE_min_in_the_last_2d': [1.0, 1.0, 0.5, 0.5, float('nan')]},
+        )
+
+    def _assert_matches_rolling_context(self, inner_transformer: AggregatingTransformer, over_columns: list[str], time_window: str) -> None:
+        rolling_transformer = RollingWrapper(inner_transformer=inner_transformer, index_column=self._index_col, time_window=time_window)
+        rolling_context_expr = inner_transformer.transform().last().rolling(index_column=self._index_col.name, period=time_window)
+        transformer: AggregatingTransformer = rolling_transformer
+        if over_columns:
+            transformer = OverWrapper(inner_transformer=rolling_transformer, over_columns=over_columns)
+            rolling_context_expr = rolling_context_expr.over(over_columns)
+
+        assert rolling_transformer.uses_native_kernel
+        assert_frame_equal(
+            self._frame.select(transformer.transform()),
+            self._frame.select(rolling_context_expr.alias(transformer.output_column_specification.name)),
+        )
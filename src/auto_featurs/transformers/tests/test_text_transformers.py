@@ -64,6 +64,16 @@ class TestTextExtractionTransformers:
             expected_new_columns={'TEXT_FEATURE_length_chars': [20, 10, 9, 14]},
         )
 
+    def test_text_length_transformer_on_categorical_column(self) -> None:
+        transformer = TextLengthTransformer(column='TEXT_FEATURE')
+        frame = self._frame.with_columns(pl.col('TEXT_FEATURE').cast(pl.Categorical))
+        df = frame.with_columns(transformer.transform())
+        assert_new_columns_in_frame(
+            original_frame=frame,
+            new_frame=df,
+            expected_new_columns={'TEXT_FEATURE_length_chars': [20, 10, 9, 14]},
+        )
+
     def test_email_domain_extraction_transformers(self) -> None:
         transformer = EmailDomainExtractionTransformer(column='EMAIL')
         df = self._frame.with_columns(transformer.transform())
@@ -14,6 +14,10 @@ from auto_featurs.transformers.base import Transformer
 from auto_featurs.utils.utils import parse_column_name
 
 
+def _as_text(column: str) -> pl.Expr:
+    return pl.col(column).cast(pl.String)
+
+
 class TextSimilarityTransformer(Transformer, ABC):
     def __init__(self, left_column: ColumnNameOrSpec, right_column: ColumnNameOrSpec, **kwargs: Any) -> None:
         self._left_column = parse_column_name(left_column)
@@ -28,8 +32,8 @@ class TextSimilarityTransformer(Transformer, ABC):
     def _return_type(self) -> ColumnType:
         return ColumnType.NUMERIC
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._left_column}_{self._dist_str}_text_similarity_{self._right_column}')
+    def _output_name(self) -> str:
+        return f'{self._left_column}_{self._dist_str}_text_similarity_{self._right_column}'
 
     @property
     @abstractmethod
@@ -43,7 +47,7 @@ class DamerauLevenshteinSimilarityTransformer(TextSimilarityTransformer):
         return True
 
     def _transform(self) -> pl.Expr:
-        return pds.str_d_leven(self._left_column, self._right_column, return_sim=True)
+        return pds.str_d_leven(_as_text(self._left_column), _as_text(self._right_column), return_sim=True)
 
     @property
     def _dist_str(self) -> str:
@@ -60,7 +64,7 @@ class JaccardSimilarityTransformer(TextSimilarityTransformer):
         return True
 
     def _transform(self) -> pl.Expr:
-        return pds.str_jaccard(self._left_column, self._right_column, substr_size=self._substr_size)
+        return pds.str_jaccard(_as_text(self._left_column), _as_text(self._right_column), substr_size=self._substr_size)
 
     @property
     def _dist_str(self) -> str:
@@ -73,7 +77,7 @@ class JaroSimilarityTransformer(TextSimilarityTransformer):
         return True
 
     def _transform(self) -> pl.Expr:
-        return pds.str_jaro(self._left_column, self._right_column)
+        return pds.str_jaro(_as_text(self._left_column), _as_text(self._right_column))
 
     @property
     def _dist_str(self) -> str:
@@ -90,7 +94,7 @@ class JaroWinklerSimilarityTransformer(TextSimilarityTransformer):
         return True
 
     def _transform(self) -> pl.Expr:
-        return pds.str_jw(self._left_column, self._right_column, weight=self._weight)
+        return pds.str_jw(_as_text(self._left_column), _as_text(self._right_column), weight=self._weight)
 
     @property
     def _dist_str(self) -> str:
@@ -121,10 +125,10 @@ class TextLengthTransformer(TextExtractionTransformer):
         return ColumnType.NUMERIC
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._column).str.len_chars()
+        return _as_text(self._column).str.len_chars()
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_length_chars')
+    def _output_name(self) -> str:
+        return f'{self._column}_length_chars'
 
 
 class EmailDomainExtractionTransformer(TextExtractionTransformer):
@@ -132,10 +136,10 @@ class EmailDomainExtractionTransformer(TextExtractionTransformer):
         return ColumnType.NOMINAL
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._column).str.extract(r'@(.+)$', 1)
+        return _as_text(self._column).str.extract(r'@(.+)$', 1)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_email_domain')
+    def _output_name(self) -> str:
+        return f'{self._column}_email_domain'
 
 
 class CharacterEntropyTransformer(TextExtractionTransformer):
@@ -144,7 +148,7 @@ class CharacterEntropyTransformer(TextExtractionTransformer):
 
     def _transform(self) -> pl.Expr:
         return (
-            pl.col(self._column)
+            _as_text(self._column)
             .str.split('')
             .list.eval(
                 pl.element()
@@ -154,8 +158,8 @@ class CharacterEntropyTransformer(TextExtractionTransformer):
             .list.first()
         )
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_character_entropy')
+    def _output_name(self) -> str:
+        return f'{self._column}_character_entropy'
 
 
 class TextExtraction(Enum):
@@ -184,10 +188,10 @@ class TextCountMatchesTransformer(TextExtractionTransformer):
         return ColumnType.NUMERIC
 
     def _transform(self) -> pl.Expr:
-        return pl.col(self._column).str.count_matches(self._regex)
+        return _as_text(self._column).str.count_matches(self._regex)
 
-    def _name(self, transform: pl.Expr) -> pl.Expr:
-        return transform.alias(f'{self._column}_count_{self._human_readable}')
+    def _output_name(self) -> str:
+        return f'{self._column}_count_{self._human_readable}'
 
     @staticmethod
     def _resolve_pattern(pattern: PatternInput) -> _ResolvedPattern:
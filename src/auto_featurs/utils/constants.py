@@ -5,3 +5,5 @@ SECONDS_IN_MONTH = 30 * SECONDS_IN_DAY
 SECONDS_IN_YEAR = 365 * SECONDS_IN_DAY
 
 INFINITY = float('inf')
+
+HIDDEN_COLUMN_PREFIX = '__auto_featurs_'
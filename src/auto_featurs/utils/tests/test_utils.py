@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 import polars as pl
+import pytest
 
 from auto_featurs.base.column_specification import ColumnSpecification
 from auto_featurs.utils.utils import default_true_filtering_condition
@@ -10,6 +11,7 @@ from auto_featurs.utils.utils import get_names_from_column_specs
 from auto_featurs.utils.utils import get_valid_param_options
 from auto_featurs.utils.utils import order_preserving_unique
 from auto_featurs.utils.utils import parse_column_name
+from auto_featurs.utils.utils import resolve_engine
 
 
 def test_parse_column_name() -> None:
@@ -64,3 +66,13 @@ def test_format_timedelta() -> None:
     assert format_timedelta(timedelta(hours=5, minutes=2, seconds=1)) == "5h2m1s"
     assert format_timedelta(timedelta(days=7, hours=5)) == "7d5h"
     assert format_timedelta(timedelta(days=37, hours=5)) == "1mo7d5h"
+
+
+def test_resolve_engine() -> None:
+    assert resolve_engine('auto', streaming=False) == 'auto'
+    assert resolve_engine('in-memory', streaming=False) == 'in-memory'
+    assert resolve_engine('auto', streaming=True) == 'streaming'
+    assert resolve_engine('streaming', streaming=True) == 'streaming'
+
+    with pytest.raises(ValueError, match="Cannot use streaming=True together with engine='in-memory'."):
+        resolve_engine('in-memory', streaming=True)
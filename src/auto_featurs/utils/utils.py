@@ -4,6 +4,7 @@ from datetime import timedelta
 from typing import Optional
 
 import polars as pl
+from polars._typing import EngineType
 
 from auto_featurs.base.column_specification import ColumnNameOrSpec
 from auto_featurs.base.column_specification import ColumnSpecification
@@ -32,6 +33,14 @@ def filtering_condition_to_string(filtering_condition: Optional[pl.Expr]) -> str
     return f'_where_{filtering_condition.meta.output_name()}'
 
 
+def resolve_engine(engine: EngineType, streaming: bool) -> EngineType:
+    if not streaming:
+        return engine
+    if engine not in {'auto', 'streaming'}:
+        raise ValueError(f'Cannot use streaming=True together with engine={engine!r}.')
+    return 'streaming'
+
+
 def order_preserving_unique[T](iterable: Iterable[T]) -> list[T]:
     seen: set[T] = set()
     result: list[T] = []